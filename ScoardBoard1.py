@@ -1,13 +1,34 @@
-﻿import base64
-import html
-import io
-import math
+﻿import html
 import os
-import time
 
 import pandas as pd
 import streamlit as st
 
+import scoreboard_core as core
+from scoreboard_core import (
+    DEFAULT_LANGUAGE,
+    HistorySnapshot,
+    StorageError,
+    cached_scoreboard_pdf,
+    compute_player_week_projection,
+    compute_week_projections,
+    current_daily_buckets,
+    current_player_history,
+    get_latest_trend_by_player,
+    get_recent_trend_updates,
+    get_storage,
+    image_assets_for,
+    monthly_winners_of,
+    player_index,
+    rank_index,
+    ranking_for,
+    translate,
+    trend_stats_for,
+    weekly_winners_of,
+    winners_archive_for,
+    writer_for,
+)
+
 st.set_page_config(page_title="Dynamic Scoreboard", layout="wide")
 
 # -----------------------------
@@ -17,280 +38,23 @@ SCORES_FILE = "scores.csv"
 USERS_FILE = "users.csv"
 SCOREBOARD_BG_FILE = "scoreboard_bg.png"
 HISTORY_FILE = "score_history.csv"
-HISTORY_COLUMNS = ["timestamp", "player", "points_added", "total_after", "trend_note"]
-
-TRANSLATIONS = {
-    "es": {
-        "language": "Idioma",
-        "language_es": "Espanol",
-        "language_en": "English",
-        "dynamic_scoreboard": "Dynamic Scoreboard",
-        "login_title": "Iniciar sesion",
-        "username": "Username",
-        "password": "Password",
-        "login_button": "Login",
-        "login_success": "Login successful!",
-        "invalid_credentials": "Credenciales invalidas",
-        "sidebar_user": "Usuario",
-        "sidebar_role": "Rol",
-        "logout": "Logout",
-        "navigation": "Navegacion",
-        "menu_admin_panel": "Admin Panel",
-        "menu_scoreboard_general": "Scoreboard General",
-        "menu_winners": "Winners",
-        "menu_period_winners": "Period Winners",
-        "menu_my_score": "My Score",
-        "hero_dynamic_title": "Dynamic Scoreboard",
-        "hero_dynamic_subtitle": "Accede para ver el ranking y el rendimiento del torneo.",
-        "hero_admin_title": "Admin Control Center",
-        "hero_admin_subtitle": "Gestiona jugadores, puntajes y cuentas en un solo lugar.",
-        "hero_scoreboard_general_title": "Scoreboard General",
-        "hero_scoreboard_general_subtitle": "Visualiza posiciones, tendencia y zonas calientes/frias.",
-        "hero_winners_title": "Winners",
-        "hero_winners_subtitle": "Los tres primeros del torneo.",
-        "hero_period_winners_title": "Weekly and Monthly Winners",
-        "hero_period_winners_subtitle": "Ganadores automaticos por semana y por mes basados en el historial de puntos.",
-        "hero_my_score_title": "My Score",
-        "hero_my_score_subtitle": "Revisa tus puntos y tu posicion actual en el torneo.",
-        "hero_scoreboard_title": "Scoreboard",
-        "hero_scoreboard_subtitle": "Compite, sube posiciones y mantente en la zona caliente.",
-        "players_registered": "Players registrados",
-        "total_points": "Puntos totales",
-        "average_per_player": "Promedio por player",
-        "current_leader": "Lider actual",
-        "save_failed_title": "No se pudo guardar `{file_path}` porque esta en uso o bloqueado.",
-        "save_failed_hint": "Cierra el archivo si esta abierto (por ejemplo, en Excel) e intenta de nuevo.",
-        "technical_detail": "Detalle tecnico: {error}",
-        "bg_expander": "Imagen de fondo para Scoreboard General",
-        "bg_upload": "Sube una imagen PNG",
-        "bg_saved": "Imagen de fondo guardada.",
-        "bg_current_file": "Archivo actual: {file}",
-        "no_players_scoreboard": "No hay players en el scoreboard todavia.",
-        "leaderboard_tab": "Leaderboard",
-        "last_7_days_tab": "Last 7 Days",
-        "last_15_days_tab": "Last 15 Days",
-        "last_30_days_tab": "Last 30 Days",
-        "caption_total_tournament": "Total acumulado del torneo.",
-        "caption_last_days": "Puntos ganados en los ultimos {days} dias.",
-        "pdf_no_data": "No hay datos para exportar.",
-        "pdf_missing_matplotlib": "No se pudo generar el PDF porque matplotlib no esta disponible.",
-        "pdf_table_title": "Scoreboard Ranking Table",
-        "pdf_generated_footer": "Generado: {datetime} | Players: {players} | Pagina {page}/{pages}",
-        "download_pdf_table": "Download PDF table",
-        "no_winners_yet": "Aun no hay ganadores porque no hay puntajes cargados.",
-        "place_label": "Puesto {position}",
-        "no_player": "Sin player",
-        "points_short": "pts",
-        "no_points_history": "Aun no hay historial de puntos. Agrega puntos para generar ganadores semanales y mensuales.",
-        "select_month": "Select month",
-        "week_highlight": "Week Highlight",
-        "month_highlight": "Month Highlight",
-        "tab_weekly_winners": "Weekly Winners",
-        "tab_monthly_winners": "Monthly Winners",
-        "weekly_winners_of_month": "Weekly winners of selected month",
-        "monthly_winners_history": "Monthly winners history",
-        "no_weekly_winner_for_month": "No weekly winner yet for this month.",
-        "no_monthly_winner_for_month": "No monthly winner yet for this month.",
-        "no_weekly_winners_month": "No weekly winners for this month.",
-        "no_monthly_winners_history": "No monthly winners in history.",
-        "weekly_period_label": "{week} Week {month} Winner",
-        "monthly_period_label": "{month} Winner",
-        "default_player_password": "Password por defecto para nuevas cuentas player",
-        "tab_points_trends": "Points & Trends",
-        "tab_reset_table": "Reset Table",
-        "section_fast_points_update": "Fast Points Update",
-        "target": "Target",
-        "existing_player": "Existing player",
-        "new_player": "New player",
-        "select_player": "Select player",
-        "no_existing_players": "No hay players existentes. Crea uno nuevo.",
-        "new_player_name": "New player name",
-        "quick_points": "Quick points",
-        "custom_points_optional": "Custom points (optional)",
-        "apply_points_button": "Apply +{points} points",
-        "enter_player_name": "Enter a player name.",
-        "section_automation": "Automatizaciones",
-        "automation_caption": "Only creates accounts for players without an existing account.",
-        "assign_accounts_new_only": "Assign Accounts to New Players Only",
-        "new_accounts_created": "New player accounts created: {accounts}",
-        "no_new_players_accounts": "No new players found. All current players already have an account.",
-        "section_trend_updates": "Trend Updates",
-        "tab_latest_by_player": "Latest by player",
-        "tab_recent_updates": "Recent updates",
-        "no_trends_by_player": "Aun no hay tendencias por jugador.",
-        "no_recent_updates": "Aun no hay actualizaciones recientes.",
-        "no_trend_note": "Sin nota de tendencia.",
-        "section_ranking_preview": "Vista previa del ranking",
-        "section_reset_points_table": "Reset Points Table",
-        "reset_warning": "Esta accion reinicia todos los puntos a 0. Los players se mantienen en la tabla.",
-        "reset_button": "Reset table points",
-        "reset_confirm_required": "Confirmacion requerida: Quieres resetear la tabla de puntos?",
-        "reset_confirm_button": "Yes, reset now",
-        "cancel": "Cancel",
-        "reset_cancelled": "Reset cancelado.",
-        "reset_success": "Scoreboard reset: todos los puntos en 0.",
-        "your_points": "Your Points",
-        "average_points_week": "Average Points / Week",
-        "weekly_target_position": "Weekly Target Position",
-        "weekly_forecast_points": "Weekly Forecast (pts)",
-        "zone": "Zone",
-        "sessions_week_est": "Sessions / Week (est.)",
-        "goal_per_session_points": "Goal per Session (pts)",
-        "points_to_next_position": "Points to Next Position",
-        "zone_hot": "HOT 🔥",
-        "zone_cold": "COLD ❄️",
-        "zone_run": "RUN 🏃",
-        "weekly_goal_move_up": "Objetivo semanal: subir de #{current} a #{target}. {summary}",
-        "weekly_goal_hold": "Objetivo semanal: consolidar la posicion #{current} y presionar el siguiente lugar. {summary}",
-        "no_score_assigned": "No score assigned yet.",
-        "summary_no_history": "Sin historial de sesiones. Necesitas registrar puntos para generar pronostico.",
-        "summary_forecast": "Pronostico semanal: {forecast} pts. Objetivo por sesion: {session_goal} pts.",
-        "trend_stable": "estable",
-        "trend_up": "al alza",
-        "trend_down": "a la baja",
-        "trend_note_text": "{gain} pts. Total: {total}. Semana: {week} pts. Mes: {month} pts. Tendencia: {trend}.",
-    },
-    "en": {
-        "language": "Language",
-        "language_es": "Spanish",
-        "language_en": "English",
-        "dynamic_scoreboard": "Dynamic Scoreboard",
-        "login_title": "Sign in",
-        "username": "Username",
-        "password": "Password",
-        "login_button": "Login",
-        "login_success": "Login successful!",
-        "invalid_credentials": "Invalid credentials",
-        "sidebar_user": "User",
-        "sidebar_role": "Role",
-        "logout": "Logout",
-        "navigation": "Navigation",
-        "menu_admin_panel": "Admin Panel",
-        "menu_scoreboard_general": "Scoreboard General",
-        "menu_winners": "Winners",
-        "menu_period_winners": "Period Winners",
-        "menu_my_score": "My Score",
-        "hero_dynamic_title": "Dynamic Scoreboard",
-        "hero_dynamic_subtitle": "Sign in to track ranking and tournament performance.",
-        "hero_admin_title": "Admin Control Center",
-        "hero_admin_subtitle": "Manage players, points, and accounts in one place.",
-        "hero_scoreboard_general_title": "Scoreboard General",
-        "hero_scoreboard_general_subtitle": "View standings, trends, and hot/cold zones.",
-        "hero_winners_title": "Winners",
-        "hero_winners_subtitle": "Top three players in the tournament.",
-        "hero_period_winners_title": "Weekly and Monthly Winners",
-        "hero_period_winners_subtitle": "Automatic weekly and monthly winners based on points history.",
-        "hero_my_score_title": "My Score",
-        "hero_my_score_subtitle": "Check your points and your current tournament position.",
-        "hero_scoreboard_title": "Scoreboard",
-        "hero_scoreboard_subtitle": "Compete, climb positions, and stay in the hot zone.",
-        "players_registered": "Registered players",
-        "total_points": "Total points",
-        "average_per_player": "Average per player",
-        "current_leader": "Current leader",
-        "save_failed_title": "Could not save `{file_path}` because it is in use or locked.",
-        "save_failed_hint": "Close the file if it is open (for example, in Excel) and try again.",
-        "technical_detail": "Technical detail: {error}",
-        "bg_expander": "Background image for Scoreboard General",
-        "bg_upload": "Upload a PNG image",
-        "bg_saved": "Background image saved.",
-        "bg_current_file": "Current file: {file}",
-        "no_players_scoreboard": "No players in the scoreboard yet.",
-        "leaderboard_tab": "Leaderboard",
-        "last_7_days_tab": "Last 7 Days",
-        "last_15_days_tab": "Last 15 Days",
-        "last_30_days_tab": "Last 30 Days",
-        "caption_total_tournament": "Total accumulated tournament points.",
-        "caption_last_days": "Points earned in the last {days} days.",
-        "pdf_no_data": "No data available to export.",
-        "pdf_missing_matplotlib": "Could not generate PDF because matplotlib is not available.",
-        "pdf_table_title": "Scoreboard Ranking Table",
-        "pdf_generated_footer": "Generated: {datetime} | Players: {players} | Page {page}/{pages}",
-        "download_pdf_table": "Download PDF table",
-        "no_winners_yet": "There are no winners yet because no scores were recorded.",
-        "place_label": "Place {position}",
-        "no_player": "No player",
-        "points_short": "pts",
-        "no_points_history": "No points history yet. Add points to generate weekly and monthly winners.",
-        "select_month": "Select month",
-        "week_highlight": "Week Highlight",
-        "month_highlight": "Month Highlight",
-        "tab_weekly_winners": "Weekly Winners",
-        "tab_monthly_winners": "Monthly Winners",
-        "weekly_winners_of_month": "Weekly winners of selected month",
-        "monthly_winners_history": "Monthly winners history",
-        "no_weekly_winner_for_month": "No weekly winner yet for this month.",
-        "no_monthly_winner_for_month": "No monthly winner yet for this month.",
-        "no_weekly_winners_month": "No weekly winners for this month.",
-        "no_monthly_winners_history": "No monthly winners in history.",
-        "weekly_period_label": "Week {week} {month} Winner",
-        "monthly_period_label": "{month} Winner",
-        "default_player_password": "Default password for new player accounts",
-        "tab_points_trends": "Points & Trends",
-        "tab_reset_table": "Reset Table",
-        "section_fast_points_update": "Fast Points Update",
-        "target": "Target",
-        "existing_player": "Existing player",
-        "new_player": "New player",
-        "select_player": "Select player",
-        "no_existing_players": "No existing players found. Create a new one.",
-        "new_player_name": "New player name",
-        "quick_points": "Quick points",
-        "custom_points_optional": "Custom points (optional)",
-        "apply_points_button": "Apply +{points} points",
-        "enter_player_name": "Enter a player name.",
-        "section_automation": "Automation",
-        "automation_caption": "Only creates accounts for players without an existing account.",
-        "assign_accounts_new_only": "Assign Accounts to New Players Only",
-        "new_accounts_created": "New player accounts created: {accounts}",
-        "no_new_players_accounts": "No new players found. All current players already have an account.",
-        "section_trend_updates": "Trend Updates",
-        "tab_latest_by_player": "Latest by player",
-        "tab_recent_updates": "Recent updates",
-        "no_trends_by_player": "No trends by player yet.",
-        "no_recent_updates": "No recent updates yet.",
-        "no_trend_note": "No trend note.",
-        "section_ranking_preview": "Ranking preview",
-        "section_reset_points_table": "Reset Points Table",
-        "reset_warning": "This action resets all points to 0. Players remain in the table.",
-        "reset_button": "Reset table points",
-        "reset_confirm_required": "Confirmation required: do you really want to reset the points table?",
-        "reset_confirm_button": "Yes, reset now",
-        "cancel": "Cancel",
-        "reset_cancelled": "Reset canceled.",
-        "reset_success": "Scoreboard reset: all points set to 0.",
-        "your_points": "Your Points",
-        "average_points_week": "Average Points / Week",
-        "weekly_target_position": "Weekly Target Position",
-        "weekly_forecast_points": "Weekly Forecast (pts)",
-        "zone": "Zone",
-        "sessions_week_est": "Sessions / Week (est.)",
-        "goal_per_session_points": "Goal per Session (pts)",
-        "points_to_next_position": "Points to Next Position",
-        "zone_hot": "HOT 🔥",
-        "zone_cold": "COLD ❄️",
-        "zone_run": "RUN 🏃",
-        "weekly_goal_move_up": "Weekly target: move up from #{current} to #{target}. {summary}",
-        "weekly_goal_hold": "Weekly target: hold position #{current} and push for the next place. {summary}",
-        "no_score_assigned": "No score assigned yet.",
-        "summary_no_history": "No session history yet. You need points updates to generate a forecast.",
-        "summary_forecast": "Weekly forecast: {forecast} pts. Session goal: {session_goal} pts.",
-        "trend_stable": "stable",
-        "trend_up": "upward",
-        "trend_down": "downward",
-        "trend_note_text": "{gain} pts. Total: {total}. Week: {week} pts. Month: {month} pts. Trend: {trend}.",
-    },
-}
+# Winners of closed months, derived from the history (safe to delete; it is rebuilt on demand).
+WINNERS_ARCHIVE_FILE = "winners_archive.json"
+SQLITE_FILE = os.environ.get("SCOREBOARD_DB", "scoreboard.db")
+# "csv" keeps the three CSV files above; "sqlite" uses SQLITE_FILE (see `python -m scoreboard_core.storage migrate`).
+STORAGE_BACKEND = os.environ.get("SCOREBOARD_STORAGE", "csv")
+# "auto" switches to the native PDF writer for large rosters; "matplotlib", "parallel" (matplotlib
+# pages rendered in a process pool) or "native" force one.
+PDF_ENGINE = os.environ.get("SCOREBOARD_PDF_ENGINE", "auto")
+# Longest activity tab (days).
+ACTIVITY_WINDOW_DAYS = 30
+
+def current_lang():
+    return st.session_state.get("lang", DEFAULT_LANGUAGE)
 
 
 def tr(key, **kwargs):
-    lang = st.session_state.get("lang", "es")
-    data = TRANSLATIONS.get(lang, TRANSLATIONS["es"])
-    template = data.get(key, TRANSLATIONS["es"].get(key, key))
-    try:
-        return template.format(**kwargs)
-    except Exception:
-        return template
+    return translate(key, current_lang(), **kwargs)
 
 
 def render_language_selector(use_sidebar=False):
@@ -326,307 +90,116 @@ def render_language_selector(use_sidebar=False):
 # -----------------------------
 # CREATE FILES IF NOT EXIST
 # -----------------------------
-if not os.path.exists(SCORES_FILE):
-    pd.DataFrame(columns=["Player", "Points"]).to_csv(SCORES_FILE, index=False)
-
-if not os.path.exists(USERS_FILE):
-    pd.DataFrame(columns=["username", "password", "role"]).to_csv(USERS_FILE, index=False)
-
-if not os.path.exists(HISTORY_FILE):
-    pd.DataFrame(columns=HISTORY_COLUMNS).to_csv(HISTORY_FILE, index=False)
+STORAGE = get_storage(STORAGE_BACKEND, SCORES_FILE, USERS_FILE, HISTORY_FILE, SQLITE_FILE)
+STORAGE.initialize()
+BACKGROUND_ASSETS = image_assets_for(SCOREBOARD_BG_FILE)
+WINNERS_ARCHIVE = winners_archive_for(WINNERS_ARCHIVE_FILE)
 
 # -----------------------------
 # LOAD / SAVE DATA
 # -----------------------------
-def load_scores():
-    return pd.read_csv(SCORES_FILE)
-
-
-def _safe_to_csv(df, file_path, retries=6, base_delay=0.2):
-    temp_path = f"{file_path}.tmp"
-    last_error = None
-
-    for attempt in range(retries):
-        try:
-            df.to_csv(temp_path, index=False)
-            os.replace(temp_path, file_path)
-            return True
-        except PermissionError as error:
-            last_error = error
-            if os.path.exists(temp_path):
-                try:
-                    os.remove(temp_path)
-                except OSError:
-                    pass
-            time.sleep(base_delay * (attempt + 1))
-        except Exception as error:
-            last_error = error
-            break
-
+def _report_storage_error(error):
     st.error(
-        f"{tr('save_failed_title', file_path=file_path)} "
+        f"{tr('save_failed_title', file_path=error.location)} "
         f"{tr('save_failed_hint')}"
     )
-    if last_error:
-        st.caption(tr("technical_detail", error=last_error))
-    return False
+    if error.cause:
+        st.caption(tr("technical_detail", error=error.cause))
 
 
-def save_scores(df):
-    return _safe_to_csv(df, SCORES_FILE)
+def _storage_write(write, *args):
+    try:
+        write(*args)
+        return True
+    except StorageError as error:
+        _report_storage_error(error)
+        return False
 
 
-def load_users():
-    return pd.read_csv(USERS_FILE)
+def load_scores():
+    return STORAGE.load_scores()
 
 
-def save_users(df):
-    return _safe_to_csv(df, USERS_FILE)
+def load_ranking():
+    # Sorted once per scores version and shared by every view and session.
+    return ranking_for(STORAGE)
 
 
-def load_history():
-    history = pd.read_csv(HISTORY_FILE)
-    changed = False
+def load_rank_index():
+    # Kept current by the writer, so position and gap lookups never resort the roster.
+    return rank_index(STORAGE)
 
-    default_values = {
-        "timestamp": "",
-        "player": "",
-        "points_added": 0,
-        "total_after": 0,
-        "trend_note": "",
-    }
 
-    for col, default_value in default_values.items():
-        if col not in history.columns:
-            history[col] = default_value
-            changed = True
-
-    history = history[HISTORY_COLUMNS]
-    if changed:
-        _safe_to_csv(history, HISTORY_FILE)
-    return history
-
-
-def build_trend_note_from_history(history, player_name):
-    player_history = history[history["player"] == player_name].sort_values("timestamp")
-    if player_history.empty:
-        return tr("summary_no_history")
-
-    last_row = player_history.iloc[-1]
-    last_gain = int(last_row["points_added"])
-    total_after = int(last_row["total_after"]) if pd.notna(last_row["total_after"]) else 0
-    current_time = last_row["timestamp"]
-
-    week_points = int(player_history[player_history["timestamp"] >= (current_time - pd.Timedelta(days=7))]["points_added"].sum())
-    month_points = int(
-        player_history[
-            (player_history["timestamp"].dt.year == current_time.year) &
-            (player_history["timestamp"].dt.month == current_time.month)
-        ]["points_added"].sum()
-    )
+def save_scores(df):
+    return _storage_write(STORAGE.save_scores, df)
 
-    trend_label = tr("trend_stable")
-    if len(player_history) >= 6:
-        previous_block = int(player_history.iloc[-6:-3]["points_added"].sum())
-        recent_block = int(player_history.iloc[-3:]["points_added"].sum())
-        if recent_block > previous_block:
-            trend_label = tr("trend_up")
-        elif recent_block < previous_block:
-            trend_label = tr("trend_down")
-    elif len(player_history) >= 2:
-        prev_gain = int(player_history.iloc[-2]["points_added"])
-        if last_gain > prev_gain:
-            trend_label = tr("trend_up")
-        elif last_gain < prev_gain:
-            trend_label = tr("trend_down")
-
-    return tr(
-        "trend_note_text",
-        gain=f"{last_gain:+d}",
-        total=total_after,
-        week=week_points,
-        month=month_points,
-        trend=trend_label,
-    )
 
+def load_users():
+    return STORAGE.load_users()
 
-def log_points_update(player_name, points_added, total_after):
-    if points_added == 0:
-        return ""
 
-    history = load_history()
-    now = pd.Timestamp.now()
-    event = pd.DataFrame(
-        [[now, player_name, int(points_added), int(total_after), ""]],
-        columns=HISTORY_COLUMNS,
-    )
-    history = pd.concat([history, event], ignore_index=True)
-    history["timestamp"] = pd.to_datetime(history["timestamp"], errors="coerce")
+def save_users(df):
+    return _storage_write(STORAGE.save_users, df)
 
-    trend_note = build_trend_note_from_history(history, player_name)
-    history.loc[history.index[-1], "trend_note"] = trend_note
-    history["timestamp"] = history["timestamp"].dt.strftime("%Y-%m-%d %H:%M:%S")
-    if not _safe_to_csv(history, HISTORY_FILE):
-        return ""
-    return trend_note
 
+def apply_points_change(player_name, delta):
+    # Goes through the shared group-commit writer; returns its result dict, or None on a failed write.
+    try:
+        return writer_for(STORAGE).apply_points(player_name, delta, lang=current_lang())
+    except StorageError as error:
+        _report_storage_error(error)
+        return None
 
-# -----------------------------
-# HELPERS
-# -----------------------------
-def get_ranking(df):
-    if df.empty:
-        return pd.DataFrame(columns=["Player", "Points"])
 
-    ranking = df.copy()
-    ranking["Player"] = ranking["Player"].astype(str).str.strip()
-    ranking = ranking[ranking["Player"] != ""]
-    ranking["Points"] = pd.to_numeric(ranking["Points"], errors="coerce").fillna(0).astype(int)
-    ranking = ranking.sort_values(by="Points", ascending=False).reset_index(drop=True)
-    return ranking
+def reset_points_table():
+    try:
+        return writer_for(STORAGE).reset_points()
+    except StorageError as error:
+        _report_storage_error(error)
+        return None
 
 
-def normalize_identity(value):
-    return str(value).strip().casefold()
+def apply_bulk_import(rows, default_password):
+    # Returns (report, created_accounts), or (None, []) on a failed write.
+    try:
+        return core.apply_bulk_points(STORAGE, rows, default_password, lang=current_lang())
+    except StorageError as error:
+        _report_storage_error(error)
+        return None, []
 
 
+# -----------------------------
+# HELPERS
+# -----------------------------
 def create_player_account_if_missing(player_name, default_password):
-    users = load_users()
-    clean_player_name = str(player_name).strip()
-    if clean_player_name == "":
-        return False
-
-    existing_usernames = set(users["username"].astype(str).map(normalize_identity).tolist())
-    if normalize_identity(clean_player_name) in existing_usernames:
+    try:
+        return core.create_player_account_if_missing(STORAGE, player_name, default_password)
+    except StorageError as error:
+        _report_storage_error(error)
         return False
 
-    new_user = pd.DataFrame(
-        [[clean_player_name, default_password, "player"]],
-        columns=["username", "password", "role"]
-    )
-    users = pd.concat([users, new_user], ignore_index=True)
-    return save_users(users)
-
 
 def assign_accounts_to_scoreboard_players(default_password):
-    scores = load_scores()
-    users = load_users()
-
-    player_series = scores["Player"].dropna().astype(str).str.strip()
-    players = [player for player in player_series.tolist() if player]
-
-    seen_players = set()
-    unique_players = []
-    for player in players:
-        player_key = normalize_identity(player)
-        if player_key not in seen_players:
-            seen_players.add(player_key)
-            unique_players.append(player)
-
-    existing_users = set(users["username"].astype(str).map(normalize_identity).tolist())
-    missing_players = [
-        player for player in unique_players
-        if normalize_identity(player) not in existing_users
-    ]
-
-    if not missing_players:
-        return []
-
-    new_users = pd.DataFrame(
-        [[player, default_password, "player"] for player in missing_players],
-        columns=["username", "password", "role"]
-    )
-    users = pd.concat([users, new_users], ignore_index=True)
-    if not save_users(users):
+    try:
+        return core.assign_accounts_to_scoreboard_players(STORAGE, default_password)
+    except StorageError as error:
+        _report_storage_error(error)
         return []
-    return missing_players
 
 
 def save_scoreboard_background(uploaded_file):
-    with open(SCOREBOARD_BG_FILE, "wb") as file:
-        file.write(uploaded_file.getbuffer())
-
-
-def get_status_icon(position, total_players):
-    if position <= 3:
-        return "🔥"
-    if position > total_players - 5:
-        return "❄️"
-    return "🏃"
-
-
-def get_clean_history():
-    history = load_history()
-    if history.empty:
-        return history
-
-    history = history.copy()
-    history["timestamp"] = pd.to_datetime(history["timestamp"], errors="coerce")
-    history["player"] = history["player"].astype(str).str.strip()
-    history["points_added"] = pd.to_numeric(history["points_added"], errors="coerce").fillna(0).astype(int)
-    history["total_after"] = pd.to_numeric(history["total_after"], errors="coerce").fillna(0).astype(int)
-    history["trend_note"] = history["trend_note"].fillna("").astype(str)
-    history = history.dropna(subset=["timestamp"])
-    history = history[(history["player"] != "") & (history["points_added"] != 0)]
-    return history
-
-
-def compute_weekly_winners(history, year, month):
-    if history.empty:
-        return pd.DataFrame(columns=["Period", "Winner", "Points"])
-
-    month_history = history[
-        (history["timestamp"].dt.year == year) &
-        (history["timestamp"].dt.month == month)
-    ].copy()
-
-    if month_history.empty:
-        return pd.DataFrame(columns=["Period", "Winner", "Points"])
-
-    month_history["week_of_month"] = ((month_history["timestamp"].dt.day - 1) // 7) + 1
-    grouped = month_history.groupby(["week_of_month", "player"], as_index=False)["points_added"].sum()
-
-    rows = []
-    month_abbr = pd.Timestamp(year=year, month=month, day=1).strftime("%b")
-
-    for week_number in sorted(grouped["week_of_month"].unique()):
-        week_data = grouped[grouped["week_of_month"] == week_number]
-        max_points = int(week_data["points_added"].max())
-        winners = sorted(week_data[week_data["points_added"] == max_points]["player"].tolist())
-        rows.append(
-            {
-                "Period": f"{week_number} Week {month_abbr} Winner",
-                "Winner": ", ".join(winners),
-                "Points": max_points,
-            }
-        )
-
-    return pd.DataFrame(rows)
+    # Builds the hero/background/PDF variants once per distinct upload.
+    BACKGROUND_ASSETS.save_source(uploaded_file.getbuffer())
 
 
-def compute_monthly_winners(history):
-    if history.empty:
-        return pd.DataFrame(columns=["Period", "Winner", "Points"])
+def get_rerun_history():
+    return HISTORY_SNAPSHOT.get()
 
-    history = history.copy()
-    history["month_period"] = history["timestamp"].dt.to_period("M")
-    grouped = history.groupby(["month_period", "player"], as_index=False)["points_added"].sum()
-
-    rows = []
-    for month_period in sorted(grouped["month_period"].unique(), reverse=True):
-        month_data = grouped[grouped["month_period"] == month_period]
-        max_points = int(month_data["points_added"].max())
-        winners = sorted(month_data[month_data["points_added"] == max_points]["player"].tolist())
-        month_dt = month_period.to_timestamp()
-        rows.append(
-            {
-                "Period": f"{month_dt.strftime('%B')} Winner",
-                "Winner": ", ".join(winners),
-                "Points": max_points,
-            }
-        )
 
-    return pd.DataFrame(rows)
+def get_period_activity_ranking(ranking, days):
+    # The buckets cover the longest tab, so the 7/15/30-day tabs share one rebuild.
+    buckets = current_daily_buckets(STORAGE, HISTORY_SNAPSHOT, days=max(days, ACTIVITY_WINDOW_DAYS))
+    return core.get_period_activity_ranking(ranking, days, buckets, load_window=HISTORY_SNAPSHOT.window)
 
 
 def inject_global_styles():
@@ -893,14 +466,7 @@ def inject_global_styles():
 
 
 def get_header_logo_data_uri():
-    if not os.path.exists(SCOREBOARD_BG_FILE):
-        return None
-    try:
-        with open(SCOREBOARD_BG_FILE, "rb") as logo_file:
-            encoded_logo = base64.b64encode(logo_file.read()).decode("utf-8")
-        return f"data:image/png;base64,{encoded_logo}"
-    except OSError:
-        return None
+    return BACKGROUND_ASSETS.data_uri("hero")
 
 
 def render_hero(title, subtitle):
@@ -923,8 +489,8 @@ def render_hero(title, subtitle):
     )
 
 
-def render_kpi_cards(df):
-    ranking = get_ranking(df)
+def render_kpi_cards(standings):
+    ranking = standings.table
     total_players = len(ranking)
     total_points = int(ranking["Points"].sum()) if total_players else 0
     avg_points = round(total_points / total_players, 1) if total_players else 0
@@ -958,12 +524,10 @@ def render_kpi_cards(df):
 
 
 def apply_scoreboard_background(opacity=0.20):
-    if not os.path.exists(SCOREBOARD_BG_FILE):
+    background_uri = BACKGROUND_ASSETS.data_uri("background")
+    if background_uri is None:
         return False
 
-    with open(SCOREBOARD_BG_FILE, "rb") as file:
-        image_base64 = base64.b64encode(file.read()).decode("utf-8")
-
     overlay = 1 - opacity
     st.markdown(
         f"""
@@ -974,7 +538,7 @@ def apply_scoreboard_background(opacity=0.20):
                     rgba(248, 250, 252, {overlay}),
                     rgba(248, 250, 252, {overlay})
                 ),
-                url("data:image/png;base64,{image_base64}");
+                url("{background_uri}");
             background-repeat: no-repeat, no-repeat;
             background-position: center top 120px, center top 120px;
             background-size: auto, min(58vw, 720px);
@@ -1005,42 +569,18 @@ def render_scoreboard_background_uploader(uploader_key):
             save_scoreboard_background(uploaded_image)
             st.success("Imagen de fondo guardada.")
 
-        if os.path.exists(SCOREBOARD_BG_FILE):
+        preview = BACKGROUND_ASSETS.variant_bytes("pdf")
+        if preview is not None:
             st.caption(f"Archivo actual: {SCOREBOARD_BG_FILE}")
-            st.image(SCOREBOARD_BG_FILE, width=170)
-
-
-def get_period_activity_ranking(df, days):
-    base_ranking = get_ranking(df)
-    if base_ranking.empty:
-        return base_ranking
-
-    base = base_ranking[["Player"]].copy()
-    base["BaseOrder"] = range(len(base))
-    base["Points"] = 0
+            st.image(preview, width=170)
 
-    history = get_clean_history()
-    if history.empty:
-        return base[["Player", "Points"]]
-
-    cutoff = pd.Timestamp.now() - pd.Timedelta(days=days)
-    period_history = history[history["timestamp"] >= cutoff]
-    if period_history.empty:
-        return base[["Player", "Points"]]
-
-    period_points = (
-        period_history.groupby("player", as_index=False)["points_added"]
-        .sum()
-        .rename(columns={"player": "Player", "points_added": "Points"})
-    )
 
-    merged = base.drop(columns=["Points"]).merge(period_points, on="Player", how="left")
-    merged["Points"] = pd.to_numeric(merged["Points"], errors="coerce").fillna(0).astype(int)
-    merged = merged.sort_values(by=["Points", "BaseOrder"], ascending=[False, True]).reset_index(drop=True)
-    return merged[["Player", "Points"]]
+def _jump_to_leaderboard_page(page_key, search_key, page):
+    st.session_state[search_key] = ""
+    st.session_state[page_key] = page
 
 
-def render_scoreboard_table(ranking, caption_text=None):
+def render_scoreboard_table(ranking, caption_text=None, key="leaderboard"):
     if ranking.empty:
         st.info("No hay players en el scoreboard todavia.")
         return
@@ -1048,38 +588,54 @@ def render_scoreboard_table(ranking, caption_text=None):
     if caption_text:
         st.caption(caption_text)
 
-    total_players = len(ranking)
-
-    board = ranking.copy()
-    board.index = range(1, total_players + 1)
-    board.index.name = "Position"
-    board["Points"] = [
-        f"{int(points)} {get_status_icon(pos, total_players)}"
-        for pos, points in zip(board.index, board["Points"])
-    ]
+    # Zones and labels are computed for the whole board at once; only the visible page is
+    # styled and sent to the browser.
+    board = core.build_leaderboard(ranking)
+    total_players = len(board)
+    viewer = st.session_state.get("username")
+    paginated = total_players > core.PAGE_SIZES[0]
+    visible = board
+    page_size = total_players
+    page = 1
+
+    if paginated:
+        page_key = f"{key}_page"
+        search_key = f"{key}_search"
+        search_col, size_col, page_col, jump_col = st.columns([2, 1, 1, 1.2])
+        search = search_col.text_input("Buscar player", key=search_key)
+        page_size = size_col.selectbox("Filas", core.PAGE_SIZES, key=f"{key}_page_size")
+        visible = core.filter_leaderboard(board, search)
+        total_pages = core.leaderboard_page_count(len(visible), page_size)
+        if st.session_state.get(page_key, 1) > total_pages:
+            st.session_state[page_key] = total_pages
+        page = page_col.number_input("Pagina", min_value=1, max_value=total_pages, step=1, key=page_key)
+
+        my_page = core.leaderboard_page_of(board, viewer, page_size) if viewer else None
+        if my_page is not None:
+            jump_col.button(
+                "Ir a mi posicion",
+                key=f"{key}_jump",
+                on_click=_jump_to_leaderboard_page,
+                args=(page_key, search_key, my_page),
+                use_container_width=True,
+            )
 
-    def highlight_zone(row):
-        if row.name <= 3:
-            return ["background-color: rgba(244, 63, 94, 0.11);" for _ in row]
-        if row.name > total_players - 5:
-            return ["background-color: rgba(56, 189, 248, 0.11);" for _ in row]
-        return ["" for _ in row]
-
-    styled = board.style.apply(highlight_zone, axis=1)
-    styled = styled.apply(
-        lambda col: [
-            "color: #be123c; font-weight: 700;" if idx <= 3 else ""
-            for idx in col.index
-        ],
-        subset=["Points"],
-    )
+    window, page, total_pages = core.leaderboard_window(visible, page, page_size)
+    if paginated:
+        st.caption(f"Mostrando {len(window)} de {len(visible)} players - pagina {page}/{total_pages}")
+    if window.empty:
+        st.info("Ningun player coincide con la busqueda.")
+        return
 
-    height = 460 if total_players > 10 else None
-    st.dataframe(styled, use_container_width=True, height=height)
+    styled = core.style_leaderboard_window(window, viewer)
+    if len(window) > 10:
+        st.dataframe(styled, use_container_width=True, height=460)
+    else:
+        st.dataframe(styled, use_container_width=True)
 
 
-def render_dynamic_scoreboard(df):
-    total_ranking = get_ranking(df)
+def render_dynamic_scoreboard(standings):
+    total_ranking = standings.table
     if total_ranking.empty:
         st.info("No hay players en el scoreboard todavia.")
         return
@@ -1087,109 +643,45 @@ def render_dynamic_scoreboard(df):
     tab1, tab2, tab3, tab4 = st.tabs(["Leaderboard", "Last 7 Days", "Last 15 Days", "Last 30 Days"])
 
     with tab1:
-        render_scoreboard_table(total_ranking, "Total acumulado del torneo.")
+        render_scoreboard_table(total_ranking, "Total acumulado del torneo.", key="leaderboard_total")
 
     with tab2:
-        ranking_7 = get_period_activity_ranking(df, 7)
-        render_scoreboard_table(ranking_7, "Puntos ganados en los ultimos 7 dias.")
+        ranking_7 = get_period_activity_ranking(standings, 7)
+        render_scoreboard_table(ranking_7, "Puntos ganados en los ultimos 7 dias.", key="leaderboard_7d")
 
     with tab3:
-        ranking_15 = get_period_activity_ranking(df, 15)
-        render_scoreboard_table(ranking_15, "Puntos ganados en los ultimos 15 dias.")
+        ranking_15 = get_period_activity_ranking(standings, 15)
+        render_scoreboard_table(ranking_15, "Puntos ganados en los ultimos 15 dias.", key="leaderboard_15d")
 
     with tab4:
-        ranking_30 = get_period_activity_ranking(df, 30)
-        render_scoreboard_table(ranking_30, "Puntos ganados en los ultimos 30 dias.")
-
-
-def build_scoreboard_pdf(df):
-    ranking = get_ranking(df)
-    if ranking.empty:
-        return None, "No hay datos para exportar."
-
-    try:
-        import matplotlib.pyplot as plt
-        from matplotlib.backends.backend_pdf import PdfPages
-    except Exception:
-        return None, "No se pudo generar el PDF porque matplotlib no esta disponible."
-
-    total_players = len(ranking)
-    ranking_pdf = ranking.copy()
-    ranking_pdf["Position"] = range(1, len(ranking_pdf) + 1)
-    table_df = ranking_pdf[["Position", "Player", "Points"]].copy()
-    rows_per_page = 28
-
-    logo_image = None
-    if os.path.exists(SCOREBOARD_BG_FILE):
-        try:
-            logo_image = plt.imread(SCOREBOARD_BG_FILE)
-        except Exception:
-            logo_image = None
-
-    buffer = io.BytesIO()
-
-    with PdfPages(buffer) as pdf:
-        for start in range(0, total_players, rows_per_page):
-            page_df = table_df.iloc[start:start + rows_per_page].copy()
-            fig, ax = plt.subplots(figsize=(11.69, 8.27))  # A4 landscape
-            ax.axis("off")
-            ax.set_title("Scoreboard Ranking Table", fontsize=17, fontweight="bold", pad=16)
-
-            page_number = (start // rows_per_page) + 1
-            total_pages = ((total_players - 1) // rows_per_page) + 1
-
-            fig.text(
-                0.02,
-                0.02,
-                f"Generated: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M')} | Players: {total_players} | Page {page_number}/{total_pages}",
-                fontsize=9,
-                color="#475569",
-            )
+        ranking_30 = get_period_activity_ranking(standings, 30)
+        render_scoreboard_table(ranking_30, "Puntos ganados en los ultimos 30 dias.", key="leaderboard_30d")
 
-            if logo_image is not None:
-                logo_ax = fig.add_axes([0.885, 0.82, 0.09, 0.12])
-                logo_ax.imshow(logo_image)
-                logo_ax.axis("off")
-
-            table = ax.table(
-                cellText=page_df.values.tolist(),
-                colLabels=page_df.columns.tolist(),
-                loc="center",
-                cellLoc="left",
-                colLoc="left",
-            )
-            table.auto_set_font_size(False)
-            table.set_fontsize(10)
-            table.scale(1, 1.45)
-
-            for (row, col), cell in table.get_celld().items():
-                if row == 0:
-                    cell.set_text_props(weight="bold", color="white")
-                    cell.set_facecolor("#1e3a8a")
-                    continue
-
-                global_position = int(page_df.iloc[row - 1]["Position"])
-                if global_position <= 3:
-                    cell.set_facecolor("#fecaca")
-                elif global_position > total_players - 5:
-                    cell.set_facecolor("#bfdbfe")
-                else:
-                    cell.set_facecolor("#f8fafc" if row % 2 == 0 else "#ffffff")
-
-            plt.tight_layout()
-            pdf.savefig(fig)
-            plt.close(fig)
-
-    buffer.seek(0)
-    return buffer.getvalue(), None
 
-
-def render_score_pdf_download(df, button_key):
-    pdf_bytes, error = build_scoreboard_pdf(df)
+def render_score_pdf_download(standings, button_key):
+    # The PDF is only rendered on request and then shared by everyone viewing the same standings.
+    logo_version = BACKGROUND_ASSETS.version()
+    pdf_bytes, error = cached_scoreboard_pdf(standings, logo_version=logo_version, build=False, engine=PDF_ENGINE)
     if error:
         st.info(error)
         return
 
+    if pdf_bytes is None:
+        if not st.button("Prepare PDF table", key=f"{button_key}_prepare", use_container_width=True):
+            return
+        progress_bar = st.progress(0.0, text="Generando PDF...")
+
+        def report_progress(done_pages, total_pages):
+            progress_bar.progress(done_pages / total_pages, text=f"Generando PDF: pagina {done_pages}/{total_pages}")
+
+        pdf_bytes, error = cached_scoreboard_pdf(
+            standings, BACKGROUND_ASSETS.variant_path("pdf"), logo_version, engine=PDF_ENGINE, progress=report_progress
+        )
+        progress_bar.empty()
+        if error:
+            st.info(error)
+            return
+
     timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M")
     st.download_button(
         label="Download PDF table",
@@ -1201,8 +693,44 @@ def render_score_pdf_download(df, button_key):
     )
 
 
-def render_winners(df):
-    ranking = get_ranking(df)
+def render_forecast_board(standings):
+    render_hero("Forecast Board", "Pronostico semanal de todos los jugadores, calculado en una sola pasada.")
+
+    board = compute_week_projections(standings, get_rerun_history())
+    if board.empty:
+        st.info("Aun no hay jugadores en el scoreboard.")
+        return
+
+    sort_label = st.radio(
+        "Ordenar por",
+        ["Ranking", "Forecast (pts)", "Posiciones a subir"],
+        horizontal=True,
+        key="forecast_board_sort",
+    )
+    board = board.assign(Climb=board["current_position"] - board["target_position"])
+    if sort_label == "Forecast (pts)":
+        board = board.sort_values("forecast_week_points", ascending=False, kind="mergesort")
+    elif sort_label == "Posiciones a subir":
+        board = board.sort_values("Climb", ascending=False, kind="mergesort")
+
+    view = board.rename(columns={
+        "current_position": "Position",
+        "current_points": "Points",
+        "forecast_week_points": "Forecast (pts)",
+        "target_position": "Target Position",
+        "points_to_next_position": "To Next Position",
+        "points_per_session_goal": "Goal / Session",
+        "sessions_per_week": "Sessions / Week",
+        "avg_points_week": "Avg / Week",
+    })[[
+        "Position", "Player", "Points", "Forecast (pts)", "Target Position", "Climb",
+        "To Next Position", "Goal / Session", "Sessions / Week", "Avg / Week",
+    ]]
+    st.dataframe(view, use_container_width=True, hide_index=True, height=460)
+
+
+def render_winners(standings):
+    ranking = standings.table
     render_hero("Winners", "Los tres primeros del torneo.")
 
     if ranking.empty:
@@ -1266,23 +794,30 @@ def render_period_winners_panel():
         "Ganadores automaticos por semana y por mes basados en el historial de puntos.",
     )
 
-    history = get_clean_history()
-    if history.empty:
+    # The month summary comes from the segment manifest (or the database); closed months come
+    # from the archive, so a visit only loads the open month.
+    history_months = HISTORY_SNAPSHOT.months()
+    if history_months.empty:
         st.info("Aun no hay historial de puntos. Agrega puntos para generar ganadores semanales y mensuales.")
         return
 
-    history["month_period"] = history["timestamp"].dt.to_period("M")
-    available_periods = sorted(history["month_period"].unique(), reverse=True)
-    period_options = [p.to_timestamp().strftime("%B %Y") for p in available_periods]
+    winners = WINNERS_ARCHIVE.winners_from(history_months, HISTORY_SNAPSHOT.window)
+    if winners.empty:
+        st.info("Aun no hay historial de puntos. Agrega puntos para generar ganadores semanales y mensuales.")
+        return
+    month_rows = winners[winners["Kind"] == "month"].sort_values(["Year", "Month"], ascending=False)
+    available_periods = list(zip(month_rows["Year"].tolist(), month_rows["Month"].tolist()))
+    period_options = [pd.Timestamp(year=year, month=month, day=1).strftime("%B %Y") for year, month in available_periods]
     selected_period_label = st.selectbox("Select month", period_options, index=0)
-    selected_period = available_periods[period_options.index(selected_period_label)]
+    selected_year, selected_month = available_periods[period_options.index(selected_period_label)]
 
-    weekly_winners = compute_weekly_winners(history, selected_period.year, selected_period.month)
-    monthly_winners = compute_monthly_winners(history)
+    weekly_winners = weekly_winners_of(winners, selected_year, selected_month)
+    monthly_winners = monthly_winners_of(winners)
 
     highlight_week = weekly_winners.tail(1)
-    selected_month_text = selected_period.to_timestamp().strftime("%B")
-    highlight_month = monthly_winners[monthly_winners["Period"] == f"{selected_month_text} Winner"].head(1)
+    highlight_month = month_rows[
+        (month_rows["Year"] == selected_year) & (month_rows["Month"] == selected_month)
+    ][["Period", "Winner", "Points"]]
 
     col1, col2 = st.columns(2)
     with col1:
@@ -1301,113 +836,6 @@ def render_period_winners_panel():
         render_winner_cards(monthly_winners, "No monthly winners in history.")
 
 
-def get_player_trend_feed(player_name, limit=6):
-    history = get_clean_history()
-    if history.empty:
-        return pd.DataFrame(columns=["timestamp", "trend_note", "points_added", "total_after"])
-
-    player_history = history[history["player"] == player_name].sort_values("timestamp", ascending=False)
-    if player_history.empty:
-        return pd.DataFrame(columns=["timestamp", "trend_note", "points_added", "total_after"])
-    return player_history.head(limit)
-
-
-def get_latest_trend_by_player(limit=8):
-    history = get_clean_history()
-    if history.empty:
-        return pd.DataFrame(columns=["timestamp", "player", "trend_note", "points_added", "total_after"])
-
-    latest = history.sort_values("timestamp", ascending=False).drop_duplicates(subset=["player"], keep="first")
-    return latest.head(limit)
-
-
-def compute_player_week_projection(player_name, ranking):
-    current_points = 0
-    current_position = None
-
-    if not ranking.empty and player_name in ranking["Player"].values:
-        player_row = ranking[ranking["Player"] == player_name].iloc[0]
-        current_points = int(player_row["Points"])
-        current_position = int(ranking[ranking["Player"] == player_name].index[0] + 1)
-
-    history = get_clean_history()
-    player_history = history[history["player"] == player_name].sort_values("timestamp")
-
-    if player_history.empty:
-        return {
-            "current_points": current_points,
-            "current_position": current_position,
-            "avg_points_week": 0,
-            "sessions_per_week": 0,
-            "forecast_week_points": 0,
-            "target_position": current_position,
-            "points_to_next_position": 0,
-            "points_per_session_goal": 0,
-            "summary": "Sin historial de sesiones. Necesitas registrar puntos para generar pronostico.",
-        }
-
-    week_totals = (
-        player_history
-        .groupby(player_history["timestamp"].dt.to_period("W"), as_index=False)["points_added"]
-        .sum()
-    )
-    avg_points_week = float(week_totals["points_added"].mean()) if not week_totals.empty else 0.0
-    best_week = int(week_totals["points_added"].max()) if not week_totals.empty else 0
-
-    now = pd.Timestamp.now()
-    last_7_points = int(player_history[player_history["timestamp"] >= (now - pd.Timedelta(days=7))]["points_added"].sum())
-    prev_7_points = int(
-        player_history[
-            (player_history["timestamp"] < (now - pd.Timedelta(days=7))) &
-            (player_history["timestamp"] >= (now - pd.Timedelta(days=14)))
-        ]["points_added"].sum()
-    )
-    sessions_last_28 = int((player_history["timestamp"] >= (now - pd.Timedelta(days=28))).sum())
-    sessions_per_week = sessions_last_28 / 4 if sessions_last_28 > 0 else max(1.0, len(player_history) / max(1, len(week_totals)))
-
-    recent_session_avg = float(player_history.tail(min(8, len(player_history)))["points_added"].mean())
-    trend_factor = 1.0
-    if last_7_points > prev_7_points:
-        trend_factor = 1.12
-    elif last_7_points < prev_7_points:
-        trend_factor = 0.95
-
-    projected_by_sessions = recent_session_avg * sessions_per_week * trend_factor
-    stretch_goal = best_week + 1 if best_week > 0 else projected_by_sessions
-    forecast_week_points = int(max(projected_by_sessions, stretch_goal, avg_points_week))
-
-    points_to_next_position = 0
-    if current_position and current_position > 1:
-        next_points = int(ranking.iloc[current_position - 2]["Points"])
-        points_to_next_position = max(0, (next_points - current_points) + 1)
-        forecast_week_points = max(forecast_week_points, points_to_next_position)
-
-    target_position = current_position
-    if current_position:
-        target_total = current_points + forecast_week_points
-        target_position = int((ranking["Points"] > target_total).sum() + 1)
-
-    session_goal_divisor = max(1, int(round(sessions_per_week)))
-    points_per_session_goal = int(math.ceil(forecast_week_points / session_goal_divisor)) if forecast_week_points > 0 else 0
-
-    summary = (
-        f"Pronostico semanal: {forecast_week_points} pts. "
-        f"Objetivo por sesion: {points_per_session_goal} pts."
-    )
-
-    return {
-        "current_points": current_points,
-        "current_position": current_position,
-        "avg_points_week": round(avg_points_week, 1),
-        "sessions_per_week": round(sessions_per_week, 1),
-        "forecast_week_points": forecast_week_points,
-        "target_position": target_position,
-        "points_to_next_position": points_to_next_position,
-        "points_per_session_goal": points_per_session_goal,
-        "summary": summary,
-    }
-
-
 # -----------------------------
 # SESSION STATE
 # -----------------------------
@@ -1419,17 +847,19 @@ if "logged_in" not in st.session_state:
 if "lang" not in st.session_state:
     st.session_state.lang = "es"
 
+# The script body runs once per rerun, so this snapshot is scoped to the current rerun.
+HISTORY_SNAPSHOT = HistorySnapshot(STORAGE)
+
 
 # -----------------------------
 # AUTH
 # -----------------------------
 def login(username, password):
-    users = load_users()
-    user = users[(users["username"] == username) & (users["password"] == password)]
+    role = core.authenticate(STORAGE, username, password)
 
-    if not user.empty:
+    if role is not None:
         st.session_state.logged_in = True
-        st.session_state.role = user.iloc[0]["role"]
+        st.session_state.role = role
         st.session_state.username = username
         return True
     return False
@@ -1477,13 +907,13 @@ else:
     if st.session_state.role == "admin":
         menu = st.sidebar.radio(
             "Navegacion",
-            ["Admin Panel", "Scoreboard General", "Winners", "Period Winners"],
+            ["Admin Panel", "Scoreboard General", "Forecast Board", "Winners", "Period Winners"],
         )
 
         if menu == "Admin Panel":
             render_hero("Admin Control Center", "Gestiona jugadores, puntajes y cuentas en un solo lugar.")
-            df = load_scores()
-            render_kpi_cards(df)
+            standings = load_ranking()
+            render_kpi_cards(standings)
 
             default_player_password = st.text_input(
                 "Password por defecto para nuevas cuentas player",
@@ -1492,16 +922,14 @@ else:
                 key="default_player_password",
             )
 
-            admin_tab_ops, admin_tab_reset = st.tabs(["Points & Trends", "Reset Table"])
+            admin_tab_ops, admin_tab_bulk, admin_tab_reset = st.tabs(["Points & Trends", "Bulk Import", "Reset Table"])
 
             with admin_tab_ops:
                 col_left, col_right = st.columns([1.35, 1])
 
                 with col_left:
                     st.markdown("<p class='section-title'>Fast Points Update</p>", unsafe_allow_html=True)
-                    df["Points"] = pd.to_numeric(df["Points"], errors="coerce").fillna(0).astype(int)
-                    admin_ranking = get_ranking(df)
-                    existing_players = admin_ranking["Player"].tolist()
+                    existing_players = standings.table["Player"].tolist()
                     if "admin_points_delta" not in st.session_state:
                         st.session_state["admin_points_delta"] = 5
 
@@ -1563,51 +991,33 @@ else:
                         elif current_delta == 0:
                             st.warning("El movimiento no puede ser 0.")
                         else:
-                            normalized_target = normalize_identity(clean_player_name)
-                            player_series = df["Player"].astype(str).str.strip()
-                            match_indexes = df.index[player_series.map(normalize_identity) == normalized_target].tolist()
-
-                            if match_indexes:
-                                row_index = match_indexes[0]
-                                canonical_player_name = str(df.at[row_index, "Player"]).strip() or clean_player_name
-                                current_points = int(
-                                    pd.to_numeric(
-                                        pd.Series([df.at[row_index, "Points"]]),
-                                        errors="coerce",
-                                    ).fillna(0).iloc[0]
+                            result = apply_points_change(clean_player_name, current_delta)
+                            status = result["status"] if result else None
+                            if status == "unchanged":
+                                st.warning(f"{result['player']} ya tiene 0 puntos. No se puede restar mas.")
+                            elif status == "rejected":
+                                st.warning("Para crear un jugador nuevo, usa puntos positivos.")
+                            elif status == "applied":
+                                canonical_player_name = result["player"]
+                                applied_delta = result["applied_delta"]
+                                total_after = result["total_after"]
+                                if result["created"]:
+                                    create_player_account_if_missing(canonical_player_name, default_player_password)
+                                trend_note = result["trend_note"]
+                                update_message = f"{canonical_player_name}: {trend_note}" if trend_note else (
+                                    f"{canonical_player_name}: {applied_delta:+d} pts. Total: {total_after}."
                                 )
-                                total_after = max(0, current_points + current_delta)
-                                applied_delta = total_after - current_points
-
-                                if applied_delta == 0:
-                                    st.warning(f"{canonical_player_name} ya tiene 0 puntos. No se puede restar mas.")
-                                else:
-                                    df.at[row_index, "Points"] = total_after
-                                    if save_scores(df):
-                                        trend_note = log_points_update(canonical_player_name, applied_delta, total_after)
-                                        update_message = f"{canonical_player_name}: {trend_note}" if trend_note else (
-                                            f"{canonical_player_name}: {applied_delta:+d} pts. Total: {total_after}."
-                                        )
-                                        if applied_delta != current_delta:
-                                            update_message = f"{update_message} (Ajustado para no bajar de 0.)"
-                                        st.session_state["admin_last_update_message"] = update_message
-                                        st.rerun()
-                            else:
-                                if current_delta < 0:
-                                    st.warning("Para crear un jugador nuevo, usa puntos positivos.")
-                                else:
-                                    total_after = current_delta
-                                    new_row = pd.DataFrame([[clean_player_name, total_after]], columns=["Player", "Points"])
-                                    df = pd.concat([df, new_row], ignore_index=True)
-                                    if save_scores(df):
-                                        create_player_account_if_missing(clean_player_name, default_player_password)
-                                        trend_note = log_points_update(clean_player_name, current_delta, total_after)
-                                        st.session_state["admin_last_update_message"] = (
-                                            f"{clean_player_name}: {trend_note}" if trend_note else (
-                                                f"{clean_player_name}: {current_delta:+d} pts. Total: {total_after}."
-                                            )
-                                        )
-                                        st.rerun()
+                                if applied_delta != current_delta:
+                                    update_message = f"{update_message} (Ajustado para no bajar de 0.)"
+                                ranks = load_rank_index()
+                                new_position = ranks.position_of(canonical_player_name)
+                                if new_position:
+                                    update_message = f"{update_message} Posicion #{new_position} de {len(ranks)}."
+                                    gap_to_next = ranks.points_to_next_position(canonical_player_name)
+                                    if gap_to_next:
+                                        update_message = f"{update_message} Le faltan {gap_to_next} pts para subir."
+                                st.session_state["admin_last_update_message"] = update_message
+                                st.rerun()
 
                     if st.session_state.get("admin_last_update_message"):
                         st.success(st.session_state.pop("admin_last_update_message"))
@@ -1628,7 +1038,9 @@ else:
                     trend_tab_1, trend_tab_2 = st.tabs(["Latest by player", "Recent updates"])
 
                     with trend_tab_1:
-                        latest_by_player = get_latest_trend_by_player(limit=6)
+                        latest_by_player = get_latest_trend_by_player(
+                            get_rerun_history(), limit=6, notes=HISTORY_SNAPSHOT.notes()
+                        )
                         if latest_by_player.empty:
                             st.info("Aun no hay tendencias por jugador.")
                         else:
@@ -1646,7 +1058,9 @@ else:
                                 )
 
                     with trend_tab_2:
-                        recent_history = get_clean_history().sort_values("timestamp", ascending=False).head(6)
+                        recent_history = get_recent_trend_updates(
+                            get_rerun_history(), limit=6, notes=HISTORY_SNAPSHOT.notes()
+                        )
                         if recent_history.empty:
                             st.info("Aun no hay actualizaciones recientes.")
                         else:
@@ -1664,7 +1078,52 @@ else:
                                 )
 
                 st.markdown("<p class='section-title'>Vista previa del ranking</p>", unsafe_allow_html=True)
-                render_dynamic_scoreboard(df)
+                render_dynamic_scoreboard(standings)
+
+            with admin_tab_bulk:
+                st.markdown("<p class='section-title'>Bulk Points Import</p>", unsafe_allow_html=True)
+                st.caption(
+                    "Sube un CSV o pega filas player,delta[,timestamp]. Se validan todas las filas; "
+                    "si alguna es invalida no se aplica nada."
+                )
+                bulk_file = st.file_uploader("CSV file", type=["csv", "txt"], key="admin_bulk_file")
+                bulk_text = st.text_area(
+                    "Or paste rows",
+                    key="admin_bulk_text",
+                    height=180,
+                    placeholder="player,delta,timestamp\nAna Lopez,5,2024-05-01 20:30\nLuis Perez,-2,",
+                )
+
+                if st.button("Validate & apply", key="admin_bulk_apply", use_container_width=True):
+                    try:
+                        if bulk_file is not None:
+                            bulk_rows = core.parse_bulk_file(bulk_file)
+                        else:
+                            bulk_rows = core.parse_bulk_text(bulk_text)
+                    except ValueError as error:
+                        bulk_rows = None
+                        st.error(f"No se pudo leer el archivo: {error}")
+
+                    if bulk_rows is not None and bulk_rows.empty:
+                        st.warning("No hay filas para importar.")
+                    elif bulk_rows is not None:
+                        bulk_report, bulk_created = apply_bulk_import(bulk_rows, default_player_password)
+                        if bulk_report is not None:
+                            st.session_state["admin_bulk_report"] = bulk_report
+                            st.session_state["admin_bulk_created"] = bulk_created
+
+                bulk_report = st.session_state.get("admin_bulk_report")
+                if bulk_report is not None:
+                    invalid_rows = int((bulk_report["status"] == "invalid").sum())
+                    applied_rows = int((bulk_report["status"] == "applied").sum())
+                    if invalid_rows:
+                        st.error(f"{invalid_rows} filas invalidas. No se aplico ningun cambio.")
+                    else:
+                        st.success(f"{applied_rows} de {len(bulk_report)} filas aplicadas en una sola escritura.")
+                    bulk_created = st.session_state.get("admin_bulk_created") or []
+                    if bulk_created:
+                        st.info(f"New player accounts created: {', '.join(bulk_created)}")
+                    st.dataframe(bulk_report, use_container_width=True, hide_index=True)
 
             with admin_tab_reset:
                 st.markdown("<p class='section-title'>Reset Points Table</p>", unsafe_allow_html=True)
@@ -1679,11 +1138,8 @@ else:
 
                     with confirm_col:
                         if st.button("Yes, reset now", key="admin_reset_confirm", use_container_width=True):
-                            reset_df = load_scores()
-                            if not reset_df.empty:
-                                reset_df["Points"] = 0
-                                if not save_scores(reset_df):
-                                    st.stop()
+                            if reset_points_table() is None:
+                                st.stop()
                             st.session_state["admin_reset_pending"] = False
                             st.session_state["admin_last_update_message"] = "Scoreboard reset: todos los puntos en 0."
                             st.rerun()
@@ -1695,16 +1151,18 @@ else:
 
         elif menu == "Scoreboard General":
             render_hero("Scoreboard General", "Visualiza posiciones, tendencia y zonas calientes/frias.")
-            df = load_scores()
+            standings = load_ranking()
             apply_scoreboard_background(opacity=0.24)
-            render_kpi_cards(df)
-            render_score_pdf_download(df, "admin_scoreboard_pdf_download")
+            render_kpi_cards(standings)
+            render_score_pdf_download(standings, "admin_scoreboard_pdf_download")
             render_scoreboard_background_uploader("admin_scoreboard_background_upload_view")
-            render_dynamic_scoreboard(df)
+            render_dynamic_scoreboard(standings)
+
+        elif menu == "Forecast Board":
+            render_forecast_board(load_ranking())
 
         elif menu == "Winners":
-            df = load_scores()
-            render_winners(df)
+            render_winners(load_ranking())
 
         elif menu == "Period Winners":
             render_period_winners_panel()
@@ -1715,19 +1173,22 @@ else:
             ["My Score", "Scoreboard General", "Period Winners"],
         )
 
-        df = load_scores()
+        standings = load_ranking()
 
         if menu == "My Score":
             render_hero("My Score", "Revisa tus puntos y tu posicion actual en el torneo.")
 
-            if st.session_state.username in df["Player"].values:
-                ranking = get_ranking(df)
-                projection = compute_player_week_projection(st.session_state.username, ranking)
+            ranks = load_rank_index()
+            # The login matches the roster case-insensitively; history is stored under the roster name.
+            player_name = player_index(STORAGE).canonical_name(st.session_state.username)
+            if player_name is not None and ranks.position_of(player_name) is not None:
+                player_history = current_player_history(STORAGE, HISTORY_SNAPSHOT, player_name)
+                projection = compute_player_week_projection(player_name, ranks, player_history)
 
                 current_pos = projection["current_position"]
                 if current_pos and current_pos <= 3:
                     zone_label = "HOT 🔥"
-                elif current_pos and current_pos > len(ranking) - 5:
+                elif current_pos and current_pos > len(ranks) - 5:
                     zone_label = "COLD ❄️"
                 else:
                     zone_label = "RUN 🏃"
@@ -1753,6 +1214,17 @@ else:
                 with c8:
                     st.metric("Points to Next Position", projection["points_to_next_position"])
 
+                trend_stats = trend_stats_for(STORAGE).get(STORAGE, player_name)
+                if trend_stats.events:
+                    c9, c10, c11 = st.columns(3)
+                    with c9:
+                        st.metric("Last Session", f"{trend_stats.last_gain:+d} pts")
+                    with c10:
+                        st.metric("Week of Last Session (pts)", trend_stats.week_points)
+                    with c11:
+                        st.metric("Month of Last Session (pts)", trend_stats.month_points)
+                    st.caption(trend_stats.trend_note(current_lang()))
+
                 target_pos = projection["target_position"]
                 if current_pos and target_pos and target_pos < current_pos:
                     st.success(
@@ -1770,9 +1242,14 @@ else:
         elif menu == "Scoreboard General":
             render_hero("Scoreboard", "Compite, sube posiciones y mantente en la zona caliente.")
             apply_scoreboard_background(opacity=0.24)
-            render_kpi_cards(df)
-            render_score_pdf_download(df, "player_scoreboard_pdf_download")
-            render_dynamic_scoreboard(df)
+            render_kpi_cards(standings)
+            render_score_pdf_download(standings, "player_scoreboard_pdf_download")
+            render_dynamic_scoreboard(standings)
 
         elif menu == "Period Winners":
             render_period_winners_panel()
+
+    if st.session_state.role == "admin":
+        st.sidebar.caption(
+            tr("history_snapshot_stats", loads=HISTORY_SNAPSHOT.loads, saved=HISTORY_SNAPSHOT.saved_loads)
+        )
@@ -0,0 +1,257 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import scoreboard_core as core
+from benchmarks.synthetic import REFERENCE_NOW, TOURNAMENT_SIZES, generate_tournament
+
+DEFAULT_SIZES = ["xs", "s"]
+DEFAULT_PDF_MAX_PLAYERS = 2_000
+
+
+class BenchmarkContext:
+    def __init__(self, size, seed):
+        players, events = TOURNAMENT_SIZES[size]
+        self.size = size
+        self.players = players
+        self.events = events
+        self.now = REFERENCE_NOW
+        self.scores, self.raw_history = generate_tournament(players, events, seed=seed)
+        self.history = core.clean_history(self.raw_history)
+        # The snapshot's form of the same events: interned players, int32 values, no notes.
+        self.columnar = core.to_columnar_history(self.history)
+        # The same events as migrated files store them: epoch-millisecond integers.
+        self.typed_history = self.raw_history.assign(
+            timestamp=self.history["timestamp"].to_numpy(dtype="datetime64[ms]").astype(np.int64)
+        )
+        self.ranking = core.get_ranking(self.scores)
+        self.ranks = core.RankIndex.from_scores(self.scores)
+        self.buckets = core.DailyPointBuckets()
+        self.buckets.rebuild(self.history, version=0)
+        # Files the cases write go here and are removed by close().
+        self._directory = tempfile.TemporaryDirectory(prefix="scoreboard_bench_")
+        self.winners_archive = core.WinnersArchive(os.path.join(self._directory.name, "winners_archive.json"))
+        self.player_histories = core.PlayerHistoryIndex()
+        self.player_histories.rebuild(self.history, version=0)
+        self.top_player = self.ranking.iloc[0]["Player"]
+        self.top_trend = core.PlayerTrendStats.from_history(self.history[self.history["player"] == self.top_player])
+        self.top_row = int(self.scores["Player"].astype(str).str.strip().tolist().index(self.top_player))
+        self._segments = None
+
+    def window(self, start, end):
+        # Cleaned events in [start, end), like HistorySnapshot.window on an unsegmented file.
+        timestamps = self.columnar["timestamp"]
+        return self.columnar[(timestamps >= start) & (timestamps < end)]
+
+    def segments(self):
+        # Month segments of the typed history, written on first use.
+        if self._segments is None:
+            self._segments = core.HistorySegments(os.path.join(self._directory.name, "score_history"))
+            self._segments.save(self.typed_history)
+        return self._segments
+
+    def close(self):
+        self._directory.cleanup()
+
+
+def _add_trend_event(stats, now):
+    stats.add(now, 5, stats.total_after + 5)
+    return stats.trend_note()
+
+
+def _cases(context, pdf_max_players):
+    latest = context.history["timestamp"].max()
+    cases = {
+        "clean_history": lambda: core.clean_history(context.raw_history),
+        "clean_history_typed": lambda: core.clean_history(context.typed_history),
+        "to_columnar_history": lambda: core.to_columnar_history(context.history),
+        "history_notes_latest": lambda: core.HistoryNotes.latest(context.history),
+        "get_ranking": lambda: core.get_ranking(context.scores),
+        "build_leaderboard": lambda: core.build_leaderboard(context.ranking),
+        "daily_buckets_rebuild": lambda: core.DailyPointBuckets().rebuild(context.history, version=0),
+        "daily_buckets_rebuild_columnar": lambda: core.DailyPointBuckets().rebuild(context.columnar, version=0),
+        "get_period_activity_ranking_7d": lambda: core.get_period_activity_ranking(
+            context.scores, 7, context.buckets, now=context.now
+        ),
+        "get_period_activity_ranking_30d": lambda: core.get_period_activity_ranking(
+            context.scores, 30, context.buckets, now=context.now
+        ),
+        "get_period_activity_ranking_30d_exact": lambda: core.get_period_activity_ranking(
+            context.scores, 30, context.buckets, now=context.now, load_window=context.window
+        ),
+        "segments_load_all": lambda: context.segments().load(),
+        "segments_load_open_month": lambda: context.segments().load(
+            start=pd.Timestamp(year=context.now.year, month=context.now.month, day=1)
+        ),
+        "plan_compaction_90d": lambda: core.plan_compaction(
+            context.typed_history, None, context.now - pd.Timedelta(days=90)
+        ),
+        "player_history_rebuild": lambda: core.PlayerHistoryIndex().rebuild(context.history, version=0),
+        "player_history_rebuild_columnar": lambda: core.PlayerHistoryIndex().rebuild(context.columnar, version=0),
+        "player_history_events": lambda: context.player_histories.events(context.top_player),
+        "compute_weekly_winners": lambda: core.compute_weekly_winners(context.history, latest.year, latest.month),
+        "compute_monthly_winners": lambda: core.compute_monthly_winners(context.history),
+        "compute_period_winners": lambda: core.compute_period_winners(context.history),
+        "compute_period_winners_columnar": lambda: core.compute_period_winners(context.columnar),
+        "archived_period_winners": lambda: context.winners_archive.period_winners(context.history, now=context.now),
+        "build_trend_note_from_history": lambda: core.build_trend_note_from_history(
+            context.history, context.top_player
+        ),
+        "trend_stats_add_note": lambda: _add_trend_event(context.top_trend.copy(), context.now),
+        "compute_player_week_projection": lambda: core.compute_player_week_projection(
+            context.top_player, context.ranks, context.history, now=context.now
+        ),
+        "compute_week_projections": lambda: core.compute_week_projections(
+            context.ranking, context.history, now=context.now
+        ),
+        "compute_week_projections_columnar": lambda: core.compute_week_projections(
+            context.ranking, context.columnar, now=context.now
+        ),
+        "rank_index_build": lambda: core.RankIndex.from_scores(context.scores),
+        # Each repeat updates a freshly built index, so every timing moves the same key.
+        "rank_index_update": (
+            lambda: core.RankIndex.from_scores(context.scores),
+            lambda ranks: ranks.update(
+                [(context.top_row, context.top_player, ranks.points_of(context.top_player) + 1)]
+            ),
+        ),
+    }
+    if context.players <= pdf_max_players:
+        cases["build_scoreboard_pdf"] = lambda: core.build_scoreboard_pdf(context.scores)
+    cases["build_native_scoreboard_pdf"] = lambda: core.build_native_scoreboard_pdf(context.scores)
+    return cases
+
+
+def measure(function, repeat, setup=None):
+    # With a setup, each run gets setup()'s result as its argument and setup stays untimed.
+    def prepare():
+        return () if setup is None else (setup(),)
+
+    timings = []
+    for _ in range(repeat):
+        arguments = prepare()
+        gc.collect()
+        start = time.perf_counter()
+        function(*arguments)
+        timings.append(time.perf_counter() - start)
+
+    # Peak memory comes from a separate traced run so tracing overhead stays out of the timings.
+    arguments = prepare()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function(*arguments)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": statistics.median(timings),
+        "min_seconds": min(timings),
+        "peak_mb": peak / (1024 * 1024),
+    }
+
+
+def run(sizes, repeat, seed, only=None, pdf_max_players=DEFAULT_PDF_MAX_PLAYERS):
+    results = {}
+    for size in sizes:
+        context = BenchmarkContext(size, seed)
+        print(f"[{size}] {context.players} players, {context.events} events")
+        results[size] = {}
+        try:
+            for name, case in _cases(context, pdf_max_players).items():
+                if only and name not in only:
+                    continue
+                setup, function = case if isinstance(case, tuple) else (None, case)
+                result = measure(function, repeat, setup=setup)
+                results[size][name] = result
+                print(f"  {name:<34} {result['seconds'] * 1000:>10.2f} ms {result['peak_mb']:>10.2f} MB")
+        finally:
+            context.close()
+    return results
+
+
+def environment_info():
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "recorded_at": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def save_baseline(path, results, seed):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"environment": environment_info(), "seed": seed, "results": results}, file, indent=2)
+
+
+def compare(results, baseline_path, threshold):
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = json.load(file)["results"]
+
+    regressions = []
+    print(f"\nComparison against {baseline_path} (regression if slower or larger than x{threshold:.2f}):")
+    for size, functions in results.items():
+        for name, result in functions.items():
+            previous = baseline.get(size, {}).get(name)
+            if previous is None:
+                continue
+            time_ratio = result["seconds"] / max(previous["seconds"], 1e-9)
+            memory_ratio = result["peak_mb"] / max(previous["peak_mb"], 1e-9)
+            flag = ""
+            if time_ratio > threshold or memory_ratio > threshold:
+                flag = "  REGRESSION"
+                regressions.append((size, name))
+            print(f"  [{size}] {name:<34} time x{time_ratio:>6.2f}  memory x{memory_ratio:>6.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scoring core on synthetic tournaments.")
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        default=DEFAULT_SIZES,
+        choices=list(TOURNAMENT_SIZES),
+        help="Tournament sizes: " + ", ".join(
+            f"{name}={players} players/{events} events" for name, (players, events) in TOURNAMENT_SIZES.items()
+        ),
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--only", nargs="+", help="Run only these benchmark names.")
+    parser.add_argument("--pdf-max-players", type=int, default=DEFAULT_PDF_MAX_PLAYERS)
+    parser.add_argument("--save", metavar="PATH", help="Write the results as a baseline JSON file.")
+    parser.add_argument("--compare", metavar="PATH", help="Compare the results against a baseline JSON file.")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat, args.seed, only=args.only, pdf_max_players=args.pdf_max_players)
+
+    if args.save:
+        save_baseline(args.save, results, args.seed)
+        print(f"\nBaseline saved to {args.save}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
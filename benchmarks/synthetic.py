@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from scoreboard_core import HISTORY_COLUMNS, HISTORY_TIMESTAMP_FORMAT
+
+# Fixed clock so rolling windows and projections see the same data on every run.
+REFERENCE_NOW = pd.Timestamp("2026-06-30 22:00:00")
+
+TOURNAMENT_SIZES = {
+    "xs": (100, 1_000),
+    "s": (1_000, 100_000),
+    "m": (10_000, 1_000_000),
+    "l": (100_000, 10_000_000),
+}
+
+
+def player_names(players):
+    width = len(str(players))
+    return np.array([f"Player {index:0{width}d}" for index in range(1, players + 1)], dtype=object)
+
+
+def generate_tournament(players, events, days=180, seed=7, now=REFERENCE_NOW, with_notes=False):
+    # Returns (scores, history) shaped like scores.csv and score_history.csv as loaded from disk:
+    # history timestamps are formatted strings and total_after is each player's running total.
+    rng = np.random.default_rng(seed)
+    names = player_names(players)
+
+    # A few players are far more active than the rest, as in a real season.
+    activity = rng.pareto(1.2, players) + 1.0
+    player_ids = rng.choice(players, size=events, p=activity / activity.sum())
+
+    offsets = np.sort(rng.integers(0, days * 86_400, size=events))
+    timestamps = (now - pd.Timedelta(days=days)) + pd.to_timedelta(offsets, unit="s")
+
+    points = rng.integers(-5, 26, size=events)
+    points[points == 0] = 1
+
+    frame = pd.DataFrame({"player_id": player_ids, "points_added": points})
+    totals = frame.groupby("player_id")["points_added"].cumsum().to_numpy()
+
+    history = pd.DataFrame({
+        "timestamp": timestamps.strftime(HISTORY_TIMESTAMP_FORMAT),
+        "player": names[player_ids],
+        "points_added": points,
+        "total_after": totals,
+        "trend_note": (
+            np.where(points > 0, "+ pts. Trend: upward.", "- pts. Trend: downward.")
+            if with_notes else ""
+        ),
+    })[HISTORY_COLUMNS]
+
+    final_points = np.zeros(players, dtype=np.int64)
+    last_rows = frame.groupby("player_id").tail(1).index.to_numpy()
+    final_points[player_ids[last_rows]] = totals[last_rows]
+    scores = pd.DataFrame({"Player": names, "Points": final_points})
+    return scores, history
@@ -0,0 +1,120 @@
+# Headless scoring core: storage, ranking, periods and projections with no Streamlit import and
+# no file side effects on import. The Streamlit app in ScoardBoard1.py is a thin layer on top.
+from .accounts import (
+    AccountIndex,
+    PlayerIndex,
+    account_index,
+    assign_accounts_to_scoreboard_players,
+    authenticate,
+    create_player_account_if_missing,
+    create_player_accounts_if_missing,
+    normalize_identity,
+    player_index,
+)
+from .aggregates import (
+    DailyPointBuckets,
+    PlayerHistoryIndex,
+    current_daily_buckets,
+    daily_buckets_for,
+    event_counts,
+    player_codes,
+    player_history_for,
+    to_day_number,
+    to_day_numbers,
+)
+from .assets import IMAGE_VARIANTS, ImageAssets, image_assets_for
+from .bulk import (
+    MAX_BULK_DELTA,
+    apply_bulk_points,
+    normalize_bulk_frame,
+    parse_bulk_file,
+    parse_bulk_text,
+    validate_bulk_rows,
+)
+from .history import (
+    NOTE_EVENTS_PER_PLAYER,
+    HistoryNotes,
+    HistorySnapshot,
+    PlayerTrendStats,
+    TrendStatsCache,
+    build_trend_note_from_history,
+    clean_history,
+    current_player_history,
+    get_clean_history,
+    get_history_notes,
+    get_latest_trend_by_player,
+    get_player_trend_feed,
+    get_recent_trend_updates,
+    load_player_history,
+    load_trend_history,
+    log_points_update,
+    to_columnar_history,
+    trend_stats_for,
+)
+from .i18n import DEFAULT_LANGUAGE, TRANSLATIONS, translate
+from .leaderboard import (
+    LEADERBOARD_COLUMNS,
+    PAGE_SIZES,
+    build_leaderboard,
+    filter_leaderboard,
+    leaderboard_page_count,
+    leaderboard_page_of,
+    leaderboard_window,
+    style_leaderboard_window,
+)
+from .native_pdf import build_native_scoreboard_pdf, merge_pdf_documents, write_scoreboard_pdf
+from .pdf import (
+    NATIVE_PDF_MIN_PLAYERS,
+    PDF_ENGINES,
+    ScoreboardPdfCache,
+    build_scoreboard_pdf,
+    cached_scoreboard_pdf,
+    resolve_pdf_engine,
+    scoreboard_pdf_key,
+)
+from .periods import (
+    PERIOD_WINNER_COLUMNS,
+    WinnersArchive,
+    compute_monthly_winners,
+    compute_period_winners,
+    compute_weekly_winners,
+    monthly_winners_of,
+    weekly_winners_of,
+    winners_archive_for,
+)
+from .projections import PROJECTION_COLUMNS, compute_player_week_projection, compute_week_projections
+from .ranking import (
+    RANKING_COLUMNS,
+    RankIndex,
+    Ranking,
+    get_period_activity_ranking,
+    get_ranking,
+    get_status_icon,
+    rank_index,
+    ranking_for,
+    ranking_table,
+)
+from .storage import (
+    HISTORY_COLUMNS,
+    HISTORY_MONTH_COLUMNS,
+    HISTORY_TIMESTAMP_FORMAT,
+    ROLLUP_COLUMNS,
+    SCORES_COLUMNS,
+    USERS_COLUMNS,
+    CachedStorage,
+    CsvStorage,
+    HistorySegments,
+    SqliteStorage,
+    StorageError,
+    compact_history,
+    get_storage,
+    migrate_csv_to_sqlite,
+    migrate_history_timestamps,
+    month_bounds,
+    parse_history_timestamps,
+    plan_compaction,
+    segment_csv_history,
+    summarize_history_months,
+    to_history_timestamp,
+)
+from .writer import GroupCommitWriter, writer_for
@@ -0,0 +1,117 @@
+import pandas as pd
+
+
+def normalize_identity(value):
+    return str(value).strip().casefold()
+
+
+# -----------------------------
+# IDENTITY INDEXES
+# -----------------------------
+class PlayerIndex:
+    # Scores roster with a casefolded-name -> row map. Shared per scores version through the
+    # storage cache, so it must be treated as read-only; copy() before changing it.
+    def __init__(self, names, points, row_by_key):
+        self.names = names
+        self.points = points
+        self.row_by_key = row_by_key
+
+    @classmethod
+    def from_scores(cls, scores):
+        names = scores["Player"].astype(str).str.strip().tolist()
+        points = pd.to_numeric(scores["Points"], errors="coerce").fillna(0).astype(int).tolist()
+        row_by_key = {}
+        for row_index, name in enumerate(names):
+            row_by_key.setdefault(normalize_identity(name), row_index)
+        return cls(names, points, row_by_key)
+
+    def copy(self):
+        return PlayerIndex(list(self.names), list(self.points), dict(self.row_by_key))
+
+    def row(self, player_name):
+        return self.row_by_key.get(normalize_identity(player_name))
+
+    def canonical_name(self, player_name):
+        row_index = self.row(player_name)
+        return None if row_index is None else self.names[row_index]
+
+
+class AccountIndex:
+    # Casefolded username -> [(username, password, role), ...] in file order.
+    def __init__(self, accounts_by_key):
+        self.accounts_by_key = accounts_by_key
+
+    @classmethod
+    def from_users(cls, users):
+        accounts_by_key = {}
+        for username, password, role in zip(users["username"], users["password"], users["role"]):
+            accounts_by_key.setdefault(normalize_identity(username), []).append((username, password, role))
+        return cls(accounts_by_key)
+
+    def has_account(self, name):
+        return normalize_identity(name) in self.accounts_by_key
+
+    def with_accounts(self, accounts):
+        accounts_by_key = dict(self.accounts_by_key)
+        for username, password, role in accounts:
+            key = normalize_identity(username)
+            accounts_by_key[key] = accounts_by_key.get(key, []) + [(username, password, role)]
+        return AccountIndex(accounts_by_key)
+
+    def authenticate(self, username, password):
+        # Same rule as the old frame scan: exact username and password, first matching row wins.
+        for stored_username, stored_password, role in self.accounts_by_key.get(normalize_identity(username), []):
+            if stored_username == username and stored_password == password:
+                return role
+        return None
+
+
+def player_index(storage):
+    return storage.derive("player_index", "scores", lambda: PlayerIndex.from_scores(storage.load_scores()))
+
+
+def account_index(storage):
+    return storage.derive("account_index", "users", lambda: AccountIndex.from_users(storage.load_users()))
+
+
+# -----------------------------
+# ACCOUNTS
+# -----------------------------
+def create_player_account_if_missing(storage, player_name, default_password):
+    return bool(create_player_accounts_if_missing(storage, [player_name], default_password))
+
+
+def create_player_accounts_if_missing(storage, player_names, default_password):
+    # Creates every missing player account with a single users save; returns the created names.
+    version_before = storage.data_version("users")
+    accounts = account_index(storage)
+
+    seen_players = set()
+    missing_players = []
+    for player in player_names:
+        clean_player_name = str(player).strip()
+        player_key = normalize_identity(clean_player_name)
+        if clean_player_name and player_key not in seen_players and not accounts.has_account(player_key):
+            seen_players.add(player_key)
+            missing_players.append(clean_player_name)
+
+    if not missing_players:
+        return []
+
+    new_accounts = [(player, default_password, "player") for player in missing_players]
+    users = pd.concat(
+        [storage.load_users(), pd.DataFrame(new_accounts, columns=["username", "password", "role"])],
+        ignore_index=True,
+    )
+    storage.save_users(users)
+    storage.replace_derived("account_index", "users", version_before, accounts.with_accounts(new_accounts))
+    return missing_players
+
+
+def assign_accounts_to_scoreboard_players(storage, default_password):
+    return create_player_accounts_if_missing(storage, player_index(storage).names, default_password)
+
+
+def authenticate(storage, username, password):
+    # Returns the account role for valid credentials, otherwise None.
+    return account_index(storage).authenticate(username, password)
@@ -0,0 +1,270 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .storage import HISTORY_COLUMNS, parse_history_timestamps
+
+EPOCH_DAY = np.datetime64("1970-01-01", "D")
+
+
+def to_day_number(timestamp):
+    return int((np.datetime64(pd.Timestamp(timestamp).date(), "D") - EPOCH_DAY).astype(np.int64))
+
+
+def to_day_numbers(timestamps):
+    return (timestamps.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]") - EPOCH_DAY).astype(np.int64)
+
+
+def player_codes(history):
+    # Integer code per row and the names they index, in order of first appearance. A
+    # categorical player column (the columnar history) is factorized from its codes, and only
+    # players with rows in this frame get one.
+    codes, players = pd.factorize(history["player"])
+    return codes, np.asarray(players, dtype=object)
+
+
+def event_counts(history):
+    # Events behind each history row: compacted daily rows carry theirs in "events".
+    if "events" not in history.columns:
+        return np.ones(len(history), dtype=np.int64)
+    return history["events"].fillna(1).to_numpy(dtype=np.int64)
+
+
+class DailyPointBuckets:
+    # Points per player per day, kept as one sorted (player, day) array with running sums so a
+    # window total is two binary searches per player. New events land in a small pending map
+    # and are folded into the arrays once it grows past `compact_after` entries.
+    def __init__(self, compact_after=2048):
+        self.compact_after = compact_after
+        self.version = None
+        # Earliest event time the buckets were built from; None means the whole history.
+        self.since = None
+        self._lock = threading.Lock()
+        self._players = []
+        self._player_index = {}
+        self._totals = {}
+        self._pending = {}
+        self._keys = np.empty(0, dtype=np.int64)
+        self._cumsum = np.empty(0, dtype=np.int64)
+        self._day_span = 1
+
+    def is_current(self, version):
+        return self.version is not None and self.version == version
+
+    def covers(self, since):
+        return self.since is None or (since is not None and self.since <= since)
+
+    def rebuild(self, history, version, since=None):
+        with self._lock:
+            self.since = since
+            self._players = []
+            self._player_index = {}
+            self._totals = {}
+            self._pending = {}
+
+            if history.empty:
+                self._compact()
+            else:
+                codes, players = player_codes(history)
+                player_ids = np.array([self._player_id(player) for player in players.tolist()], dtype=np.int64)
+                days = to_day_numbers(history["timestamp"])
+                # Keys laid out as _compact lays them out, so the sorted groupby is the compacted
+                # array as is.
+                self._day_span = int(max(days.max(), 0)) + 2
+                daily = pd.Series(history["points_added"].to_numpy(dtype=np.int64)).groupby(
+                    player_ids[codes] * self._day_span + days, sort=True
+                ).sum()
+                self._keys = daily.index.to_numpy(dtype=np.int64)
+                self._cumsum = np.cumsum(daily.to_numpy())
+                self._totals = dict(zip(
+                    zip((self._keys // self._day_span).tolist(), (self._keys % self._day_span).tolist()),
+                    daily.to_numpy().tolist(),
+                ))
+            self.version = version
+
+    def add_event(self, player, timestamp, points, expected_version, new_version):
+        return self.add_events([(player, timestamp, points)], expected_version, new_version)
+
+    def add_events(self, events, expected_version, new_version):
+        # Applies (player, timestamp, points) events written between the two data versions.
+        with self._lock:
+            if self.version is None or self.version != expected_version:
+                return False
+            for player, timestamp, points in events:
+                key = (self._player_id(player), to_day_number(timestamp))
+                self._totals[key] = self._totals.get(key, 0) + int(points)
+                self._pending[key] = self._pending.get(key, 0) + int(points)
+            if len(self._pending) > self.compact_after:
+                self._compact()
+            self.version = new_version
+            return True
+
+    def window_totals(self, start_day, end_day=None):
+        # Sum of points per player over days in [start_day, end_day] (end inclusive, open if None).
+        with self._lock:
+            totals = np.zeros(len(self._players), dtype=np.int64)
+            compacted_players = int(self._keys[-1] // self._day_span) + 1 if len(self._keys) else 0
+            if compacted_players:
+                player_ids = np.arange(compacted_players, dtype=np.int64)
+                base = player_ids * self._day_span
+                low = np.clip(start_day, 0, self._day_span - 1) if start_day is not None else 0
+                high = (
+                    np.clip(end_day, -1, self._day_span - 1) if end_day is not None else self._day_span - 1
+                )
+                totals[:compacted_players] = (
+                    self._prefix_at(base + high) - self._prefix_at(base + low - 1)
+                    if high >= low else 0
+                )
+
+            for (player_id, day), points in self._pending.items():
+                if (start_day is None or day >= start_day) and (end_day is None or day <= end_day):
+                    totals[player_id] += points
+
+            return pd.Series(totals, index=pd.Index(list(self._players), name="player"), dtype=np.int64)
+
+    def _prefix_at(self, keys):
+        # Running total of every bucket whose key is <= `keys`; keys are player * span + day.
+        positions = np.searchsorted(self._keys, keys, side="right")
+        prefix = np.concatenate([[0], self._cumsum])
+        return prefix[positions]
+
+    def _player_id(self, player):
+        player_id = self._player_index.get(player)
+        if player_id is None:
+            player_id = len(self._players)
+            self._players.append(player)
+            self._player_index[player] = player_id
+        return player_id
+
+    def _compact(self):
+        self._pending = {}
+        if not self._totals:
+            self._keys = np.empty(0, dtype=np.int64)
+            self._cumsum = np.empty(0, dtype=np.int64)
+            self._day_span = 1
+            return
+
+        entries = np.array([(player_id, day, points) for (player_id, day), points in self._totals.items()], dtype=np.int64)
+        # Day numbers are non-negative for any post-1970 timestamp; the span leaves room for a
+        # query one day past the newest bucket.
+        self._day_span = int(max(entries[:, 1].max(), 0)) + 2
+        keys = entries[:, 0] * self._day_span + entries[:, 1]
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._cumsum = np.cumsum(entries[order, 2])
+
+
+class PlayerHistoryIndex:
+    # Row positions of each player's events in the cleaned history, so one player's history is
+    # a take of their own rows instead of a mask over every event. Events written after the
+    # rebuild are kept per player in a pending list, stamped with the data version like the
+    # daily buckets. The indexed frame is shared and must be treated as read-only.
+    def __init__(self):
+        self.version = None
+        self._lock = threading.Lock()
+        self._history = pd.DataFrame(columns=HISTORY_COLUMNS)
+        self._positions = {}
+        self._pending = {}
+
+    def is_current(self, version):
+        return self.version is not None and self.version == version
+
+    def rebuild(self, history, version):
+        positions = {}
+        if not history.empty:
+            codes, players = player_codes(history)
+            order = np.argsort(codes, kind="stable")
+            bounds = np.cumsum(np.bincount(codes, minlength=len(players)))
+            starts = np.concatenate([[0], bounds[:-1]])
+            positions = {
+                player: order[start:end]
+                for player, start, end in zip(players.tolist(), starts.tolist(), bounds.tolist())
+            }
+
+        with self._lock:
+            self._history = history
+            self._positions = positions
+            self._pending = {}
+            self.version = version
+
+    def add_events(self, rows, expected_version, new_version):
+        # Applies history rows (timestamp, player, points_added, total_after, trend_note) written
+        # between the two data versions; rows the cleaner would drop are skipped.
+        with self._lock:
+            if self.version is None or self.version != expected_version:
+                return False
+            for timestamp, player, points_added, total_after, trend_note in rows:
+                player = str(player).strip()
+                if player == "" or int(points_added) == 0:
+                    continue
+                self._pending.setdefault(player, []).append(
+                    (timestamp, player, int(points_added), int(total_after), str(trend_note))
+                )
+            self.version = new_version
+            return True
+
+    def events(self, player):
+        # The player's cleaned events in stored order.
+        player = str(player).strip()
+        with self._lock:
+            history = self._history
+            positions = self._positions.get(player)
+            pending = list(self._pending.get(player, []))
+
+        parts = []
+        if positions is not None:
+            parts.append(history.iloc[positions])
+        if pending:
+            pending_frame = pd.DataFrame(pending, columns=HISTORY_COLUMNS)
+            pending_frame["timestamp"] = parse_history_timestamps(pending_frame["timestamp"])
+            parts.append(pending_frame)
+        if not parts:
+            return history.iloc[0:0]
+        if len(parts) == 1:
+            return parts[0]
+        return pd.concat(parts, ignore_index=True)
+
+
+_BUCKETS = {}
+_BUCKETS_LOCK = threading.Lock()
+_PLAYER_HISTORIES = {}
+
+
+def daily_buckets_for(storage):
+    # One aggregate per shared storage instance, so it outlives Streamlit reruns like the cache.
+    with _BUCKETS_LOCK:
+        buckets = _BUCKETS.get(id(storage))
+        if buckets is None:
+            buckets = DailyPointBuckets()
+            _BUCKETS[id(storage)] = buckets
+    return buckets
+
+
+def current_daily_buckets(storage, snapshot, days=None, now=None):
+    # Returns the shared buckets, rebuilt if the stored data moved on. When the backend can read
+    # history by time and the caller only queries the last `days` days, the rebuild reads the
+    # months from that cutoff instead of the whole history.
+    buckets = daily_buckets_for(storage)
+    since = None
+    if days is not None and storage.backend.ranged_history:
+        cutoff = (now if now is not None else pd.Timestamp.now()) - pd.Timedelta(days=days)
+        since = pd.Timestamp(year=cutoff.year, month=cutoff.month, day=1)
+
+    version = storage.data_version("history")
+    if not buckets.is_current(version) or not buckets.covers(since):
+        if since is None:
+            buckets.rebuild(snapshot.get(), snapshot.version)
+        else:
+            buckets.rebuild(snapshot.window(start=since), version, since=since)
+    return buckets
+
+
+def player_history_for(storage):
+    with _BUCKETS_LOCK:
+        index = _PLAYER_HISTORIES.get(id(storage))
+        if index is None:
+            index = PlayerHistoryIndex()
+            _PLAYER_HISTORIES[id(storage)] = index
+    return index
+
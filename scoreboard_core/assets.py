@@ -0,0 +1,232 @@
+import base64
+import hashlib
+import io
+import os
+import tempfile
+import threading
+
+# name -> (max width, max height, format). Sizes are 2x the CSS box so they stay sharp on HiDPI.
+IMAGE_VARIANTS = {
+    "hero": (136, 136, "WEBP"),
+    "background": (1440, 1440, "WEBP"),
+    "pdf": (256, 256, "PNG"),
+}
+
+_MIME_TYPES = {"PNG": "image/png", "WEBP": "image/webp"}
+_EXTENSIONS = {"PNG": "png", "WEBP": "webp"}
+
+
+def _resize_image(data, max_width, max_height, image_format):
+    # Returns (bytes, format), or None when Pillow is missing or cannot decode the image.
+    try:
+        from PIL import Image
+    except Exception:
+        return None
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.load()
+            image = image.convert("RGBA")
+            image.thumbnail((max_width, max_height), Image.LANCZOS)
+            buffer = io.BytesIO()
+            if image_format == "WEBP":
+                image.save(buffer, format="WEBP", quality=82, method=4)
+            else:
+                image.save(buffer, format="PNG", optimize=True)
+    except Exception:
+        if image_format != "PNG":
+            return _resize_image(data, max_width, max_height, "PNG")
+        return None
+    return buffer.getvalue(), image_format
+
+
+def _write_bytes_atomic(data, file_path):
+    directory = os.path.dirname(os.path.abspath(file_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=os.path.splitext(file_path)[1])
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, file_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+class ImageAssets:
+    # Serves size-tiered variants of one uploaded image. Variants are keyed on a hash of the
+    # source bytes and kept in memory and in cache_dir, so pages inline a few KB of cached data
+    # URI instead of re-encoding the full upload on every rerun. The source is only re-read
+    # when its file stamp changes.
+    def __init__(self, source_file, cache_dir):
+        self.source_file = source_file
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._content_hash = None
+        self._variants = {}
+        self._data_uris = {}
+        self.builds = 0
+
+    def version(self):
+        # Content hash of the current source image, or None when there is none.
+        try:
+            stat = os.stat(self.source_file)
+        except OSError:
+            return None
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if stamp == self._stamp:
+                return self._content_hash
+
+        try:
+            with open(self.source_file, "rb") as file:
+                content_hash = hashlib.sha256(file.read()).hexdigest()[:16]
+        except OSError:
+            return None
+
+        with self._lock:
+            self._stamp = stamp
+            self._content_hash = content_hash
+        return content_hash
+
+    def save_source(self, data):
+        # Stores a new upload and builds every variant once. Re-uploading the same bytes is a no-op.
+        data = bytes(data)
+        content_hash = hashlib.sha256(data).hexdigest()[:16]
+        if content_hash == self.version():
+            return content_hash
+
+        _write_bytes_atomic(data, self.source_file)
+        for name in IMAGE_VARIANTS:
+            self._variant(content_hash, name, source=data)
+        self._prune(content_hash)
+        return content_hash
+
+    def variant(self, name):
+        # Returns (bytes, mime type) for the current image, or None when there is no image.
+        content_hash = self.version()
+        if content_hash is None:
+            return None
+        return self._variant(content_hash, name)
+
+    def variant_bytes(self, name):
+        variant = self.variant(name)
+        return None if variant is None else variant[0]
+
+    def variant_path(self, name):
+        # On-disk file of the variant (built if needed), for consumers that want a path.
+        content_hash = self.version()
+        if content_hash is None or self._variant(content_hash, name) is None:
+            return None
+        for image_format in _EXTENSIONS.values():
+            file_path = self._cache_path(content_hash, name, image_format)
+            if os.path.exists(file_path):
+                return file_path
+        return self.source_file
+
+    def data_uri(self, name):
+        content_hash = self.version()
+        if content_hash is None:
+            return None
+
+        key = (content_hash, name)
+        with self._lock:
+            uri = self._data_uris.get(key)
+        if uri is None:
+            variant = self._variant(content_hash, name)
+            if variant is None:
+                return None
+            data, mime_type = variant
+            uri = f"data:{mime_type};base64,{base64.b64encode(data).decode('utf-8')}"
+            with self._lock:
+                self._data_uris = {
+                    cached_key: cached_uri
+                    for cached_key, cached_uri in self._data_uris.items()
+                    if cached_key[0] == content_hash
+                }
+                self._data_uris[key] = uri
+        return uri
+
+    def _cache_path(self, content_hash, name, extension):
+        return os.path.join(self.cache_dir, f"{content_hash}-{name}.{extension}")
+
+    def _variant(self, content_hash, name, source=None):
+        key = (content_hash, name)
+        with self._lock:
+            variant = self._variants.get(key)
+        if variant is not None:
+            return variant
+
+        max_width, max_height, image_format = IMAGE_VARIANTS[name]
+        for cached_format, extension in _EXTENSIONS.items():
+            file_path = self._cache_path(content_hash, name, extension)
+            if os.path.exists(file_path):
+                try:
+                    with open(file_path, "rb") as file:
+                        variant = (file.read(), _MIME_TYPES[cached_format])
+                    break
+                except OSError:
+                    pass
+
+        if variant is None:
+            if source is None:
+                try:
+                    with open(self.source_file, "rb") as file:
+                        source = file.read()
+                except OSError:
+                    return None
+                if hashlib.sha256(source).hexdigest()[:16] != content_hash:
+                    return None
+
+            resized = _resize_image(source, max_width, max_height, image_format)
+            self.builds += 1
+            if resized is None:
+                # Without Pillow the original upload is served as is.
+                variant = (source, "image/png")
+            else:
+                data, built_format = resized
+                variant = (data, _MIME_TYPES[built_format])
+                try:
+                    _write_bytes_atomic(data, self._cache_path(content_hash, name, _EXTENSIONS[built_format]))
+                except OSError:
+                    pass
+
+        with self._lock:
+            self._variants = {
+                cached_key: cached_variant
+                for cached_key, cached_variant in self._variants.items()
+                if cached_key[0] == content_hash
+            }
+            self._variants[key] = variant
+        return variant
+
+    def _prune(self, content_hash):
+        # Variants of replaced images are dropped from disk.
+        try:
+            file_names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for file_name in file_names:
+            if not file_name.startswith(f"{content_hash}-") and "-" in file_name:
+                try:
+                    os.remove(os.path.join(self.cache_dir, file_name))
+                except OSError:
+                    pass
+
+
+_IMAGE_ASSETS = {}
+_IMAGE_ASSETS_LOCK = threading.Lock()
+
+
+def image_assets_for(source_file, cache_dir=None):
+    # Shared per source file, so the in-memory variants outlive Streamlit reruns.
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(source_file)), ".scoreboard_assets")
+    key = (os.path.abspath(source_file), os.path.abspath(cache_dir))
+    with _IMAGE_ASSETS_LOCK:
+        assets = _IMAGE_ASSETS.get(key)
+        if assets is None:
+            assets = ImageAssets(source_file, cache_dir)
+            _IMAGE_ASSETS[key] = assets
+    return assets
@@ -0,0 +1,172 @@
+import csv
+import math
+
+import numpy as np
+import pandas as pd
+
+from .accounts import create_player_accounts_if_missing
+from .i18n import DEFAULT_LANGUAGE
+from .writer import writer_for
+
+BULK_COLUMNS = ["player", "delta", "timestamp"]
+# Largest |delta| one row may apply; anything bigger is a typo and would overflow the totals.
+MAX_BULK_DELTA = 1_000_000_000
+BULK_REPORT_COLUMNS = ["row", "player", "delta", "timestamp", "status", "applied_delta", "total_after", "message"]
+
+_COLUMN_ALIASES = {
+    "player": "player",
+    "jugador": "player",
+    "name": "player",
+    "username": "player",
+    "delta": "delta",
+    "points": "delta",
+    "puntos": "delta",
+    "points_added": "delta",
+    "timestamp": "timestamp",
+    "date": "timestamp",
+    "fecha": "timestamp",
+}
+
+
+def parse_bulk_text(text):
+    # Pasted rows of player,delta[,timestamp]; the separator is sniffed, the header is optional and
+    # rows may omit the timestamp.
+    lines = [line for line in str(text).splitlines() if line.strip()]
+    if not lines:
+        return normalize_bulk_frame(pd.DataFrame(columns=BULK_COLUMNS))
+
+    try:
+        dialect = csv.Sniffer().sniff(lines[0], delimiters=",;\t|")
+    except csv.Error:
+        dialect = csv.excel
+    rows = list(csv.reader(lines, dialect))
+    width = max(len(row) for row in rows)
+    rows = [row + [""] * (width - len(row)) for row in rows]
+
+    first_row = [value.strip().casefold() for value in rows[0]]
+    if first_row[0] in _COLUMN_ALIASES:
+        return normalize_bulk_frame(pd.DataFrame(rows[1:], columns=first_row))
+    return normalize_bulk_frame(pd.DataFrame(rows))
+
+
+def parse_bulk_file(file):
+    return normalize_bulk_frame(pd.read_csv(file, dtype=str, keep_default_na=False))
+
+
+def normalize_bulk_frame(frame):
+    frame = frame.copy()
+    if all(isinstance(column, int) for column in frame.columns):
+        frame.columns = BULK_COLUMNS[:len(frame.columns)] + [f"extra_{index}" for index in range(len(frame.columns) - 3)]
+    else:
+        frame.columns = [_COLUMN_ALIASES.get(str(column).strip().casefold(), str(column)) for column in frame.columns]
+
+    for column in BULK_COLUMNS:
+        if column not in frame.columns:
+            frame[column] = ""
+
+    frame = frame[BULK_COLUMNS].fillna("").astype(str).reset_index(drop=True)
+    for column in BULK_COLUMNS:
+        frame[column] = frame[column].str.strip()
+    # 1-based data row numbers, as the admin sees them in the source.
+    frame.insert(0, "row", range(1, len(frame) + 1))
+    return frame
+
+
+def _parse_bulk_timestamp(raw_timestamp):
+    # Naive local time, like the timestamps the app writes; aware values are converted to the
+    # local zone. NaT for an empty cell, None when the value cannot be read.
+    if raw_timestamp == "":
+        return pd.NaT
+    try:
+        timestamp = pd.Timestamp(raw_timestamp)
+        if pd.isna(timestamp):
+            return None
+        if timestamp.tzinfo is not None:
+            timestamp = pd.Timestamp(timestamp.to_pydatetime().astimezone().replace(tzinfo=None))
+        # History timestamps are nanosecond-based; years past 2262 do not fit.
+        return timestamp.as_unit("ns")
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def validate_bulk_rows(frame, now=None):
+    # Adds typed delta/timestamp columns and an "error" message per row ("" when the row is valid).
+    now = now if now is not None else pd.Timestamp.now()
+    frame = frame.copy()
+    deltas = pd.to_numeric(frame["delta"], errors="coerce")
+
+    errors = []
+    timestamps = []
+    for player, raw_delta, delta, raw_timestamp in zip(frame["player"], frame["delta"], deltas, frame["timestamp"]):
+        timestamp = _parse_bulk_timestamp(raw_timestamp)
+        timestamps.append(pd.NaT if timestamp is None else timestamp)
+        if player == "":
+            errors.append("missing player")
+        elif pd.isna(delta) or not math.isfinite(delta) or float(delta) != int(delta):
+            errors.append(f"invalid delta: {raw_delta!r}")
+        elif abs(int(delta)) > MAX_BULK_DELTA:
+            errors.append(f"delta out of range: {raw_delta!r}")
+        elif int(delta) == 0:
+            errors.append("delta cannot be 0")
+        elif timestamp is None:
+            errors.append(f"invalid timestamp: {raw_timestamp!r}")
+        elif pd.notna(timestamp) and timestamp > now:
+            errors.append("timestamp is in the future")
+        else:
+            errors.append("")
+
+    valid = pd.Series([error == "" for error in errors], index=frame.index, dtype=bool)
+    frame["delta_value"] = deltas.where(valid, 0).astype(np.int64)
+    frame["timestamp_value"] = pd.Series(timestamps, index=frame.index, dtype="datetime64[ns]")
+    frame["error"] = errors
+    return frame
+
+
+def apply_bulk_points(storage, frame, default_password=None, lang=DEFAULT_LANGUAGE, now=None):
+    # Validates every row first; if any row is invalid nothing is written. Otherwise all rows go
+    # through the writer as one commit (one scores write, one history append), oldest first, and
+    # missing player accounts are created in one pass. Returns (report, created_accounts).
+    checked = validate_bulk_rows(frame, now=now)
+    report = pd.DataFrame({
+        "row": checked["row"],
+        "player": checked["player"],
+        "delta": checked["delta"],
+        "timestamp": checked["timestamp"],
+        "status": "",
+        "applied_delta": 0,
+        "total_after": None,
+        "message": checked["error"],
+    })[BULK_REPORT_COLUMNS]
+
+    invalid = checked["error"] != ""
+    if checked.empty:
+        return report, []
+    if invalid.any():
+        report["status"] = invalid.map({True: "invalid", False: "skipped"})
+        report.loc[~invalid, "message"] = "not applied: other rows are invalid"
+        return report, []
+
+    now = now if now is not None else pd.Timestamp.now()
+    order = checked.assign(_sort_time=checked["timestamp_value"].fillna(now)).sort_values("_sort_time", kind="stable")
+    entries = [
+        (player, delta, timestamp if pd.notna(timestamp) else None)
+        for player, delta, timestamp in zip(order["player"], order["delta_value"], order["timestamp_value"])
+    ]
+    results = writer_for(storage).apply_bulk(entries, lang=lang)
+
+    for position, result in zip(order.index, results):
+        report.at[position, "status"] = result["status"]
+        report.at[position, "applied_delta"] = result["applied_delta"]
+        report.at[position, "total_after"] = result["total_after"]
+        report.at[position, "player"] = result["player"]
+        report.at[position, "message"] = {
+            "applied": result.get("trend_note", ""),
+            "unchanged": "player already has 0 points",
+            "rejected": "new players need a positive delta",
+        }.get(result["status"], "")
+
+    created_accounts = []
+    if default_password is not None:
+        created_players = [result["player"] for result in results if result.get("created")]
+        created_accounts = create_player_accounts_if_missing(storage, created_players, default_password)
+    return report, created_accounts
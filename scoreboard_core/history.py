@@ -0,0 +1,452 @@
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from .aggregates import daily_buckets_for, event_counts, player_history_for
+from .i18n import DEFAULT_LANGUAGE, translate
+from .storage import (
+    HISTORY_COLUMNS,
+    month_bounds,
+    parse_history_timestamps,
+    summarize_history_months,
+    to_history_timestamp,
+)
+
+
+def clean_history(history):
+    if history.empty:
+        return history
+
+    history = history.copy()
+    history["timestamp"] = parse_history_timestamps(history["timestamp"])
+    history["player"] = history["player"].astype(str).str.strip()
+    history["points_added"] = pd.to_numeric(history["points_added"], errors="coerce").fillna(0).astype(int)
+    history["total_after"] = pd.to_numeric(history["total_after"], errors="coerce").fillna(0).astype(int)
+    history["trend_note"] = history["trend_note"].fillna("").astype(str)
+    history = history.dropna(subset=["timestamp"])
+    scored = history["points_added"] != 0
+    if "events" in history.columns:
+        # Compacted daily rows; raw rows count as one event. A day whose events cancel out
+        # still counts as activity, as its raw events did.
+        history["events"] = pd.to_numeric(history["events"], errors="coerce").fillna(1).astype(int)
+        scored |= history["events"] > 1
+    history = history[(history["player"] != "") & scored]
+    return history
+
+
+NOTE_EVENTS_PER_PLAYER = 6
+
+
+def to_columnar_history(history):
+    # Compact copy of a cleaned history: player names interned as a categorical (integer codes
+    # into one array of names), timestamps as datetime64 (int64 underneath), points, totals and
+    # event counts as int32, and no trend notes, which are most of a long history's memory.
+    if history.empty:
+        return history.drop(columns=["trend_note"], errors="ignore")
+
+    columns = {
+        "timestamp": history["timestamp"].to_numpy(dtype="datetime64[ns]"),
+        "player": history["player"].astype("category").array,
+        "points_added": history["points_added"].to_numpy(dtype=np.int32),
+        "total_after": history["total_after"].to_numpy(dtype=np.int32),
+    }
+    if "events" in history.columns:
+        columns["events"] = history["events"].to_numpy(dtype=np.int32)
+    return pd.DataFrame(columns)
+
+
+class HistoryNotes:
+    # Trend notes kept apart from the columnar history, by row label, for each player's latest
+    # `per_player` events only: the trend feeds and the recent-updates list never show older ones.
+    def __init__(self, notes=None):
+        self._notes = notes or {}
+
+    @classmethod
+    def latest(cls, history, per_player=NOTE_EVENTS_PER_PLAYER):
+        # history is the cleaned frame the columnar one was built from, so positions are labels.
+        if history.empty:
+            return cls()
+        codes, _ = pd.factorize(history["player"])
+        timestamps = history["timestamp"].to_numpy(dtype="datetime64[ns]")
+        # Stored order breaks timestamp ties: the later row is the newer event.
+        order = np.lexsort((timestamps, codes))
+        group_end = np.cumsum(np.bincount(codes))
+        from_end = group_end[codes[order]] - np.arange(len(order)) - 1
+        kept = np.sort(order[from_end < per_player])
+        notes = history["trend_note"].to_numpy(dtype=object)[kept]
+        return cls({
+            position: note for position, note in zip(kept.tolist(), notes.tolist()) if note
+        })
+
+    def __len__(self):
+        return len(self._notes)
+
+    def attach(self, frame):
+        # frame is a slice of the columnar history; rows without a kept note get "".
+        return frame.assign(trend_note=[self._notes.get(label, "") for label in frame.index.tolist()])
+
+
+def _columnar_clean_history(storage):
+    # The columnar frame and its notes are cached next to the raw history, so viewers on
+    # unchanged data skip the read, the timestamp/to_numeric passes and the interning.
+    def build():
+        history = clean_history(storage.load_history())
+        return to_columnar_history(history), HistoryNotes.latest(history)
+
+    return storage.derive("clean_history", "history", build)
+
+
+def get_clean_history(storage):
+    history, _ = _columnar_clean_history(storage)
+    return history.copy()
+
+
+def get_history_notes(storage):
+    _, notes = _columnar_clean_history(storage)
+    return notes
+
+
+class HistorySnapshot:
+    # Loads the columnar history at most once per rerun and hands the same frame to every
+    # consumer, which must treat it as read-only. Trend notes come from notes().
+    def __init__(self, storage):
+        self.storage = storage
+        self._history = None
+        self._notes = None
+        self.version = None
+        self.loads = 0
+        self.requests = 0
+
+    def get(self):
+        self.requests += 1
+        if self._history is None:
+            # Stamp before loading, so a write that lands mid-load makes the stamp stale, not the data.
+            self.version = self.storage.data_version("history")
+            self._history = get_clean_history(self.storage)
+            self._notes = get_history_notes(self.storage)
+            self.loads += 1
+        return self._history
+
+    def notes(self):
+        self.get()
+        return self._notes
+
+    @property
+    def saved_loads(self):
+        return self.requests - self.loads
+
+    def window(self, start=None, end=None):
+        # Cleaned events with start <= timestamp < end. Backends that partition or index history
+        # by time read only the overlapping months; otherwise the full history is sliced.
+        if self.storage.backend.ranged_history and (start is not None or end is not None):
+            history = to_columnar_history(clean_history(self.storage.load_history(start=start, end=end)))
+        else:
+            history = self.get()
+        if history.empty:
+            return history
+        selected = np.ones(len(history), dtype=bool)
+        if start is not None:
+            selected &= (history["timestamp"] >= start).to_numpy()
+        if end is not None:
+            selected &= (history["timestamp"] < end).to_numpy()
+        return history if selected.all() else history[selected]
+
+    def months(self):
+        # Per-month summary (HISTORY_MONTH_COLUMNS) from the backend's manifest or index, or
+        # from the full history when it has neither.
+        months = self.storage.history_months()
+        if months is None:
+            months = summarize_history_months(self.get())
+        return months
+
+
+def current_player_history(storage, snapshot, player_name):
+    # One player's cleaned events. A stale index is rebuilt from the snapshot, except on
+    # backends with an indexed history table, which answer the player's rows directly.
+    index = player_history_for(storage)
+    if not index.is_current(storage.data_version("history")):
+        if storage.backend.indexed_history:
+            return clean_history(storage.load_history(player=str(player_name).strip()))
+        index.rebuild(snapshot.get(), snapshot.version)
+    return index.events(player_name)
+
+
+def load_player_history(storage, player_name):
+    # History rows behind a new event's trend note: the indexed events while the index is
+    # current, otherwise a player-filtered read from storage.
+    index = player_history_for(storage)
+    if index.is_current(storage.data_version("history")):
+        return index.events(player_name)
+    return storage.load_history(player=player_name)
+
+
+def load_trend_history(storage, player_name):
+    # Enough of the player's latest events for PlayerTrendStats: month segments are read newest
+    # first until they hold 6 of the player's events and cover the month and the 7 days before
+    # the latest one. Other backends use load_player_history.
+    index = player_history_for(storage)
+    backend = storage.backend
+    if index.is_current(storage.data_version("history")) or backend.indexed_history or not backend.ranged_history:
+        return load_player_history(storage, player_name)
+
+    player_name = str(player_name).strip()
+    parts = []
+    events = 0
+    needed_from = None
+    loaded_from = None
+    for month in reversed(storage.history_months()["month"].tolist()):
+        if needed_from is not None and events >= 6 and loaded_from <= needed_from:
+            break
+        start, end = month_bounds(month)
+        loaded_from = start
+        history = clean_history(storage.load_history(start=start, end=end))
+        if history.empty:
+            continue
+        history = history[
+            (history["player"] == player_name) & (history["timestamp"] >= start) & (history["timestamp"] < end)
+        ]
+        if history.empty:
+            continue
+        if needed_from is None:
+            latest = history["timestamp"].max()
+            needed_from = min(month_bounds(f"{latest:%Y-%m}")[0], latest - pd.Timedelta(days=7))
+        parts.append(history)
+        events += len(history)
+
+    if not parts:
+        return pd.DataFrame(columns=HISTORY_COLUMNS)
+    return pd.concat(parts[::-1], ignore_index=True)
+
+
+class PlayerTrendStats:
+    # Running inputs of a player's trend note: the events of the 7 days up to the latest one,
+    # the latest event's calendar-month sum, the last 6 gains and the latest total. add() is
+    # O(1) amortized for events that arrive in timestamp order.
+    def __init__(self):
+        self.events = 0
+        self.last_timestamp = None
+        self.last_gain = 0
+        self.total_after = 0
+        self.week_events = deque()
+        self.week_points = 0
+        self.month = None
+        self.month_points = 0
+        self.recent_gains = deque(maxlen=6)
+
+    @classmethod
+    def from_history(cls, player_history):
+        stats = cls()
+        timestamps = parse_history_timestamps(player_history["timestamp"])
+        valid = timestamps.notna().to_numpy()
+        if not valid.any():
+            return stats
+
+        order = np.argsort(timestamps[valid].to_numpy(), kind="stable")
+        timestamps = timestamps[valid].iloc[order]
+        points = pd.to_numeric(player_history["points_added"][valid], errors="coerce").fillna(0).astype(int).iloc[order]
+        totals = pd.to_numeric(player_history["total_after"][valid], errors="coerce").iloc[order]
+
+        last_timestamp = timestamps.iloc[-1]
+        in_week = (timestamps >= last_timestamp - pd.Timedelta(days=7)).to_numpy()
+        in_month = ((timestamps.dt.year == last_timestamp.year) & (timestamps.dt.month == last_timestamp.month)).to_numpy()
+
+        stats.events = int(event_counts(player_history)[valid].sum())
+        stats.last_timestamp = last_timestamp
+        stats.last_gain = int(points.iloc[-1])
+        stats.total_after = int(totals.iloc[-1]) if pd.notna(totals.iloc[-1]) else 0
+        stats.week_events = deque(zip(timestamps[in_week].tolist(), points[in_week].tolist()))
+        stats.week_points = int(points[in_week].sum())
+        stats.month = (last_timestamp.year, last_timestamp.month)
+        stats.month_points = int(points[in_month].sum())
+        stats.recent_gains = deque(points.iloc[-6:].tolist(), maxlen=6)
+        return stats
+
+    def copy(self):
+        stats = PlayerTrendStats()
+        stats.__dict__.update(self.__dict__)
+        stats.week_events = deque(self.week_events)
+        stats.recent_gains = deque(self.recent_gains, maxlen=6)
+        return stats
+
+    def accepts(self, timestamp):
+        # Only in-order events can be folded in; a backdated one needs the history.
+        return self.last_timestamp is None or pd.Timestamp(timestamp) >= self.last_timestamp
+
+    def add(self, timestamp, points_added, total_after):
+        timestamp = pd.Timestamp(timestamp)
+        points_added = int(points_added)
+        if (timestamp.year, timestamp.month) != self.month:
+            self.month = (timestamp.year, timestamp.month)
+            self.month_points = 0
+        self.month_points += points_added
+
+        self.week_events.append((timestamp, points_added))
+        self.week_points += points_added
+        week_start = timestamp - pd.Timedelta(days=7)
+        while self.week_events[0][0] < week_start:
+            self.week_points -= self.week_events.popleft()[1]
+
+        self.recent_gains.append(points_added)
+        self.events += 1
+        self.last_timestamp = timestamp
+        self.last_gain = points_added
+        self.total_after = int(total_after)
+
+    def trend_note(self, lang=DEFAULT_LANGUAGE):
+        if self.events == 0:
+            return translate("summary_no_history", lang)
+
+        gains = list(self.recent_gains)
+        trend_label = translate("trend_stable", lang)
+        if self.events >= 6:
+            previous_block = sum(gains[-6:-3])
+            recent_block = sum(gains[-3:])
+            if recent_block > previous_block:
+                trend_label = translate("trend_up", lang)
+            elif recent_block < previous_block:
+                trend_label = translate("trend_down", lang)
+        elif self.events >= 2:
+            if gains[-1] > gains[-2]:
+                trend_label = translate("trend_up", lang)
+            elif gains[-1] < gains[-2]:
+                trend_label = translate("trend_down", lang)
+
+        return translate(
+            "trend_note_text",
+            lang,
+            gain=f"{self.last_gain:+d}",
+            total=self.total_after,
+            week=self.week_points,
+            month=self.month_points,
+            trend=trend_label,
+        )
+
+
+class TrendStatsCache:
+    # Per-player PlayerTrendStats for one storage, built from the player's history on first use
+    # and then advanced by the write paths. Any history write they did not make (another
+    # process, a save_history) clears it. Entries are shared: copy() before changing one.
+    def __init__(self):
+        self.version = None
+        self._lock = threading.Lock()
+        self._players = {}
+
+    def get(self, storage, player_name):
+        version = storage.data_version("history")
+        with self._lock:
+            if self.version != version:
+                self._players = {}
+                self.version = version
+            stats = self._players.get(player_name)
+        if stats is None:
+            stats = PlayerTrendStats.from_history(load_trend_history(storage, player_name))
+            with self._lock:
+                if self.version == version:
+                    self._players[player_name] = stats
+        return stats
+
+    def replace(self, updated, expected_version, new_version):
+        # updated maps player -> stats after the write, or None to rebuild that player later.
+        with self._lock:
+            if self.version != expected_version:
+                return False
+            for player_name, stats in updated.items():
+                if stats is None:
+                    self._players.pop(player_name, None)
+                else:
+                    self._players[player_name] = stats
+            self.version = new_version
+            return True
+
+
+_TREND_STATS = {}
+_TREND_STATS_LOCK = threading.Lock()
+
+
+def trend_stats_for(storage):
+    with _TREND_STATS_LOCK:
+        cache = _TREND_STATS.get(id(storage))
+        if cache is None:
+            cache = TrendStatsCache()
+            _TREND_STATS[id(storage)] = cache
+    return cache
+
+
+def build_trend_note_from_history(history, player_name, lang=DEFAULT_LANGUAGE):
+    return PlayerTrendStats.from_history(history[history["player"] == player_name]).trend_note(lang)
+
+
+def append_player_event(player_history, player_name, timestamp, points_added, total_after):
+    # Returns the player's history with one more event, typed for build_trend_note_from_history.
+    event = pd.DataFrame(
+        [[timestamp, player_name, int(points_added), int(total_after), ""]],
+        columns=HISTORY_COLUMNS,
+    )
+    history = pd.concat([player_history, event], ignore_index=True)
+    history["timestamp"] = parse_history_timestamps(history["timestamp"])
+    history["points_added"] = pd.to_numeric(history["points_added"], errors="coerce").fillna(0).astype(int)
+    return history
+
+
+def log_points_update(storage, player_name, points_added, total_after, lang=DEFAULT_LANGUAGE, now=None):
+    # Appends one history event and returns its trend note. Raises StorageError if the write fails.
+    if points_added == 0:
+        return ""
+
+    now = (now if now is not None else pd.Timestamp.now()).floor("s")
+    trend_stats = trend_stats_for(storage)
+    stats = trend_stats.get(storage, player_name)
+    if stats.accepts(now):
+        # The note comes from the running stats; the history file is not read.
+        stats = stats.copy()
+        stats.add(now, points_added, total_after)
+        trend_note = stats.trend_note(lang)
+    else:
+        history = append_player_event(load_player_history(storage, player_name), player_name, now, points_added, total_after)
+        trend_note = build_trend_note_from_history(history, player_name, lang)
+        stats = None
+
+    row = [to_history_timestamp(now), player_name, int(points_added), int(total_after), trend_note]
+    version_before = storage.data_version("history")
+    storage.append_history(row)
+    version_after = storage.data_version("history")
+    daily_buckets_for(storage).add_event(player_name, now, points_added, version_before, version_after)
+    player_history_for(storage).add_events([row], version_before, version_after)
+    trend_stats.replace({player_name: stats}, version_before, version_after)
+    return trend_note
+
+
+def get_player_trend_feed(history, player_name, limit=6, notes=None):
+    # notes (a HistoryNotes) fills trend_note in when history is the columnar frame.
+    if history.empty:
+        return pd.DataFrame(columns=["timestamp", "trend_note", "points_added", "total_after"])
+
+    player_history = _newest_first(history[history["player"] == player_name])
+    if player_history.empty:
+        return pd.DataFrame(columns=["timestamp", "trend_note", "points_added", "total_after"])
+    return _with_notes(player_history.head(limit), notes)
+
+
+def get_latest_trend_by_player(history, limit=8, notes=None):
+    if history.empty:
+        return pd.DataFrame(columns=["timestamp", "player", "trend_note", "points_added", "total_after"])
+
+    latest = _newest_first(history).drop_duplicates(subset=["player"], keep="first")
+    return _with_notes(latest.head(limit), notes)
+
+
+def get_recent_trend_updates(history, limit=6, notes=None):
+    if history.empty:
+        return pd.DataFrame(columns=["timestamp", "player", "trend_note", "points_added", "total_after"])
+    return _with_notes(_newest_first(history).head(limit), notes)
+
+
+def _newest_first(history):
+    # Timestamp ties go to the later stored row, the same order HistoryNotes keeps notes by.
+    return history.iloc[::-1].sort_values("timestamp", ascending=False, kind="mergesort")
+
+
+def _with_notes(frame, notes):
+    return notes.attach(frame) if notes is not None else frame
@@ -0,0 +1,275 @@
+DEFAULT_LANGUAGE = "es"
+
+TRANSLATIONS = {
+    "es": {
+        "language": "Idioma",
+        "language_es": "Espanol",
+        "language_en": "English",
+        "dynamic_scoreboard": "Dynamic Scoreboard",
+        "login_title": "Iniciar sesion",
+        "username": "Username",
+        "password": "Password",
+        "login_button": "Login",
+        "login_success": "Login successful!",
+        "invalid_credentials": "Credenciales invalidas",
+        "sidebar_user": "Usuario",
+        "sidebar_role": "Rol",
+        "logout": "Logout",
+        "navigation": "Navegacion",
+        "menu_admin_panel": "Admin Panel",
+        "menu_scoreboard_general": "Scoreboard General",
+        "menu_winners": "Winners",
+        "menu_period_winners": "Period Winners",
+        "menu_my_score": "My Score",
+        "hero_dynamic_title": "Dynamic Scoreboard",
+        "hero_dynamic_subtitle": "Accede para ver el ranking y el rendimiento del torneo.",
+        "hero_admin_title": "Admin Control Center",
+        "hero_admin_subtitle": "Gestiona jugadores, puntajes y cuentas en un solo lugar.",
+        "hero_scoreboard_general_title": "Scoreboard General",
+        "hero_scoreboard_general_subtitle": "Visualiza posiciones, tendencia y zonas calientes/frias.",
+        "hero_winners_title": "Winners",
+        "hero_winners_subtitle": "Los tres primeros del torneo.",
+        "hero_period_winners_title": "Weekly and Monthly Winners",
+        "hero_period_winners_subtitle": "Ganadores automaticos por semana y por mes basados en el historial de puntos.",
+        "hero_my_score_title": "My Score",
+        "hero_my_score_subtitle": "Revisa tus puntos y tu posicion actual en el torneo.",
+        "hero_scoreboard_title": "Scoreboard",
+        "hero_scoreboard_subtitle": "Compite, sube posiciones y mantente en la zona caliente.",
+        "players_registered": "Players registrados",
+        "total_points": "Puntos totales",
+        "average_per_player": "Promedio por player",
+        "current_leader": "Lider actual",
+        "save_failed_title": "No se pudo guardar `{file_path}` porque esta en uso o bloqueado.",
+        "save_failed_hint": "Cierra el archivo si esta abierto (por ejemplo, en Excel) e intenta de nuevo.",
+        "technical_detail": "Detalle tecnico: {error}",
+        "bg_expander": "Imagen de fondo para Scoreboard General",
+        "bg_upload": "Sube una imagen PNG",
+        "bg_saved": "Imagen de fondo guardada.",
+        "bg_current_file": "Archivo actual: {file}",
+        "no_players_scoreboard": "No hay players en el scoreboard todavia.",
+        "leaderboard_tab": "Leaderboard",
+        "last_7_days_tab": "Last 7 Days",
+        "last_15_days_tab": "Last 15 Days",
+        "last_30_days_tab": "Last 30 Days",
+        "caption_total_tournament": "Total acumulado del torneo.",
+        "caption_last_days": "Puntos ganados en los ultimos {days} dias.",
+        "pdf_no_data": "No hay datos para exportar.",
+        "pdf_missing_matplotlib": "No se pudo generar el PDF porque matplotlib no esta disponible.",
+        "pdf_table_title": "Scoreboard Ranking Table",
+        "pdf_generated_footer": "Generado: {datetime} | Players: {players} | Pagina {page}/{pages}",
+        "download_pdf_table": "Download PDF table",
+        "no_winners_yet": "Aun no hay ganadores porque no hay puntajes cargados.",
+        "place_label": "Puesto {position}",
+        "no_player": "Sin player",
+        "points_short": "pts",
+        "no_points_history": "Aun no hay historial de puntos. Agrega puntos para generar ganadores semanales y mensuales.",
+        "select_month": "Select month",
+        "week_highlight": "Week Highlight",
+        "month_highlight": "Month Highlight",
+        "tab_weekly_winners": "Weekly Winners",
+        "tab_monthly_winners": "Monthly Winners",
+        "weekly_winners_of_month": "Weekly winners of selected month",
+        "monthly_winners_history": "Monthly winners history",
+        "no_weekly_winner_for_month": "No weekly winner yet for this month.",
+        "no_monthly_winner_for_month": "No monthly winner yet for this month.",
+        "no_weekly_winners_month": "No weekly winners for this month.",
+        "no_monthly_winners_history": "No monthly winners in history.",
+        "weekly_period_label": "{week} Week {month} Winner",
+        "monthly_period_label": "{month} Winner",
+        "default_player_password": "Password por defecto para nuevas cuentas player",
+        "tab_points_trends": "Points & Trends",
+        "tab_reset_table": "Reset Table",
+        "section_fast_points_update": "Fast Points Update",
+        "target": "Target",
+        "existing_player": "Existing player",
+        "new_player": "New player",
+        "select_player": "Select player",
+        "no_existing_players": "No hay players existentes. Crea uno nuevo.",
+        "new_player_name": "New player name",
+        "quick_points": "Quick points",
+        "custom_points_optional": "Custom points (optional)",
+        "apply_points_button": "Apply +{points} points",
+        "enter_player_name": "Enter a player name.",
+        "section_automation": "Automatizaciones",
+        "automation_caption": "Only creates accounts for players without an existing account.",
+        "assign_accounts_new_only": "Assign Accounts to New Players Only",
+        "new_accounts_created": "New player accounts created: {accounts}",
+        "no_new_players_accounts": "No new players found. All current players already have an account.",
+        "section_trend_updates": "Trend Updates",
+        "tab_latest_by_player": "Latest by player",
+        "tab_recent_updates": "Recent updates",
+        "no_trends_by_player": "Aun no hay tendencias por jugador.",
+        "no_recent_updates": "Aun no hay actualizaciones recientes.",
+        "no_trend_note": "Sin nota de tendencia.",
+        "section_ranking_preview": "Vista previa del ranking",
+        "section_reset_points_table": "Reset Points Table",
+        "reset_warning": "Esta accion reinicia todos los puntos a 0. Los players se mantienen en la tabla.",
+        "reset_button": "Reset table points",
+        "reset_confirm_required": "Confirmacion requerida: Quieres resetear la tabla de puntos?",
+        "reset_confirm_button": "Yes, reset now",
+        "cancel": "Cancel",
+        "reset_cancelled": "Reset cancelado.",
+        "reset_success": "Scoreboard reset: todos los puntos en 0.",
+        "your_points": "Your Points",
+        "average_points_week": "Average Points / Week",
+        "weekly_target_position": "Weekly Target Position",
+        "weekly_forecast_points": "Weekly Forecast (pts)",
+        "zone": "Zone",
+        "sessions_week_est": "Sessions / Week (est.)",
+        "goal_per_session_points": "Goal per Session (pts)",
+        "points_to_next_position": "Points to Next Position",
+        "zone_hot": "HOT 🔥",
+        "zone_cold": "COLD ❄️",
+        "zone_run": "RUN 🏃",
+        "weekly_goal_move_up": "Objetivo semanal: subir de #{current} a #{target}. {summary}",
+        "weekly_goal_hold": "Objetivo semanal: consolidar la posicion #{current} y presionar el siguiente lugar. {summary}",
+        "no_score_assigned": "No score assigned yet.",
+        "summary_no_history": "Sin historial de sesiones. Necesitas registrar puntos para generar pronostico.",
+        "summary_forecast": "Pronostico semanal: {forecast} pts. Objetivo por sesion: {session_goal} pts.",
+        "trend_stable": "estable",
+        "trend_up": "al alza",
+        "trend_down": "a la baja",
+        "trend_note_text": "{gain} pts. Total: {total}. Semana: {week} pts. Mes: {month} pts. Tendencia: {trend}.",
+        "history_snapshot_stats": "Historial: {loads} carga(s) en este rerun, {saved} lectura(s) ahorrada(s).",
+    },
+    "en": {
+        "language": "Language",
+        "language_es": "Spanish",
+        "language_en": "English",
+        "dynamic_scoreboard": "Dynamic Scoreboard",
+        "login_title": "Sign in",
+        "username": "Username",
+        "password": "Password",
+        "login_button": "Login",
+        "login_success": "Login successful!",
+        "invalid_credentials": "Invalid credentials",
+        "sidebar_user": "User",
+        "sidebar_role": "Role",
+        "logout": "Logout",
+        "navigation": "Navigation",
+        "menu_admin_panel": "Admin Panel",
+        "menu_scoreboard_general": "Scoreboard General",
+        "menu_winners": "Winners",
+        "menu_period_winners": "Period Winners",
+        "menu_my_score": "My Score",
+        "hero_dynamic_title": "Dynamic Scoreboard",
+        "hero_dynamic_subtitle": "Sign in to track ranking and tournament performance.",
+        "hero_admin_title": "Admin Control Center",
+        "hero_admin_subtitle": "Manage players, points, and accounts in one place.",
+        "hero_scoreboard_general_title": "Scoreboard General",
+        "hero_scoreboard_general_subtitle": "View standings, trends, and hot/cold zones.",
+        "hero_winners_title": "Winners",
+        "hero_winners_subtitle": "Top three players in the tournament.",
+        "hero_period_winners_title": "Weekly and Monthly Winners",
+        "hero_period_winners_subtitle": "Automatic weekly and monthly winners based on points history.",
+        "hero_my_score_title": "My Score",
+        "hero_my_score_subtitle": "Check your points and your current tournament position.",
+        "hero_scoreboard_title": "Scoreboard",
+        "hero_scoreboard_subtitle": "Compete, climb positions, and stay in the hot zone.",
+        "players_registered": "Registered players",
+        "total_points": "Total points",
+        "average_per_player": "Average per player",
+        "current_leader": "Current leader",
+        "save_failed_title": "Could not save `{file_path}` because it is in use or locked.",
+        "save_failed_hint": "Close the file if it is open (for example, in Excel) and try again.",
+        "technical_detail": "Technical detail: {error}",
+        "bg_expander": "Background image for Scoreboard General",
+        "bg_upload": "Upload a PNG image",
+        "bg_saved": "Background image saved.",
+        "bg_current_file": "Current file: {file}",
+        "no_players_scoreboard": "No players in the scoreboard yet.",
+        "leaderboard_tab": "Leaderboard",
+        "last_7_days_tab": "Last 7 Days",
+        "last_15_days_tab": "Last 15 Days",
+        "last_30_days_tab": "Last 30 Days",
+        "caption_total_tournament": "Total accumulated tournament points.",
+        "caption_last_days": "Points earned in the last {days} days.",
+        "pdf_no_data": "No data available to export.",
+        "pdf_missing_matplotlib": "Could not generate PDF because matplotlib is not available.",
+        "pdf_table_title": "Scoreboard Ranking Table",
+        "pdf_generated_footer": "Generated: {datetime} | Players: {players} | Page {page}/{pages}",
+        "download_pdf_table": "Download PDF table",
+        "no_winners_yet": "There are no winners yet because no scores were recorded.",
+        "place_label": "Place {position}",
+        "no_player": "No player",
+        "points_short": "pts",
+        "no_points_history": "No points history yet. Add points to generate weekly and monthly winners.",
+        "select_month": "Select month",
+        "week_highlight": "Week Highlight",
+        "month_highlight": "Month Highlight",
+        "tab_weekly_winners": "Weekly Winners",
+        "tab_monthly_winners": "Monthly Winners",
+        "weekly_winners_of_month": "Weekly winners of selected month",
+        "monthly_winners_history": "Monthly winners history",
+        "no_weekly_winner_for_month": "No weekly winner yet for this month.",
+        "no_monthly_winner_for_month": "No monthly winner yet for this month.",
+        "no_weekly_winners_month": "No weekly winners for this month.",
+        "no_monthly_winners_history": "No monthly winners in history.",
+        "weekly_period_label": "Week {week} {month} Winner",
+        "monthly_period_label": "{month} Winner",
+        "default_player_password": "Default password for new player accounts",
+        "tab_points_trends": "Points & Trends",
+        "tab_reset_table": "Reset Table",
+        "section_fast_points_update": "Fast Points Update",
+        "target": "Target",
+        "existing_player": "Existing player",
+        "new_player": "New player",
+        "select_player": "Select player",
+        "no_existing_players": "No existing players found. Create a new one.",
+        "new_player_name": "New player name",
+        "quick_points": "Quick points",
+        "custom_points_optional": "Custom points (optional)",
+        "apply_points_button": "Apply +{points} points",
+        "enter_player_name": "Enter a player name.",
+        "section_automation": "Automation",
+        "automation_caption": "Only creates accounts for players without an existing account.",
+        "assign_accounts_new_only": "Assign Accounts to New Players Only",
+        "new_accounts_created": "New player accounts created: {accounts}",
+        "no_new_players_accounts": "No new players found. All current players already have an account.",
+        "section_trend_updates": "Trend Updates",
+        "tab_latest_by_player": "Latest by player",
+        "tab_recent_updates": "Recent updates",
+        "no_trends_by_player": "No trends by player yet.",
+        "no_recent_updates": "No recent updates yet.",
+        "no_trend_note": "No trend note.",
+        "section_ranking_preview": "Ranking preview",
+        "section_reset_points_table": "Reset Points Table",
+        "reset_warning": "This action resets all points to 0. Players remain in the table.",
+        "reset_button": "Reset table points",
+        "reset_confirm_required": "Confirmation required: do you really want to reset the points table?",
+        "reset_confirm_button": "Yes, reset now",
+        "cancel": "Cancel",
+        "reset_cancelled": "Reset canceled.",
+        "reset_success": "Scoreboard reset: all points set to 0.",
+        "your_points": "Your Points",
+        "average_points_week": "Average Points / Week",
+        "weekly_target_position": "Weekly Target Position",
+        "weekly_forecast_points": "Weekly Forecast (pts)",
+        "zone": "Zone",
+        "sessions_week_est": "Sessions / Week (est.)",
+        "goal_per_session_points": "Goal per Session (pts)",
+        "points_to_next_position": "Points to Next Position",
+        "zone_hot": "HOT 🔥",
+        "zone_cold": "COLD ❄️",
+        "zone_run": "RUN 🏃",
+        "weekly_goal_move_up": "Weekly target: move up from #{current} to #{target}. {summary}",
+        "weekly_goal_hold": "Weekly target: hold position #{current} and push for the next place. {summary}",
+        "no_score_assigned": "No score assigned yet.",
+        "summary_no_history": "No session history yet. You need points updates to generate a forecast.",
+        "summary_forecast": "Weekly forecast: {forecast} pts. Session goal: {session_goal} pts.",
+        "trend_stable": "stable",
+        "trend_up": "upward",
+        "trend_down": "downward",
+        "trend_note_text": "{gain} pts. Total: {total}. Week: {week} pts. Month: {month} pts. Trend: {trend}.",
+        "history_snapshot_stats": "History: {loads} load(s) this rerun, {saved} read(s) saved.",
+    },
+}
+
+
+def translate(key, lang=DEFAULT_LANGUAGE, **kwargs):
+    data = TRANSLATIONS.get(lang, TRANSLATIONS[DEFAULT_LANGUAGE])
+    template = data.get(key, TRANSLATIONS[DEFAULT_LANGUAGE].get(key, key))
+    try:
+        return template.format(**kwargs)
+    except Exception:
+        return template
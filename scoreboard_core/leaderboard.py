@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+LEADERBOARD_COLUMNS = ["Position", "Player", "Points", "Zone", "Status", "PointsLabel"]
+PAGE_SIZES = [25, 50, 100, 250]
+TOP_ZONE_SIZE = 3
+BOTTOM_ZONE_SIZE = 5
+
+_ZONE_ICONS = {"top": "🔥", "bottom": "❄️", "middle": "🏃"}
+_ZONE_STYLES = {
+    "top": "background-color: rgba(244, 63, 94, 0.11);",
+    "bottom": "background-color: rgba(56, 189, 248, 0.11);",
+    "middle": "",
+}
+
+
+def build_leaderboard(ranking):
+    # Position, zone and status for every row in one vectorized pass (same zones as
+    # get_status_icon: top 3 first, then the last 5).
+    total_players = len(ranking)
+    positions = np.arange(1, total_players + 1)
+    zones = np.where(
+        positions <= TOP_ZONE_SIZE,
+        "top",
+        np.where(positions > total_players - BOTTOM_ZONE_SIZE, "bottom", "middle"),
+    )
+    board = pd.DataFrame({
+        "Position": positions,
+        "Player": ranking["Player"].astype(str).to_numpy(),
+        "Points": pd.to_numeric(ranking["Points"], errors="coerce").fillna(0).astype(int).to_numpy(),
+        "Zone": zones,
+    })
+    board["Status"] = board["Zone"].map(_ZONE_ICONS)
+    board["PointsLabel"] = board["Points"].astype(str) + " " + board["Status"]
+    return board[LEADERBOARD_COLUMNS]
+
+
+def filter_leaderboard(board, search=None):
+    # Case-insensitive substring match on the player name; positions stay the overall ones.
+    search = str(search or "").strip()
+    if not search:
+        return board
+    return board[board["Player"].str.contains(search, case=False, regex=False)]
+
+
+def leaderboard_page_count(rows, page_size):
+    return max(1, (rows - 1) // page_size + 1)
+
+
+def leaderboard_window(board, page, page_size):
+    # Returns (rows of the page, clamped page number, page count).
+    total_pages = leaderboard_page_count(len(board), page_size)
+    page = min(max(1, int(page)), total_pages)
+    start = (page - 1) * page_size
+    return board.iloc[start:start + page_size], page, total_pages
+
+
+def leaderboard_page_of(board, player_name, page_size):
+    # Page of the (unfiltered) board that holds the player, or None if they are not on it.
+    matches = np.flatnonzero(board["Player"].to_numpy() == str(player_name).strip())
+    if len(matches) == 0:
+        return None
+    return int(matches[0]) // page_size + 1
+
+
+def style_leaderboard_window(window, highlight_player=None):
+    # Styles only the rows being shown: zone backgrounds, top-3 points in red and the viewer's
+    # own row in bold.
+    view = window.set_index("Position")[["Player", "PointsLabel"]].rename(columns={"PointsLabel": "Points"})
+    zones = window["Zone"].to_numpy()
+    row_styles = pd.Series(zones).map(_ZONE_STYLES).to_numpy()
+    if highlight_player is not None:
+        own_row = window["Player"].to_numpy() == str(highlight_player).strip()
+        row_styles = np.where(own_row, np.char.add(row_styles.astype(str), " font-weight: 700;"), row_styles)
+
+    points_styles = np.where(zones == "top", "color: #be123c; font-weight: 700;", "")
+    styles = pd.DataFrame(
+        {
+            "Player": row_styles,
+            "Points": np.char.add(row_styles.astype(str), points_styles.astype(str)),
+        },
+        index=view.index,
+    )
+    return view.style.apply(lambda _: styles, axis=None)
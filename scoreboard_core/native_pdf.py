@@ -0,0 +1,343 @@
+import io
+import os
+import re
+import zlib
+
+import pandas as pd
+
+from .ranking import ranking_table
+
+# A4 landscape in points, matching the matplotlib export (11.69 x 8.27 in).
+PAGE_WIDTH = 842
+PAGE_HEIGHT = 595
+ROWS_PER_PAGE = 28
+
+HEADER_FILL = "#1e3a8a"
+TOP_FILL = "#fecaca"
+BOTTOM_FILL = "#bfdbfe"
+EVEN_FILL = "#f8fafc"
+ODD_FILL = "#ffffff"
+FOOTER_COLOR = "#475569"
+
+_TABLE_LEFT = 84
+_TABLE_WIDTH = 674
+_COLUMN_WIDTHS = [110, 404, 160]
+_TABLE_TOP = 520
+_ROW_HEIGHT = 16
+_FONT_SIZE = 10
+_CELL_PADDING = 5
+_TITLE = "Scoreboard Ranking Table"
+_TITLE_WIDTH = 215.4
+
+
+def _rgb(hex_color):
+    hex_color = hex_color.lstrip("#")
+    return " ".join(f"{int(hex_color[index:index + 2], 16) / 255:.3f}" for index in (0, 2, 4))
+
+
+def _pdf_text(value):
+    # Literal string in WinAnsiEncoding; characters outside it print as "?".
+    data = str(value).encode("cp1252", errors="replace")
+    return "(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)").decode("latin-1") + ")"
+
+
+def _load_logo(logo_file):
+    # Returns (width, height, rgb bytes, alpha bytes or None), or None without Pillow or a usable file.
+    if not logo_file or not os.path.exists(logo_file):
+        return None
+    try:
+        from PIL import Image
+    except Exception:
+        return None
+
+    try:
+        with Image.open(logo_file) as image:
+            image = image.convert("RGBA")
+            width, height = image.size
+            rgb = image.convert("RGB").tobytes()
+            alpha = image.getchannel("A")
+            alpha_bytes = None if alpha.getextrema() == (255, 255) else alpha.tobytes()
+    except Exception:
+        return None
+    return width, height, rgb, alpha_bytes
+
+
+class _PdfWriter:
+    # Writes numbered objects straight to the output and remembers their offsets for the xref.
+    def __init__(self, output):
+        self.output = output
+        self.position = 0
+        self.offsets = {}
+        self.next_number = 1
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write(self, data):
+        self.output.write(data)
+        self.position += len(data)
+
+    def reserve(self):
+        number = self.next_number
+        self.next_number += 1
+        return number
+
+    def add_object(self, number, body):
+        self.offsets[number] = self.position
+        self._write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+
+    def add_raw_object(self, number, body, stream=None):
+        # body is the object's bytes between "obj" and "stream"/"endobj", copied as is.
+        self.offsets[number] = self.position
+        self._write(f"{number} 0 obj\n".encode("latin-1") + body.strip() + b"\n")
+        if stream is not None:
+            self._write(b"stream\n")
+            self._write(stream)
+            self._write(b"\nendstream\n")
+        self._write(b"endobj\n")
+
+    def add_stream(self, number, dictionary, data, compress=True):
+        if compress:
+            data = zlib.compress(data, 6)
+            dictionary = f"{dictionary} /Filter /FlateDecode"
+        self.offsets[number] = self.position
+        self._write(f"{number} 0 obj\n<< {dictionary} /Length {len(data)} >>\nstream\n".encode("latin-1"))
+        self._write(data)
+        self._write(b"\nendstream\nendobj\n")
+
+    def finish(self, root_number):
+        xref_position = self.position
+        count = self.next_number
+        lines = [f"xref\n0 {count}\n", "0000000000 65535 f \n"]
+        for number in range(1, count):
+            if number in self.offsets:
+                lines.append(f"{self.offsets[number]:010d} 00000 n \n")
+            else:
+                lines.append("0000000000 65535 f \n")
+        lines.append(f"trailer\n<< /Size {count} /Root {root_number} 0 R >>\nstartxref\n{xref_position}\n%%EOF\n")
+        self._write("".join(lines).encode("latin-1"))
+
+
+def _page_content(page_df, total_players, page_number, total_pages, stamp, logo_ops=None):
+    ops = []
+    column_x = [_TABLE_LEFT]
+    for width in _COLUMN_WIDTHS[:-1]:
+        column_x.append(column_x[-1] + width)
+
+    # Title, centred using its Helvetica-Bold 17pt width.
+    ops.append(f"BT /F2 17 Tf 0 0 0 rg {(PAGE_WIDTH - _TITLE_WIDTH) / 2:.1f} {PAGE_HEIGHT - 52} Td {_pdf_text(_TITLE)} Tj ET")
+
+    rows = [("Position", "Player", "Points", HEADER_FILL, True)]
+    for row_number, (position, player, points) in enumerate(page_df.itertuples(index=False, name=None), start=1):
+        if position <= 3:
+            fill = TOP_FILL
+        elif position > total_players - 5:
+            fill = BOTTOM_FILL
+        else:
+            fill = EVEN_FILL if row_number % 2 == 0 else ODD_FILL
+        rows.append((position, player, points, fill, False))
+
+    table_height = _ROW_HEIGHT * len(rows)
+    for row_index, (position, player, points, fill, is_header) in enumerate(rows):
+        y = _TABLE_TOP - (row_index + 1) * _ROW_HEIGHT
+        ops.append(f"{_rgb(fill)} rg {_TABLE_LEFT} {y} {_TABLE_WIDTH} {_ROW_HEIGHT} re f")
+        font = "/F2" if is_header else "/F1"
+        color = "1 1 1" if is_header else "0 0 0"
+        text_y = y + (_ROW_HEIGHT - _FONT_SIZE) / 2 + 2
+        for column_index, value in enumerate((position, player, points)):
+            x = column_x[column_index]
+            # Long names are clipped to their cell instead of overflowing into the next one.
+            ops.append(
+                f"q {x} {y} {_COLUMN_WIDTHS[column_index]} {_ROW_HEIGHT} re W n "
+                f"BT {font} {_FONT_SIZE} Tf {color} rg {x + _CELL_PADDING} {text_y:.1f} Td {_pdf_text(value)} Tj ET Q"
+            )
+
+    # Cell borders
+    bottom = _TABLE_TOP - table_height
+    ops.append("0 0 0 RG 0.6 w")
+    for row_index in range(len(rows) + 1):
+        y = _TABLE_TOP - row_index * _ROW_HEIGHT
+        ops.append(f"{_TABLE_LEFT} {y} m {_TABLE_LEFT + _TABLE_WIDTH} {y} l")
+    for x in column_x + [_TABLE_LEFT + _TABLE_WIDTH]:
+        ops.append(f"{x} {_TABLE_TOP} m {x} {bottom} l")
+    ops.append("S")
+
+    footer = f"{stamp} | Players: {total_players} | Page {page_number}/{total_pages}"
+    ops.append(f"BT /F1 9 Tf {_rgb(FOOTER_COLOR)} rg 17 12 Td {_pdf_text(footer)} Tj ET")
+
+    if logo_ops:
+        ops.append(logo_ops)
+    return "\n".join(ops).encode("latin-1")
+
+
+def write_scoreboard_pdf(df, output, logo_file=None, rows_per_page=ROWS_PER_PAGE, now=None, stamp=None):
+    # Streams the ranking table to a binary file-like object one page at a time and returns the
+    # page count (0 when there is nothing to export). Fonts and the logo are written once and
+    # shared by every page.
+    ranking = ranking_table(df)
+    if ranking.empty:
+        return 0
+
+    total_players = len(ranking)
+    table_df = pd.DataFrame({
+        "Position": range(1, total_players + 1),
+        "Player": ranking["Player"].astype(str).to_numpy(),
+        "Points": ranking["Points"].astype(int).to_numpy(),
+    })
+    total_pages = ((total_players - 1) // rows_per_page) + 1
+    # The footer starts with `stamp`, by default the render time.
+    stamp = stamp or f"Generated: {now if now is not None else pd.Timestamp.now():%Y-%m-%d %H:%M}"
+
+    writer = _PdfWriter(output)
+    catalog_number = writer.reserve()
+    pages_number = writer.reserve()
+    regular_font = writer.reserve()
+    bold_font = writer.reserve()
+    writer.add_object(regular_font, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    writer.add_object(bold_font, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+
+    xobjects = ""
+    logo_ops = None
+    logo = _load_logo(logo_file)
+    if logo is not None:
+        width, height, rgb, alpha = logo
+        logo_number = writer.reserve()
+        smask = ""
+        if alpha is not None:
+            mask_number = writer.reserve()
+            writer.add_stream(
+                mask_number,
+                f"/Type /XObject /Subtype /Image /Width {width} /Height {height} /ColorSpace /DeviceGray /BitsPerComponent 8",
+                alpha,
+            )
+            smask = f" /SMask {mask_number} 0 R"
+        writer.add_stream(
+            logo_number,
+            f"/Type /XObject /Subtype /Image /Width {width} /Height {height} /ColorSpace /DeviceRGB /BitsPerComponent 8{smask}",
+            rgb,
+        )
+        xobjects = f" /XObject << /Logo {logo_number} 0 R >>"
+        # Same box as the matplotlib logo axes, keeping the aspect ratio.
+        box_width, box_height = 0.09 * PAGE_WIDTH, 0.12 * PAGE_HEIGHT
+        scale = min(box_width / width, box_height / height)
+        draw_width, draw_height = width * scale, height * scale
+        x = 0.885 * PAGE_WIDTH + (box_width - draw_width) / 2
+        y = 0.82 * PAGE_HEIGHT + (box_height - draw_height) / 2
+        logo_ops = f"q {draw_width:.2f} 0 0 {draw_height:.2f} {x:.2f} {y:.2f} cm /Logo Do Q"
+
+    resources = f"<< /Font << /F1 {regular_font} 0 R /F2 {bold_font} 0 R >>{xobjects} >>"
+    page_numbers = []
+    for page_index, start in enumerate(range(0, total_players, rows_per_page)):
+        page_df = table_df.iloc[start:start + rows_per_page]
+        content = _page_content(page_df, total_players, page_index + 1, total_pages, stamp, logo_ops)
+        content_number = writer.reserve()
+        page_number = writer.reserve()
+        writer.add_stream(content_number, "", content)
+        writer.add_object(
+            page_number,
+            f"<< /Type /Page /Parent {pages_number} 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources {resources} /Contents {content_number} 0 R >>",
+        )
+        page_numbers.append(page_number)
+
+    kids = " ".join(f"{number} 0 R" for number in page_numbers)
+    writer.add_object(pages_number, f"<< /Type /Pages /Kids [{kids}] /Count {len(page_numbers)} >>")
+    writer.add_object(catalog_number, f"<< /Type /Catalog /Pages {pages_number} 0 R >>")
+    writer.finish(catalog_number)
+    return len(page_numbers)
+
+
+def build_native_scoreboard_pdf(df, logo_file=None, stamp=None):
+    # Same contract as build_scoreboard_pdf: (pdf_bytes, error).
+    buffer = io.BytesIO()
+    if write_scoreboard_pdf(df, buffer, logo_file, stamp=stamp) == 0:
+        return None, "No hay datos para exportar."
+    return buffer.getvalue(), None
+
+
+# -----------------------------
+# MERGING
+# -----------------------------
+_REFERENCE_RE = re.compile(rb"(\d+) 0 R")
+
+
+def _read_pdf_objects(document):
+    # Minimal reader for single-xref PDFs like the ones matplotlib writes: returns
+    # ({number: (body, stream or None)}, root number).
+    xref_position = int(re.search(rb"startxref\s+(\d+)", document[document.rfind(b"startxref"):]).group(1))
+    trailer_position = document.index(b"trailer", xref_position)
+    offsets = {}
+    lines = document[xref_position:trailer_position].split(b"\n")[1:]
+    index = 0
+    while index < len(lines):
+        header = lines[index].split()
+        index += 1
+        if len(header) != 2:
+            continue
+        first, count = int(header[0]), int(header[1])
+        for number in range(first, first + count):
+            entry = lines[index].split()
+            index += 1
+            if entry[2] == b"n":
+                offsets[number] = int(entry[0])
+
+    def object_span(number):
+        body_start = document.index(b"obj", offsets[number]) + 3
+        end = document.index(b"endobj", body_start)
+        stream_match = re.compile(rb"stream\r?\n").search(document, body_start, end)
+        return body_start, end, stream_match
+
+    def plain_value(number):
+        body_start, end, _ = object_span(number)
+        return document[body_start:end].strip()
+
+    objects = {}
+    for number in offsets:
+        body_start, end, stream_match = object_span(number)
+        if stream_match is None:
+            objects[number] = (document[body_start:end], None)
+            continue
+        body = document[body_start:stream_match.start()]
+        length_match = re.search(rb"/Length (\d+)( 0 R)?", body)
+        length = int(length_match.group(1))
+        if length_match.group(2):
+            length = int(plain_value(length))
+        objects[number] = (body, document[stream_match.end():stream_match.end() + length])
+
+    root = int(re.search(rb"/Root (\d+) 0 R", document[trailer_position:]).group(1))
+    return objects, root
+
+
+def merge_pdf_documents(documents, output):
+    # Concatenates the pages of several PDFs, in order, into one document written to output.
+    # Every object is renumbered; the old catalogs and page trees are replaced by one of each.
+    writer = _PdfWriter(output)
+    catalog_number = writer.reserve()
+    pages_number = writer.reserve()
+    kids = []
+
+    for document in documents:
+        objects, root = _read_pdf_objects(document)
+        old_pages = int(re.search(rb"/Pages (\d+) 0 R", objects[root][0]).group(1))
+        page_refs = [int(number) for number in _REFERENCE_RE.findall(
+            re.search(rb"/Kids\s*\[(.*?)\]", objects[old_pages][0], re.S).group(1)
+        )]
+
+        page_set = set(page_refs)
+        numbers = {old_number: writer.reserve() for old_number in sorted(objects)}
+
+        def renumber(body):
+            return _REFERENCE_RE.sub(lambda match: b"%d 0 R" % numbers[int(match.group(1))], body)
+
+        for old_number in sorted(objects):
+            if old_number in (root, old_pages):
+                continue
+            body, stream = objects[old_number]
+            body = renumber(body)
+            if old_number in page_set:
+                body = re.sub(rb"/Parent \d+ 0 R", b"/Parent %d 0 R" % pages_number, body)
+            writer.add_raw_object(numbers[old_number], body, stream)
+        kids.extend(numbers[number] for number in page_refs)
+
+    writer.add_object(pages_number, f"<< /Type /Pages /Kids [{' '.join(f'{number} 0 R' for number in kids)}] /Count {len(kids)} >>")
+    writer.add_object(catalog_number, f"<< /Type /Catalog /Pages {pages_number} 0 R >>")
+    writer.finish(catalog_number)
+    return len(kids)
@@ -0,0 +1,291 @@
+import hashlib
+import importlib.util
+import io
+import multiprocessing
+import os
+import threading
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+from .native_pdf import build_native_scoreboard_pdf, merge_pdf_documents
+from .ranking import ranking_table
+
+PDF_ENGINES = ["auto", "matplotlib", "parallel", "native"]
+# Past this many players "auto" uses the native writer; matplotlib takes ~0.1 s per 28-row page.
+NATIVE_PDF_MIN_PLAYERS = 500
+ROWS_PER_PAGE = 28
+# Pages per worker task in the "parallel" engine; small enough to keep every core busy and
+# report progress, large enough that each task's PDF overhead stays small.
+PARALLEL_PAGES_PER_TASK = 8
+
+
+def resolve_pdf_engine(engine, total_players):
+    if engine not in PDF_ENGINES:
+        # A typo in SCOREBOARD_PDF_ENGINE must not take the download down with it.
+        warnings.warn(f"Unknown PDF engine {engine!r}; using 'auto'.", RuntimeWarning, stacklevel=2)
+        engine = "auto"
+    if engine == "auto":
+        return "native" if total_players >= NATIVE_PDF_MIN_PLAYERS else "matplotlib"
+    return engine
+
+
+def _render_matplotlib_pages(table_df, total_players, first_page_number, total_pages, logo_file, stamp,
+                             progress=None):
+    # Renders consecutive 28-row pages of table_df (Position, Player, Points with global
+    # positions) into one PDF and returns its bytes.
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    logo_image = None
+    if logo_file and os.path.exists(logo_file):
+        try:
+            logo_image = plt.imread(logo_file)
+        except Exception:
+            logo_image = None
+
+    buffer = io.BytesIO()
+
+    with PdfPages(buffer) as pdf:
+        for page_index, start in enumerate(range(0, len(table_df), ROWS_PER_PAGE)):
+            page_df = table_df.iloc[start:start + ROWS_PER_PAGE].copy()
+            fig, ax = plt.subplots(figsize=(11.69, 8.27))  # A4 landscape
+            ax.axis("off")
+            ax.set_title("Scoreboard Ranking Table", fontsize=17, fontweight="bold", pad=16)
+
+            page_number = first_page_number + page_index
+
+            fig.text(
+                0.02,
+                0.02,
+                f"{stamp} | Players: {total_players} | Page {page_number}/{total_pages}",
+                fontsize=9,
+                color="#475569",
+            )
+
+            if logo_image is not None:
+                logo_ax = fig.add_axes([0.885, 0.82, 0.09, 0.12])
+                logo_ax.imshow(logo_image)
+                logo_ax.axis("off")
+
+            table = ax.table(
+                cellText=page_df.values.tolist(),
+                colLabels=page_df.columns.tolist(),
+                loc="center",
+                cellLoc="left",
+                colLoc="left",
+            )
+            table.auto_set_font_size(False)
+            table.set_fontsize(10)
+            table.scale(1, 1.45)
+
+            for (row, col), cell in table.get_celld().items():
+                if row == 0:
+                    cell.set_text_props(weight="bold", color="white")
+                    cell.set_facecolor("#1e3a8a")
+                    continue
+
+                global_position = int(page_df.iloc[row - 1]["Position"])
+                if global_position <= 3:
+                    cell.set_facecolor("#fecaca")
+                elif global_position > total_players - 5:
+                    cell.set_facecolor("#bfdbfe")
+                else:
+                    cell.set_facecolor("#f8fafc" if row % 2 == 0 else "#ffffff")
+
+            plt.tight_layout()
+            pdf.savefig(fig)
+            plt.close(fig)
+            if progress is not None:
+                progress(page_number, total_pages)
+
+    buffer.seek(0)
+    return buffer.getvalue()
+
+
+def _render_page_chunk(table_df, total_players, first_page_number, total_pages, logo_file, stamp):
+    # Process-pool entry point; must stay importable at module level.
+    import matplotlib
+    matplotlib.use("Agg")
+    return _render_matplotlib_pages(table_df, total_players, first_page_number, total_pages, logo_file, stamp)
+
+
+_RENDER_POOL = None
+_RENDER_POOL_LOCK = threading.Lock()
+
+
+def _render_pool():
+    # Spawned workers (no fork of the threaded Streamlit server), kept for the next export.
+    global _RENDER_POOL
+    with _RENDER_POOL_LOCK:
+        if _RENDER_POOL is None:
+            _RENDER_POOL = ProcessPoolExecutor(
+                max_workers=max(1, (os.cpu_count() or 2) - 1),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _RENDER_POOL
+
+
+def _discard_render_pool(pool):
+    global _RENDER_POOL
+    with _RENDER_POOL_LOCK:
+        if _RENDER_POOL is pool:
+            _RENDER_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _render_matplotlib_parallel(table_df, total_players, total_pages, logo_file, stamp, progress=None):
+    # Page chunks render in worker processes; the results are merged in page order.
+    rows_per_task = ROWS_PER_PAGE * PARALLEL_PAGES_PER_TASK
+    pool = _render_pool()
+    futures = {}
+    try:
+        for chunk_index, start in enumerate(range(0, len(table_df), rows_per_task)):
+            chunk = table_df.iloc[start:start + rows_per_task]
+            future = pool.submit(
+                _render_page_chunk, chunk, total_players, start // ROWS_PER_PAGE + 1, total_pages,
+                logo_file, stamp,
+            )
+            futures[future] = (chunk_index, (len(chunk) - 1) // ROWS_PER_PAGE + 1)
+
+        documents = {}
+        done_pages = 0
+        for future in as_completed(futures):
+            chunk_index, chunk_pages = futures[future]
+            documents[chunk_index] = future.result()
+            done_pages += chunk_pages
+            if progress is not None:
+                progress(done_pages, total_pages)
+    except BrokenProcessPool:
+        _discard_render_pool(pool)
+        raise
+
+    buffer = io.BytesIO()
+    merge_pdf_documents([documents[index] for index in sorted(documents)], buffer)
+    return buffer.getvalue()
+
+
+def build_scoreboard_pdf(df, logo_file=None, engine="matplotlib", progress=None, stamp=None):
+    # Returns (pdf_bytes, error). progress(done_pages, total_pages) is called as pages finish.
+    # The footer starts with `stamp`, by default the render time.
+    ranking = ranking_table(df)
+    if ranking.empty:
+        return None, "No hay datos para exportar."
+
+    resolved_engine = resolve_pdf_engine(engine, len(ranking))
+    if resolved_engine == "native":
+        return build_native_scoreboard_pdf(df, logo_file, stamp)
+
+    if importlib.util.find_spec("matplotlib") is None:
+        if engine == "auto":
+            return build_native_scoreboard_pdf(df, logo_file, stamp)
+        return None, "No se pudo generar el PDF porque matplotlib no esta disponible."
+
+    total_players = len(ranking)
+    ranking_pdf = ranking.copy()
+    ranking_pdf["Position"] = range(1, len(ranking_pdf) + 1)
+    table_df = ranking_pdf[["Position", "Player", "Points"]].copy()
+    total_pages = ((total_players - 1) // ROWS_PER_PAGE) + 1
+    stamp = stamp or f"Generated: {pd.Timestamp.now():%Y-%m-%d %H:%M}"
+
+    if resolved_engine == "parallel" and total_pages > PARALLEL_PAGES_PER_TASK:
+        try:
+            pdf_bytes = _render_matplotlib_parallel(
+                table_df, total_players, total_pages, logo_file, stamp, progress
+            )
+        except (BrokenProcessPool, OSError):
+            # Hosts that cannot start worker processes fall back to rendering here.
+            pdf_bytes = _render_matplotlib_pages(
+                table_df, total_players, 1, total_pages, logo_file, stamp, progress
+            )
+        return pdf_bytes, None
+
+    return _render_matplotlib_pages(table_df, total_players, 1, total_pages, logo_file, stamp, progress), None
+
+
+# -----------------------------
+# SHARED PDF CACHE
+# -----------------------------
+def scoreboard_pdf_key(ranking, logo_version=None, engine="matplotlib"):
+    # Same standings, logo and engine give the same key, whoever asks.
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(ranking[["Player", "Points"]], index=False).values.tobytes())
+    digest.update(f"{logo_version}|{engine}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ScoreboardPdfCache:
+    # LRU of rendered PDFs. A key is built by one thread at a time; concurrent requests for it
+    # wait and get the same bytes instead of rendering again.
+    def __init__(self, max_entries=8):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._pending = {}
+        self.builds = 0
+        self.hits = 0
+
+    def get(self, key):
+        with self._lock:
+            pdf_bytes = self._entries.get(key)
+            if pdf_bytes is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return pdf_bytes
+
+    def get_or_build(self, key, build):
+        while True:
+            with self._lock:
+                pdf_bytes = self._entries.get(key)
+                if pdf_bytes is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return pdf_bytes, None
+                pending = self._pending.get(key)
+                owner = pending is None
+                if owner:
+                    pending = threading.Event()
+                    self._pending[key] = pending
+
+            if not owner:
+                # If the owner's build failed the entry is still missing and this thread retries.
+                pending.wait()
+                continue
+
+            pdf_bytes, error = None, None
+            try:
+                pdf_bytes, error = build()
+            finally:
+                with self._lock:
+                    self.builds += 1
+                    if pdf_bytes is not None:
+                        self._entries[key] = pdf_bytes
+                        while len(self._entries) > self.max_entries:
+                            self._entries.popitem(last=False)
+                    del self._pending[key]
+                pending.set()
+            return pdf_bytes, error
+
+
+_PDF_CACHE = ScoreboardPdfCache()
+
+
+def cached_scoreboard_pdf(df, logo_file=None, logo_version=None, build=True, cache=None, engine="matplotlib",
+                          progress=None):
+    # Returns (pdf_bytes, error). With build=False nothing is rendered and pdf_bytes is None
+    # unless these standings are already cached. A cached document is served long after it was
+    # rendered, so its footer carries a stamp of the standings instead of the render time.
+    cache = cache or _PDF_CACHE
+    ranking = ranking_table(df)
+    if ranking.empty:
+        return None, "No hay datos para exportar."
+
+    engine = resolve_pdf_engine(engine, len(ranking))
+    key = scoreboard_pdf_key(ranking, logo_version, engine)
+    if not build:
+        return cache.get(key), None
+    stamp = f"Standings: {key[:12]}"
+    return cache.get_or_build(key, lambda: build_scoreboard_pdf(df, logo_file, engine, progress, stamp))
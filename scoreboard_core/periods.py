@@ -0,0 +1,239 @@
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .aggregates import player_codes
+from .storage import summarize_history_months
+
+WINNER_COLUMNS = ["Period", "Winner", "Points"]
+PERIOD_WINNER_COLUMNS = ["Kind", "Year", "Month", "Week", "Period", "Winner", "Points"]
+
+
+def _empty_winners(columns=WINNER_COLUMNS):
+    return pd.DataFrame(columns=columns)
+
+
+def _top_players(totals, players):
+    # totals: player-code sums indexed by period * len(players) + code. Returns one row per
+    # period with every tied leader, names sorted and comma-joined.
+    player_count = len(players)
+    keys = totals.index.to_numpy()
+    frame = pd.DataFrame({
+        "period": keys // player_count,
+        "player": players[keys % player_count],
+        "points": totals.to_numpy(),
+    })
+    best = frame.groupby("period", sort=False)["points"].transform("max")
+    leaders = frame[frame["points"] == best].sort_values(["period", "player"], kind="mergesort")
+    winners = leaders.groupby("period", sort=True).agg(Winner=("player", ", ".join), Points=("points", "first"))
+    return winners.reset_index()
+
+
+def compute_period_winners(history):
+    # Every weekly (week of month: days 1-7, 8-14, ...) and monthly winner in one pass. Players
+    # are factorized and each (month, week, player) becomes one integer key, so the weekly
+    # totals are a single groupby, the monthly totals a roll-up of those, and the leaders a
+    # max transform per period instead of a slice per week or month.
+    if history.empty:
+        return _empty_winners(PERIOD_WINNER_COLUMNS)
+
+    timestamps = history["timestamp"].to_numpy(dtype="datetime64[ns]")
+    month_starts = timestamps.astype("datetime64[M]")
+    months = month_starts.astype(np.int64)
+    weeks = (timestamps.astype("datetime64[D]") - month_starts.astype("datetime64[D]")).astype(np.int64) // 7
+    codes, players = player_codes(history)
+    player_count = len(players)
+
+    points = pd.Series(history["points_added"].to_numpy(dtype=np.int64))
+    weekly = points.groupby((months * 5 + weeks) * player_count + codes).sum()
+    weekly_keys = weekly.index.to_numpy()
+    monthly = weekly.groupby((weekly_keys // player_count // 5) * player_count + weekly_keys % player_count).sum()
+
+    week_winners = _top_players(weekly, players)
+    week_winners["Week"] = week_winners["period"] % 5 + 1
+    week_winners["month_index"] = week_winners["period"] // 5
+    month_winners = _top_players(monthly, players)
+    month_winners["Week"] = 0
+    month_winners["month_index"] = month_winners["period"]
+
+    winners = pd.concat([week_winners, month_winners], ignore_index=True)
+    winners["Kind"] = ["week"] * len(week_winners) + ["month"] * len(month_winners)
+    winners["Year"] = 1970 + winners["month_index"] // 12
+    winners["Month"] = winners["month_index"] % 12 + 1
+
+    month_dates = {
+        month_index: pd.Timestamp(np.datetime64(int(month_index), "M"))
+        for month_index in winners["month_index"].unique().tolist()
+    }
+    winners["Period"] = [
+        f"{week} Week {month_dates[month_index].strftime('%b')} Winner" if kind == "week"
+        else f"{month_dates[month_index].strftime('%B')} Winner"
+        for kind, week, month_index in zip(winners["Kind"], winners["Week"], winners["month_index"])
+    ]
+
+    winners = winners[PERIOD_WINNER_COLUMNS]
+    for column in ["Year", "Month", "Week", "Points"]:
+        winners[column] = winners[column].astype(int)
+    return winners.sort_values(["Kind", "Year", "Month", "Week"], kind="mergesort").reset_index(drop=True)
+
+
+def weekly_winners_of(winners, year, month):
+    weeks = winners[(winners["Kind"] == "week") & (winners["Year"] == year) & (winners["Month"] == month)]
+    if weeks.empty:
+        return _empty_winners()
+    return weeks.sort_values("Week", kind="mergesort")[WINNER_COLUMNS].reset_index(drop=True)
+
+
+def monthly_winners_of(winners):
+    # Newest month first, like the monthly history panel.
+    months = winners[winners["Kind"] == "month"]
+    if months.empty:
+        return _empty_winners()
+    return months.sort_values(["Year", "Month"], ascending=False, kind="mergesort")[WINNER_COLUMNS].reset_index(drop=True)
+
+
+def compute_weekly_winners(history, year, month):
+    if history.empty:
+        return _empty_winners()
+
+    month_history = history[
+        (history["timestamp"].dt.year == year) &
+        (history["timestamp"].dt.month == month)
+    ]
+    return weekly_winners_of(compute_period_winners(month_history), year, month)
+
+
+def compute_monthly_winners(history):
+    return monthly_winners_of(compute_period_winners(history))
+
+
+# -----------------------------
+# WINNERS ARCHIVE
+# -----------------------------
+def _closed_fingerprint(months, cutoff):
+    # Row count, points and timestamp sum of every closed month: a backdated import, an edit or
+    # a compaction of a closed month changes it and forces that part to be recomputed.
+    closed = months[months["month"] < f"{cutoff:%Y-%m}"]
+    return [
+        [month, int(rows), int(points), int(seconds)]
+        for month, rows, points, seconds in zip(closed["month"], closed["rows"], closed["points"], closed["seconds"])
+    ]
+
+
+class WinnersArchive:
+    # Winners of every month before `cutoff` (the start of the open month), persisted as JSON
+    # with the per-month fingerprint of the events they were computed from. Closed months never
+    # change on their own, so visits only recompute the open month from live events.
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._payload = None
+        self.builds = 0
+
+    def _load(self):
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp != self._stamp:
+            try:
+                with open(self.file_path, "r", encoding="utf-8") as file:
+                    self._payload = json.load(file)
+            except (OSError, ValueError):
+                self._payload = None
+            self._stamp = stamp
+        return self._payload
+
+    def closed_winners(self, cutoff, fingerprint):
+        with self._lock:
+            payload = self._load()
+        if not payload or payload.get("cutoff") != cutoff.isoformat() or payload.get("fingerprint") != fingerprint:
+            return None
+        return pd.DataFrame(payload["winners"], columns=PERIOD_WINNER_COLUMNS)
+
+    def save(self, cutoff, fingerprint, winners):
+        payload = {
+            "cutoff": cutoff.isoformat(),
+            "fingerprint": fingerprint,
+            "winners": winners[PERIOD_WINNER_COLUMNS].to_dict("records"),
+        }
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(payload, file, default=int)
+            os.replace(temp_path, self.file_path)
+        except OSError:
+            pass
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        with self._lock:
+            self._stamp = None
+            self._payload = payload
+
+    def period_winners(self, history, now=None):
+        # All weekly and monthly winners of a cleaned history frame.
+        if history.empty:
+            return _empty_winners(PERIOD_WINNER_COLUMNS)
+
+        timestamps = history["timestamp"]
+
+        def load_window(start, end):
+            selected = np.ones(len(history), dtype=bool)
+            if start is not None:
+                selected &= (timestamps >= start).to_numpy()
+            if end is not None:
+                selected &= (timestamps < end).to_numpy()
+            return history[selected]
+
+        return self.winners_from(summarize_history_months(history), load_window, now=now)
+
+    def winners_from(self, months, load_window, now=None):
+        # months is the per-month summary of the history (HISTORY_MONTH_COLUMNS) and
+        # load_window(start, end) returns its cleaned events in [start, end). Closed months come
+        # from the archive while their summary still matches, so only the open month is loaded;
+        # otherwise the closed months are loaded once and archived again.
+        if months.empty:
+            return _empty_winners(PERIOD_WINNER_COLUMNS)
+
+        now = now if now is not None else pd.Timestamp.now()
+        cutoff = pd.Timestamp(year=now.year, month=now.month, day=1)
+        fingerprint = _closed_fingerprint(months, cutoff)
+
+        closed_winners = self.closed_winners(cutoff, fingerprint)
+        if closed_winners is None:
+            closed_winners = compute_period_winners(load_window(None, cutoff)) if fingerprint else (
+                _empty_winners(PERIOD_WINNER_COLUMNS)
+            )
+            self.builds += 1
+            self.save(cutoff, fingerprint, closed_winners)
+
+        if len(fingerprint) == len(months):
+            return closed_winners
+        open_history = load_window(cutoff, None)
+        if open_history.empty:
+            return closed_winners
+        winners = pd.concat([closed_winners, compute_period_winners(open_history)], ignore_index=True)
+        return winners.sort_values(["Kind", "Year", "Month", "Week"], kind="mergesort").reset_index(drop=True)
+
+
+_ARCHIVES = {}
+_ARCHIVES_LOCK = threading.Lock()
+
+
+def winners_archive_for(file_path):
+    # Shared per file, so the parsed archive outlives Streamlit reruns.
+    key = os.path.abspath(file_path)
+    with _ARCHIVES_LOCK:
+        archive = _ARCHIVES.get(key)
+        if archive is None:
+            archive = WinnersArchive(file_path)
+            _ARCHIVES[key] = archive
+    return archive
@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+
+from .aggregates import event_counts, player_codes, to_day_numbers
+from .ranking import RankIndex, ranking_table
+
+PROJECTION_COLUMNS = [
+    "Player",
+    "current_points",
+    "current_position",
+    "avg_points_week",
+    "sessions_per_week",
+    "forecast_week_points",
+    "target_position",
+    "points_to_next_position",
+    "points_per_session_goal",
+    "summary",
+]
+
+_METRIC_COLUMNS = ["last_7", "prev_7", "sessions_28", "events", "avg_points_week", "best_week", "weeks", "recent_avg"]
+NO_HISTORY_SUMMARY = "Sin historial de sesiones. Necesitas registrar puntos para generar pronostico."
+
+
+def _history_metrics(history, now):
+    # Per-player inputs of the weekly projection, one row per player with events. Players are
+    # factorized to integer codes so every metric is a bincount or an integer groupby over
+    # the whole frame instead of one filter per player.
+    codes, players = player_codes(history)
+    timestamps = history["timestamp"].to_numpy(dtype="datetime64[ns]")
+    # Stored order breaks timestamp ties, so "last 8 sessions" is deterministic.
+    order = np.lexsort((timestamps, codes))
+    codes = codes[order]
+    timestamps = timestamps[order]
+    points = history["points_added"].to_numpy(dtype=np.int64)[order]
+    counts = event_counts(history)[order]
+    player_count = len(players)
+
+    def per_player(weights):
+        return np.bincount(codes, weights=weights, minlength=player_count).astype(np.int64)
+
+    now = np.datetime64(pd.Timestamp(now), "ns")
+    day = np.timedelta64(1, "D")
+    last_7 = timestamps >= now - 7 * day
+    prev_7 = (timestamps < now - 7 * day) & (timestamps >= now - 14 * day)
+    rows = np.bincount(codes, minlength=player_count)
+    # Compacted daily rows stand for several events; the newest events are always raw rows.
+    events = per_player(counts)
+
+    # Monday-based week ids, the same buckets as to_period("W"); 1970-01-01 was a Thursday.
+    weeks = (to_day_numbers(pd.Series(timestamps)) + 3) // 7
+    week_totals = pd.DataFrame({"code": codes, "week": weeks, "points": points}).groupby(
+        ["code", "week"], sort=False
+    )["points"].sum().groupby(level=0)
+
+    # Offset from each player's last event in sorted order; the last 8 feed the recent average.
+    group_end = np.cumsum(rows)
+    from_end = group_end[codes] - np.arange(len(codes)) - 1
+    recent = from_end < 8
+
+    return pd.DataFrame({
+        "last_7": per_player(np.where(last_7, points, 0)),
+        "prev_7": per_player(np.where(prev_7, points, 0)),
+        "sessions_28": per_player(np.where(timestamps >= now - 28 * day, counts, 0)),
+        "events": events,
+        "avg_points_week": week_totals.mean().to_numpy(),
+        "best_week": week_totals.max().to_numpy(),
+        "weeks": week_totals.size().to_numpy(),
+        "recent_avg": per_player(np.where(recent, points, 0)) / np.minimum(events, 8),
+    }, index=pd.Index(players, name="player"))
+
+
+def _project(metrics, current_points, current_position, next_points, position_for_points):
+    # Vectorized weekly forecast; current_position is 0 for players off the scoreboard and
+    # next_points holds the points of the position right above.
+    sessions_28 = metrics["sessions_28"].to_numpy(dtype=float)
+    events = metrics["events"].to_numpy(dtype=float)
+    weeks = metrics["weeks"].to_numpy(dtype=float)
+    sessions_per_week = np.where(sessions_28 > 0, sessions_28 / 4, np.maximum(1.0, events / np.maximum(1, weeks)))
+
+    last_7 = metrics["last_7"].to_numpy()
+    prev_7 = metrics["prev_7"].to_numpy()
+    trend_factor = np.where(last_7 > prev_7, 1.12, np.where(last_7 < prev_7, 0.95, 1.0))
+
+    avg_points_week = metrics["avg_points_week"].to_numpy(dtype=float)
+    best_week = metrics["best_week"].to_numpy(dtype=np.int64)
+    projected_by_sessions = metrics["recent_avg"].to_numpy(dtype=float) * sessions_per_week * trend_factor
+    stretch_goal = np.where(best_week > 0, best_week + 1, projected_by_sessions)
+    forecast = np.maximum(np.maximum(projected_by_sessions, stretch_goal), avg_points_week).astype(np.int64)
+
+    has_next = current_position > 1
+    points_to_next = np.where(has_next, np.maximum(0, next_points - current_points + 1), 0)
+    forecast = np.where(has_next, np.maximum(forecast, points_to_next), forecast)
+
+    ranked = current_position > 0
+    target_position = np.where(ranked, position_for_points(current_points + forecast), current_position)
+
+    divisor = np.maximum(1, np.round(sessions_per_week).astype(np.int64))
+    session_goal = np.where(forecast > 0, -(-forecast // divisor), 0)
+
+    return pd.DataFrame({
+        "current_points": current_points,
+        "current_position": current_position,
+        "avg_points_week": np.round(avg_points_week, 1),
+        "sessions_per_week": np.round(sessions_per_week, 1),
+        "forecast_week_points": forecast,
+        "target_position": target_position,
+        "points_to_next_position": points_to_next,
+        "points_per_session_goal": session_goal,
+        "summary": [
+            f"Pronostico semanal: {week_points} pts. Objetivo por sesion: {goal} pts."
+            for week_points, goal in zip(forecast.tolist(), session_goal.tolist())
+        ],
+    }, index=metrics.index)
+
+
+def compute_week_projections(ranking, history, now=None):
+    # Weekly projection for every scoreboard player in one pass, in ranking order. Players
+    # without history get the same empty projection as compute_player_week_projection.
+    table = ranking_table(ranking)
+    now = now if now is not None else pd.Timestamp.now()
+    players = table["Player"].to_numpy()
+    points = table["Points"].to_numpy(dtype=np.int64)
+    positions = np.arange(1, len(table) + 1, dtype=np.int64)
+    next_points = np.concatenate([[0], points[:-1]]).astype(np.int64)
+
+    history = history[history["player"].isin(set(players.tolist()))] if not history.empty else history
+    if history.empty:
+        metrics = pd.DataFrame(columns=_METRIC_COLUMNS, dtype=float)
+    else:
+        metrics = _history_metrics(history, now)
+    metrics = metrics.reindex(players).fillna(0)
+
+    # Competition rank of a total: players with strictly more points, plus one.
+    descending = -points
+    board = _project(
+        metrics,
+        points,
+        positions,
+        next_points,
+        lambda totals: np.searchsorted(descending, -totals, side="left") + 1,
+    ).reset_index(drop=True)
+    board.insert(0, "Player", players)
+
+    has_history = metrics["events"].to_numpy() > 0
+    for column in ["avg_points_week", "sessions_per_week", "forecast_week_points",
+                   "points_to_next_position", "points_per_session_goal"]:
+        board[column] = np.where(has_history, board[column], 0)
+    board["target_position"] = np.where(has_history, board["target_position"], positions)
+    board["summary"] = np.where(has_history, board["summary"], NO_HISTORY_SUMMARY)
+    return board[PROJECTION_COLUMNS]
+
+
+def compute_player_week_projection(player_name, ranks, history, now=None):
+    # ranks is the shared RankIndex (a scores frame is indexed on the fly), so positions and
+    # gaps are bisections instead of scans of the whole ranking. The history metrics come from
+    # the same vectorized engine as compute_week_projections, run on this player's rows only.
+    if not isinstance(ranks, RankIndex):
+        ranks = RankIndex.from_scores(ranks)
+
+    current_points = 0
+    current_position = ranks.position_of(player_name)
+    if current_position is not None:
+        current_points = ranks.points_of(player_name)
+
+    player_history = history[history["player"] == player_name]
+
+    if player_history.empty:
+        return {
+            "current_points": current_points,
+            "current_position": current_position,
+            "avg_points_week": 0,
+            "sessions_per_week": 0,
+            "forecast_week_points": 0,
+            "target_position": current_position,
+            "points_to_next_position": 0,
+            "points_per_session_goal": 0,
+            "summary": NO_HISTORY_SUMMARY,
+        }
+
+    now = now if now is not None else pd.Timestamp.now()
+    next_points = ranks.points_at(current_position - 1) if current_position and current_position > 1 else 0
+    projected = _project(
+        _history_metrics(player_history, now),
+        np.array([current_points], dtype=np.int64),
+        np.array([current_position or 0], dtype=np.int64),
+        np.array([next_points], dtype=np.int64),
+        lambda totals: np.array([ranks.position_for_points(int(total)) for total in totals]),
+    ).iloc[0]
+
+    return {
+        "current_points": current_points,
+        "current_position": current_position,
+        "avg_points_week": float(projected["avg_points_week"]),
+        "sessions_per_week": float(projected["sessions_per_week"]),
+        "forecast_week_points": int(projected["forecast_week_points"]),
+        "target_position": int(projected["target_position"]) if current_position else None,
+        "points_to_next_position": int(projected["points_to_next_position"]),
+        "points_per_session_goal": int(projected["points_per_session_goal"]),
+        "summary": projected["summary"],
+    }
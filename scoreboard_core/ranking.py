@@ -0,0 +1,306 @@
+import bisect
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .accounts import PlayerIndex, normalize_identity, player_index
+from .aggregates import player_codes, to_day_number
+
+RANKING_COLUMNS = ["Player", "Points", "Rank", "DenseRank"]
+
+
+class Ranking:
+    # Standings sorted once per scores version: points descending, ties broken by casefolded
+    # name and then roster order, so every view and every rerun shows the same order.
+    # Position is the 1-based row; Rank is standard competition ranking (1, 2, 2, 4) and
+    # DenseRank dense ranking (1, 2, 2, 3). The frame is shared and must be treated as read-only.
+    def __init__(self, table):
+        self.table = table
+        self._positions = None
+
+    @classmethod
+    def from_scores(cls, scores):
+        if scores.empty:
+            return cls(pd.DataFrame(columns=RANKING_COLUMNS))
+
+        table = pd.DataFrame({
+            "Player": scores["Player"].astype(str).str.strip().to_numpy(),
+            "Points": pd.to_numeric(scores["Points"], errors="coerce").fillna(0).astype(int).to_numpy(),
+        })
+        table = table[table["Player"] != ""]
+        table["_key"] = table["Player"].str.casefold()
+        table["_row"] = range(len(table))
+        table = table.sort_values(
+            by=["Points", "_key", "_row"], ascending=[False, True, True], kind="mergesort"
+        ).reset_index(drop=True)
+        table["Rank"] = table["Points"].rank(method="min", ascending=False).astype(int)
+        table["DenseRank"] = table["Points"].rank(method="dense", ascending=False).astype(int)
+        return cls(table[RANKING_COLUMNS])
+
+    def __len__(self):
+        return len(self.table)
+
+    @property
+    def empty(self):
+        return self.table.empty
+
+    def position_of(self, player_name):
+        # 1-based position of the player's first row, or None.
+        if self._positions is None:
+            positions = {}
+            for position, name in enumerate(self.table["Player"].tolist(), start=1):
+                positions.setdefault(name, position)
+            self._positions = positions
+        return self._positions.get(str(player_name).strip())
+
+    def rank_of(self, player_name, dense=False):
+        position = self.position_of(player_name)
+        if position is None:
+            return None
+        return int(self.table.iloc[position - 1]["DenseRank" if dense else "Rank"])
+
+    def points_of(self, player_name):
+        position = self.position_of(player_name)
+        return None if position is None else int(self.table.iloc[position - 1]["Points"])
+
+
+class RankIndex:
+    # Order-statistic index over (points desc, casefolded name, roster row), the same order as
+    # Ranking, kept in sorted buckets so a score change moves one key instead of resorting the
+    # roster. Lookups bisect the bucket maxima and a Fenwick tree over the bucket sizes gives
+    # the rows before a bucket, so positions cost O(log n). The tree follows every insert and
+    # removal and is rebuilt when a bucket splits or empties. The writer updates the shared
+    # instance in place after each commit, so every method takes the lock.
+    BUCKET_SIZE = 512
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = []
+        self._maxes = []
+        self._counts = [0]
+        self._keys_by_row = {}
+        self._row_by_name = {}
+        self._size = 0
+
+    @classmethod
+    def from_player_index(cls, index):
+        rank_index = cls()
+        keys = []
+        for row, (name, points) in enumerate(zip(index.names, index.points)):
+            if name:
+                key = (-int(points), normalize_identity(name), row)
+                keys.append(key)
+                rank_index._keys_by_row[row] = key
+                rank_index._row_by_name.setdefault(normalize_identity(name), row)
+        keys.sort()
+        rank_index._buckets = [keys[start:start + cls.BUCKET_SIZE] for start in range(0, len(keys), cls.BUCKET_SIZE)]
+        rank_index._maxes = [bucket[-1] for bucket in rank_index._buckets]
+        rank_index._size = len(keys)
+        rank_index._rebuild_counts()
+        return rank_index
+
+    @classmethod
+    def from_scores(cls, scores):
+        return cls.from_player_index(PlayerIndex.from_scores(scores))
+
+    def __len__(self):
+        return self._size
+
+    def update(self, changes):
+        # changes: (row, name, points) after a commit; rows not seen before are new players.
+        with self._lock:
+            for row, name, points in changes:
+                name = str(name).strip()
+                if not name:
+                    continue
+                old_key = self._keys_by_row.get(row)
+                if old_key is not None:
+                    self._remove(old_key)
+                key = (-int(points), normalize_identity(name), row)
+                self._insert(key)
+                self._keys_by_row[row] = key
+                self._row_by_name.setdefault(normalize_identity(name), row)
+
+    def position_of(self, player_name):
+        # 1-based position in the standings, or None.
+        with self._lock:
+            key = self._key_of(player_name)
+            return None if key is None else self._count_before(key) + 1
+
+    def points_of(self, player_name):
+        with self._lock:
+            key = self._key_of(player_name)
+            return None if key is None else -key[0]
+
+    def rank_of(self, player_name):
+        # Competition rank: players with more points, plus one.
+        with self._lock:
+            key = self._key_of(player_name)
+            return None if key is None else self._count_before((key[0],)) + 1
+
+    def position_for_points(self, points):
+        # Rank a total of `points` would get right now (ties share the better rank).
+        with self._lock:
+            return self._count_before((-int(points),)) + 1
+
+    def points_at(self, position):
+        with self._lock:
+            if position < 1 or position > self._size:
+                return None
+            bucket_index, offset = self._locate(position - 1)
+            return -self._buckets[bucket_index][offset][0]
+
+    def points_to_next_position(self, player_name):
+        # Points needed to pass the player right above, 0 for the leader or unknown players.
+        position = self.position_of(player_name)
+        if not position or position == 1:
+            return 0
+        return max(0, self.points_at(position - 1) - self.points_of(player_name) + 1)
+
+    def _key_of(self, player_name):
+        row = self._row_by_name.get(normalize_identity(player_name))
+        return None if row is None else self._keys_by_row.get(row)
+
+    def _count_before(self, key):
+        bucket_index = bisect.bisect_left(self._maxes, key)
+        if bucket_index == len(self._buckets):
+            return self._size
+        return self._rows_before(bucket_index) + bisect.bisect_left(self._buckets[bucket_index], key)
+
+    def _rebuild_counts(self):
+        # Fenwick tree of the bucket sizes (1-based), in O(buckets).
+        counts = [0] + [len(bucket) for bucket in self._buckets]
+        for node in range(1, len(counts)):
+            parent = node + (node & -node)
+            if parent < len(counts):
+                counts[parent] += counts[node]
+        self._counts = counts
+
+    def _add_count(self, bucket_index, delta):
+        node = bucket_index + 1
+        while node < len(self._counts):
+            self._counts[node] += delta
+            node += node & -node
+
+    def _rows_before(self, bucket_index):
+        # Keys in the buckets before bucket_index.
+        total = 0
+        node = bucket_index
+        while node:
+            total += self._counts[node]
+            node -= node & -node
+        return total
+
+    def _locate(self, offset):
+        # (bucket index, offset in that bucket) of the key at 0-based offset < size.
+        node = 0
+        step = 1 << (len(self._counts) - 1).bit_length()
+        while step:
+            child = node + step
+            if child < len(self._counts) and self._counts[child] <= offset:
+                node = child
+                offset -= self._counts[child]
+            step >>= 1
+        return node, offset
+
+    def _insert(self, key):
+        self._size += 1
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+            self._rebuild_counts()
+            return
+        bucket_index = min(bisect.bisect_left(self._maxes, key), len(self._buckets) - 1)
+        bucket = self._buckets[bucket_index]
+        bisect.insort(bucket, key)
+        self._maxes[bucket_index] = bucket[-1]
+        if len(bucket) > 2 * self.BUCKET_SIZE:
+            half = len(bucket) // 2
+            self._buckets[bucket_index:bucket_index + 1] = [bucket[:half], bucket[half:]]
+            self._maxes[bucket_index:bucket_index + 1] = [bucket[half - 1], bucket[-1]]
+            self._rebuild_counts()
+        else:
+            self._add_count(bucket_index, 1)
+
+    def _remove(self, key):
+        bucket_index = bisect.bisect_left(self._maxes, key)
+        bucket = self._buckets[bucket_index]
+        del bucket[bisect.bisect_left(bucket, key)]
+        self._size -= 1
+        if bucket:
+            self._maxes[bucket_index] = bucket[-1]
+            self._add_count(bucket_index, -1)
+        else:
+            del self._buckets[bucket_index]
+            del self._maxes[bucket_index]
+            self._rebuild_counts()
+
+
+def rank_index(storage):
+    # Built once from the shared roster index; the writer keeps it current across its commits.
+    return storage.derive("rank_index", "scores", lambda: RankIndex.from_player_index(player_index(storage)))
+
+
+def ranking_for(storage):
+    # One Ranking per scores version, shared by every session through the storage cache.
+    return storage.derive("ranking", "scores", lambda: Ranking.from_scores(storage.load_scores()))
+
+
+def ranking_table(source):
+    # Accepts a Ranking or a raw scores frame and returns the sorted table.
+    if isinstance(source, Ranking):
+        return source.table
+    return Ranking.from_scores(source).table
+
+
+def get_ranking(df):
+    return Ranking.from_scores(df).table.copy()
+
+
+def get_status_icon(position, total_players):
+    if position <= 3:
+        return "🔥"
+    if position > total_players - 5:
+        return "❄️"
+    return "🏃"
+
+
+def _window_points(history):
+    # Points per player of a cleaned (or columnar) history slice.
+    codes, players = player_codes(history)
+    points = np.bincount(codes, weights=history["points_added"].to_numpy(dtype=np.int64), minlength=len(players))
+    return pd.Series(points.astype(np.int64), index=pd.Index(players, name="player"))
+
+
+def get_period_activity_ranking(df, days, buckets, now=None, load_window=None):
+    base_ranking = ranking_table(df)
+    if base_ranking.empty:
+        return base_ranking
+
+    base = base_ranking[["Player"]].copy()
+    base["BaseOrder"] = range(len(base))
+    base["Points"] = 0
+
+    # Events with timestamp >= now - days: the days after the cutoff's day come from the daily
+    # buckets and the cutoff's own day from load_window(start, end), which returns the cleaned
+    # events in [start, end). Without it the whole cutoff day counts.
+    now = now if now is not None else pd.Timestamp.now()
+    cutoff = now - pd.Timedelta(days=days)
+    start_day = to_day_number(cutoff)
+    if load_window is None:
+        period_points = buckets.window_totals(start_day)
+    else:
+        period_points = buckets.window_totals(start_day + 1)
+        cutoff_day = load_window(cutoff, cutoff.normalize() + pd.Timedelta(days=1))
+        if not cutoff_day.empty:
+            period_points = period_points.add(_window_points(cutoff_day), fill_value=0).astype(np.int64)
+    if period_points.empty:
+        return base[["Player", "Points"]]
+
+    period_points = period_points.rename("Points").rename_axis("Player").reset_index()
+
+    merged = base.drop(columns=["Points"]).merge(period_points, on="Player", how="left")
+    merged["Points"] = pd.to_numeric(merged["Points"], errors="coerce").fillna(0).astype(int)
+    merged = merged.sort_values(by=["Points", "BaseOrder"], ascending=[False, True]).reset_index(drop=True)
+    return merged[["Player", "Points"]]
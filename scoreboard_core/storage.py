@@ -0,0 +1,1441 @@
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+SCORES_COLUMNS = ["Player", "Points"]
+USERS_COLUMNS = ["username", "password", "role"]
+HISTORY_COLUMNS = ["timestamp", "player", "points_added", "total_after", "trend_note"]
+# Legacy text format; new history rows store the timestamp as integer epoch milliseconds of the
+# naive local time (see `python -m scoreboard_core.storage migrate-timestamps`).
+HISTORY_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+HISTORY_DEFAULTS = {
+    "timestamp": "",
+    "player": "",
+    "points_added": 0,
+    "total_after": 0,
+    "trend_note": "",
+}
+
+
+def to_history_timestamp(timestamp):
+    # Wall-clock time as epoch milliseconds, the stored form of a history timestamp.
+    return int(pd.Timestamp(timestamp).value // 1_000_000)
+
+
+def _milliseconds_to_datetimes(milliseconds, index):
+    return pd.Series(milliseconds.astype("datetime64[ms]"), index=index).astype("datetime64[ns]")
+
+
+def parse_history_timestamps(values):
+    # Integer epoch milliseconds convert with one cast. Text rows (files not migrated yet, or
+    # digits read back from SQLite) split into digit strings, cast the same way, and dates
+    # parsed with the fixed legacy format; only what that misses falls back to format
+    # inference. Unparseable values become NaT.
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values.dtype) or pd.api.types.infer_dtype(values, skipna=True) == "datetime":
+        # Already parsed (cleaned frames, events built in memory).
+        return pd.Series(pd.to_datetime(values, errors="coerce"), index=values.index).astype("datetime64[ns]")
+    if pd.api.types.is_integer_dtype(values.dtype):
+        return _milliseconds_to_datetimes(values.to_numpy(dtype=np.int64), values.index)
+    if pd.api.types.is_float_dtype(values.dtype):
+        # Integer column with blanks, as pandas reads it.
+        present = values.notna().to_numpy()
+        parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+        parsed[present] = _milliseconds_to_datetimes(values.to_numpy()[present].astype(np.int64), values.index[present])
+        return parsed
+
+    text = values.astype("string").str.strip()
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    digits = text.str.isdigit().fillna(False).to_numpy(dtype=bool)
+    if digits.any():
+        parsed[digits] = _milliseconds_to_datetimes(text[digits].to_numpy(dtype=np.int64), values.index[digits])
+    dates = ~digits & (text.fillna("") != "").to_numpy(dtype=bool)
+    if dates.any():
+        fixed = pd.to_datetime(text[dates], format=HISTORY_TIMESTAMP_FORMAT, errors="coerce")
+        missed = fixed.isna()
+        if missed.any():
+            missed_text = text[dates][missed]
+            # Epoch values that went through a float column come back as "1714557600000.0".
+            decimals = missed_text.str.fullmatch(r"\d+\.0*").fillna(False).to_numpy(dtype=bool)
+            inferred = pd.to_datetime(missed_text.where(~decimals), format="mixed", errors="coerce")
+            if decimals.any():
+                inferred[decimals] = _milliseconds_to_datetimes(
+                    missed_text[decimals].str.split(".").str[0].to_numpy(dtype=np.int64), missed_text.index[decimals]
+                )
+            fixed[missed] = inferred
+        parsed[dates] = fixed.astype("datetime64[ns]")
+    return parsed
+
+
+class StorageError(Exception):
+    def __init__(self, location, cause=None):
+        super().__init__(f"{location}: {cause}")
+        self.location = location
+        self.cause = cause
+
+
+# -----------------------------
+# CSV BACKEND
+# -----------------------------
+def write_csv_atomic(df, file_path, retries=6, base_delay=0.2):
+    temp_path = f"{file_path}.tmp"
+    last_error = None
+
+    for attempt in range(retries):
+        try:
+            df.to_csv(temp_path, index=False)
+            os.replace(temp_path, file_path)
+            return
+        except PermissionError as error:
+            last_error = error
+            if os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+            time.sleep(base_delay * (attempt + 1))
+        except Exception as error:
+            last_error = error
+            break
+
+    raise StorageError(file_path, last_error)
+
+
+def append_csv_row(values, file_path, retries=6, base_delay=0.2):
+    append_csv_rows([values], file_path, retries=retries, base_delay=base_delay)
+
+
+def append_csv_rows(rows, file_path, retries=6, base_delay=0.2):
+    # All rows go out in one write and one fsync, so a batch costs the same as a single event.
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    payload = buffer.getvalue().encode("utf-8")
+    last_error = None
+
+    for attempt in range(retries):
+        try:
+            fd = os.open(file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        except PermissionError as error:
+            last_error = error
+            time.sleep(base_delay * (attempt + 1))
+            continue
+        except Exception as error:
+            raise StorageError(file_path, error) from error
+
+        # Once any byte is out a retry would append the rows twice, so write errors are final.
+        try:
+            try:
+                _write_all(fd, payload)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        except Exception as error:
+            raise StorageError(file_path, error) from error
+        return
+
+    raise StorageError(file_path, last_error)
+
+
+def _write_all(fd, payload):
+    # os.write may take only part of the payload (a signal, a full disk); keep writing the rest.
+    # If the append still fails, the partial line is cut back off unless another writer has
+    # appended after it.
+    view = memoryview(payload)
+    try:
+        while view:
+            written = os.write(fd, view)
+            if written <= 0:
+                raise OSError(f"short write: {len(payload) - len(view)} of {len(payload)} bytes")
+            view = view[written:]
+    except OSError:
+        written = len(payload) - len(view)
+        if written:
+            try:
+                end = os.lseek(fd, 0, os.SEEK_CUR)
+                if os.fstat(fd).st_size == end:
+                    os.ftruncate(fd, end - written)
+            except OSError:
+                pass
+        raise
+
+
+def _is_complete_row(line, columns):
+    try:
+        fields = next(csv.reader([line.decode("utf-8")]))
+    except (UnicodeDecodeError, csv.Error, StopIteration):
+        return False
+    return len(fields) == len(columns)
+
+
+def recover_csv_tail(file_path, header_columns, chunk_size=65536):
+    # Writer-side repair of a last line without its newline, run before appending. A line with
+    # every column (a hand-edited file saved without a final newline) gets its newline; anything
+    # shorter is what an interrupted append left behind and is dropped. Readers never call this:
+    # they skip an unterminated last line (see read_csv_lines), since it may be an append that
+    # another thread or process is still writing.
+    try:
+        with open(file_path, "rb+") as file:
+            file.seek(0, os.SEEK_END)
+            size = file.tell()
+            if size == 0:
+                return False
+            file.seek(size - 1)
+            if file.read(1) == b"\n":
+                return False
+
+            position = size
+            tail = b""
+            while position > 0:
+                start = max(0, position - chunk_size)
+                file.seek(start)
+                chunk = file.read(position - start)
+                newline_index = chunk.rfind(b"\n")
+                if newline_index != -1:
+                    tail = chunk[newline_index + 1:] + tail
+                    if _is_complete_row(tail, header_columns):
+                        file.seek(size)
+                        file.write(b"\n")
+                    else:
+                        file.truncate(start + newline_index + 1)
+                    return True
+                tail = chunk + tail
+                position = start
+
+            # No newline at all: keep a bare header, otherwise start over from the header.
+            if tail.decode("utf-8", errors="replace").strip() == ",".join(header_columns):
+                file.seek(size)
+                file.write(b"\n")
+            else:
+                file.seek(0)
+                file.truncate(0)
+                file.write((",".join(header_columns) + "\n").encode("utf-8"))
+            return True
+    except OSError:
+        return False
+
+
+def read_csv_lines(file_path, columns):
+    # Reads a journal CSV up to its last newline. An unterminated last line is either an append
+    # still in flight or the remains of an interrupted one; only the writer repairs it.
+    with open(file_path, "rb") as file:
+        data = file.read()
+    end = data.rfind(b"\n") + 1
+    if end == 0:
+        return pd.DataFrame(columns=columns)
+    return pd.read_csv(io.BytesIO(data[:end] if end < len(data) else data))
+
+
+def _file_stamp(file_path):
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+# -----------------------------
+# MONTH SEGMENTS (CSV HISTORY)
+# -----------------------------
+SEGMENT_MANIFEST = "manifest.json"
+UNDATED_SEGMENT = "undated"
+HISTORY_MONTH_COLUMNS = ["month", "rows", "points", "seconds", "first", "last"]
+_SEGMENT_NAME = re.compile(r"^(\d{4}-\d{2}|undated)$")
+
+
+def history_segments_dir(history_file):
+    # score_history.csv -> score_history/
+    return os.path.splitext(history_file)[0]
+
+
+def month_bounds(month):
+    # "2026-10" -> (2026-10-01 00:00, 2026-11-01 00:00)
+    start = pd.Timestamp(f"{month}-01")
+    return start, start + pd.offsets.MonthBegin(1)
+
+
+def summarize_history_months(history):
+    # Row count, points, timestamp-seconds sum and time range of each calendar month of a
+    # history with parsed timestamps: the same frame as a backend's history_months().
+    timestamps = history["timestamp"].to_numpy(dtype="datetime64[ns]")
+    valid = ~np.isnat(timestamps)
+    if not valid.any():
+        return pd.DataFrame(columns=HISTORY_MONTH_COLUMNS)
+
+    milliseconds = timestamps[valid].astype("datetime64[ms]").astype(np.int64)
+    summary = pd.DataFrame({
+        "month": timestamps[valid].astype("datetime64[M]").astype(np.int64),
+        "points": pd.to_numeric(history["points_added"], errors="coerce").fillna(0).to_numpy(dtype=np.int64)[valid],
+        "seconds": milliseconds // 1000,
+        "milliseconds": milliseconds,
+    }).groupby("month", sort=True).agg(
+        rows=("points", "size"),
+        points=("points", "sum"),
+        seconds=("seconds", "sum"),
+        first=("milliseconds", "min"),
+        last=("milliseconds", "max"),
+    )
+    return _month_frame(
+        [str(np.datetime64(int(month), "M")) for month in summary.index],
+        summary["rows"], summary["points"], summary["seconds"], summary["first"], summary["last"],
+    )
+
+
+def _month_frame(months, rows, points, seconds, first, last):
+    return pd.DataFrame({
+        "month": list(months),
+        "rows": np.asarray(rows, dtype=np.int64),
+        "points": np.asarray(points, dtype=np.int64),
+        "seconds": np.asarray(seconds, dtype=np.int64),
+        "first": pd.to_datetime(np.asarray(first, dtype=np.int64), unit="ms"),
+        "last": pd.to_datetime(np.asarray(last, dtype=np.int64), unit="ms"),
+    })[HISTORY_MONTH_COLUMNS]
+
+
+def _segment_names(timestamps):
+    # Segment of each row: its calendar month, or UNDATED_SEGMENT if the timestamp did not parse.
+    months = timestamps.to_numpy(dtype="datetime64[ns]").astype("datetime64[M]")
+    return np.where(np.isnat(months), UNDATED_SEGMENT, months.astype(str))
+
+
+def _segment_entry(timestamps, points_added, stamp):
+    valid = timestamps.notna().to_numpy()
+    milliseconds = timestamps.to_numpy(dtype="datetime64[ns]")[valid].astype("datetime64[ms]").astype(np.int64)
+    return {
+        "rows": int(len(timestamps)),
+        "points": int(pd.to_numeric(points_added, errors="coerce").fillna(0).sum()),
+        "seconds": int((milliseconds // 1000).sum()),
+        "first": int(milliseconds.min()) if len(milliseconds) else None,
+        "last": int(milliseconds.max()) if len(milliseconds) else None,
+        "stamp": list(stamp) if stamp is not None else None,
+    }
+
+
+def _merge_segment_entries(entry, added):
+    merged = {key: entry[key] + added[key] for key in ["rows", "points", "seconds"]}
+    for key, pick in [("first", min), ("last", max)]:
+        values = [value for value in [entry[key], added[key]] if value is not None]
+        merged[key] = pick(values) if values else None
+    merged["stamp"] = added["stamp"]
+    return merged
+
+
+def _read_history_csv(file_path):
+    history = read_csv_lines(file_path, HISTORY_COLUMNS)
+    for col, default_value in HISTORY_DEFAULTS.items():
+        if col not in history.columns:
+            history[col] = default_value
+    return history[HISTORY_COLUMNS]
+
+
+class HistorySegments:
+    # The history split into one CSV per calendar month (2026-10.csv, plus undated.csv for rows
+    # whose timestamp does not parse) and manifest.json with each segment's row count, points,
+    # timestamp sum, time range and file stamp. Appends only touch the segments of their rows'
+    # months and range reads open only the segments that overlap the window, so closed months
+    # are read without parsing the open one. A segment whose file no longer matches its
+    # manifest stamp (edited by hand, or an append whose manifest update was lost) is rescanned.
+    def __init__(self, directory):
+        self.directory = directory
+        self.manifest_file = os.path.join(directory, SEGMENT_MANIFEST)
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def exists(directory):
+        return os.path.exists(os.path.join(directory, SEGMENT_MANIFEST))
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{name}.csv")
+
+    def data_version(self):
+        # Every write goes through the manifest, so its stamp versions the whole history.
+        return _file_stamp(self.manifest_file)
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_file, "r", encoding="utf-8") as file:
+                return json.load(file).get("segments", {})
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, segments):
+        temp_path = f"{self.manifest_file}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump({"segments": dict(sorted(segments.items()))}, file, indent=1)
+            os.replace(temp_path, self.manifest_file)
+        except OSError as error:
+            raise StorageError(self.manifest_file, error) from error
+
+    def _scan(self, name):
+        history = _read_history_csv(self._path(name))
+        return _segment_entry(
+            parse_history_timestamps(history["timestamp"]),
+            history["points_added"],
+            _file_stamp(self._path(name)),
+        )
+
+    def manifest(self):
+        with self._lock:
+            segments = self._read_manifest()
+            try:
+                files = {name[:-4] for name in os.listdir(self.directory) if name.endswith(".csv")}
+            except OSError as error:
+                raise StorageError(self.directory, error) from error
+            names = {name for name in files if _SEGMENT_NAME.match(name)}
+
+            changed = False
+            for name in sorted(names | set(segments)):
+                stamp = _file_stamp(self._path(name))
+                if stamp is None:
+                    segments.pop(name, None)
+                    changed = True
+                elif segments.get(name, {}).get("stamp") != list(stamp):
+                    segments[name] = self._scan(name)
+                    changed = True
+            if changed:
+                self._write_manifest(segments)
+            return segments
+
+    def months(self):
+        segments = self.manifest()
+        months = [name for name in sorted(segments) if name != UNDATED_SEGMENT and segments[name]["first"] is not None]
+        return _month_frame(
+            months,
+            *[[segments[name][key] for name in months] for key in ["rows", "points", "seconds", "first", "last"]],
+        )
+
+    def load(self, start=None, end=None):
+        # Rows of every segment overlapping [start, end), oldest month first; the caller drops
+        # the rows outside the window. Undated rows only come with the full history.
+        segments = self.manifest()
+        start_ms = to_history_timestamp(start) if start is not None else None
+        end_ms = to_history_timestamp(end) if end is not None else None
+        names = [
+            name for name in sorted(segments)
+            if name != UNDATED_SEGMENT and segments[name]["first"] is not None
+            and (end_ms is None or segments[name]["first"] < end_ms)
+            and (start_ms is None or segments[name]["last"] >= start_ms)
+        ]
+        if start is None and end is None and UNDATED_SEGMENT in segments:
+            names.append(UNDATED_SEGMENT)
+
+        frames = [_read_history_csv(self._path(name)) for name in names]
+        if not frames:
+            return pd.DataFrame(columns=HISTORY_COLUMNS)
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    def append_rows(self, rows):
+        events = pd.DataFrame(rows, columns=HISTORY_COLUMNS)
+        timestamps = parse_history_timestamps(events["timestamp"])
+        names = _segment_names(timestamps)
+        with self._lock:
+            segments = self._read_manifest()
+            appended = []
+            try:
+                for name in dict.fromkeys(names.tolist()):
+                    positions = np.flatnonzero(names == name)
+                    path = self._path(name)
+                    recover_csv_tail(path, HISTORY_COLUMNS)
+                    stamp_before = _file_stamp(path)
+                    segment_rows = [rows[position] for position in positions.tolist()]
+                    # A new segment gets its header in the same write as its first rows.
+                    append_csv_rows(
+                        segment_rows if stamp_before is not None else [HISTORY_COLUMNS] + segment_rows, path
+                    )
+                    appended.append((path, stamp_before[1] if stamp_before is not None else None))
+
+                    entry = segments.get(name)
+                    if stamp_before is not None and (entry is None or entry.get("stamp") != list(stamp_before)):
+                        segments[name] = self._scan(name)
+                        continue
+                    added = _segment_entry(
+                        timestamps.iloc[positions], events["points_added"].iloc[positions], _file_stamp(path)
+                    )
+                    segments[name] = added if stamp_before is None else _merge_segment_entries(entry, added)
+                self._write_manifest(segments)
+            except Exception:
+                # The rows land in every segment or in none: take back the appends already made.
+                for path, size_before in appended:
+                    try:
+                        if size_before is None:
+                            os.remove(path)
+                        else:
+                            os.truncate(path, size_before)
+                    except OSError:
+                        pass
+                raise
+
+    def save(self, history):
+        # Rewrites every segment from a full history frame and removes the ones left empty.
+        history = history[HISTORY_COLUMNS]
+        timestamps = parse_history_timestamps(history["timestamp"])
+        names = _segment_names(timestamps)
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            segments = {}
+            for name in sorted(set(names.tolist())):
+                selected = names == name
+                write_csv_atomic(history[selected], self._path(name))
+                segments[name] = _segment_entry(
+                    timestamps[selected], history["points_added"][selected], _file_stamp(self._path(name))
+                )
+            for name in set(self._read_manifest()) - set(segments):
+                try:
+                    os.remove(self._path(name))
+                except OSError:
+                    pass
+            self._write_manifest(segments)
+
+
+def _with_points(scores, items):
+    # The scores frame with each (player, points) item set, appending players without a row.
+    scores = scores.copy()
+    row_by_player = {}
+    for row_index, player in zip(scores.index, scores["Player"].astype(str).str.strip()):
+        row_by_player.setdefault(player, row_index)
+
+    new_rows = {}
+    for player_name, points in items:
+        row_index = row_by_player.get(player_name)
+        if row_index is not None:
+            scores.at[row_index, "Points"] = int(points)
+        else:
+            new_rows[player_name] = int(points)
+
+    if new_rows:
+        new_frame = pd.DataFrame(list(new_rows.items()), columns=SCORES_COLUMNS)
+        scores = pd.concat([scores, new_frame], ignore_index=True)
+    return scores
+
+
+class CsvStorage:
+    name = "csv"
+    indexed_history = False
+
+    def __init__(self, scores_file, users_file, history_file, append_only=True):
+        self.scores_file = scores_file
+        self.users_file = users_file
+        self.history_file = history_file
+        # Journal mode appends one fsynced line per event instead of rewriting the whole history file.
+        self.append_only = append_only
+        # Once `segment-history` has split the file into month segments, they replace it.
+        segments_dir = history_segments_dir(history_file)
+        self.segments = HistorySegments(segments_dir) if HistorySegments.exists(segments_dir) else None
+        # Daily rollups of compacted events (see `compact-history`).
+        self.rollup_file = history_rollup_file(history_file)
+
+    @property
+    def ranged_history(self):
+        return self.segments is not None
+
+    def initialize(self):
+        files = [(self.scores_file, SCORES_COLUMNS), (self.users_file, USERS_COLUMNS)]
+        if self.segments is None:
+            files.append((self.history_file, HISTORY_COLUMNS))
+        for file_path, columns in files:
+            if not os.path.exists(file_path):
+                pd.DataFrame(columns=columns).to_csv(file_path, index=False)
+
+    def data_version(self, kind):
+        if kind == "history" and self.segments is not None:
+            return self.segments.data_version()
+        file_path = {
+            "scores": self.scores_file,
+            "users": self.users_file,
+            "history": self.history_file,
+        }[kind]
+        return _file_stamp(file_path)
+
+    def load_scores(self):
+        return pd.read_csv(self.scores_file)
+
+    def save_scores(self, df):
+        write_csv_atomic(df, self.scores_file)
+
+    def set_player_points(self, player_name, points):
+        self.set_players_points([(player_name, points)])
+
+    def set_players_points(self, items):
+        self.save_scores(_with_points(self.load_scores(), items))
+
+    def commit_points(self, items, rows, scores=None):
+        # One commit window: (player, points) items or a whole new scores frame, plus the history
+        # rows behind them. Two files cannot change in one step, so the scores are replaced first
+        # and put back if the history append fails; the window is written whole or not at all.
+        previous = self.load_scores() if scores is not None or items else None
+        if scores is not None:
+            self.save_scores(scores)
+        elif items:
+            self.save_scores(_with_points(previous, items))
+        if not rows:
+            return
+        try:
+            self.append_history_rows(rows)
+        except Exception:
+            if previous is not None:
+                write_csv_atomic(previous, self.scores_file)
+            raise
+
+    def load_users(self):
+        return pd.read_csv(self.users_file)
+
+    def save_users(self, df):
+        write_csv_atomic(df, self.users_file)
+
+    def load_history(self, player=None, start=None, end=None):
+        # start/end only narrow the read with month segments; the single file is read whole.
+        if self.segments is not None:
+            history = self.segments.load(start, end)
+            if player is not None:
+                history = history[history["player"].astype(str).str.strip() == player]
+            return history
+
+        history = read_csv_lines(self.history_file, HISTORY_COLUMNS)
+        # Journal appends write rows in HISTORY_COLUMNS order, so the header must match it exactly.
+        changed = list(history.columns) != HISTORY_COLUMNS
+
+        for col, default_value in HISTORY_DEFAULTS.items():
+            if col not in history.columns:
+                history[col] = default_value
+
+        history = history[HISTORY_COLUMNS]
+        if changed:
+            self.save_history(history)
+
+        if player is not None:
+            history = history[history["player"].astype(str).str.strip() == player]
+        return history
+
+    def save_history(self, df):
+        if self.segments is not None:
+            self.segments.save(df)
+            return
+        write_csv_atomic(df[HISTORY_COLUMNS], self.history_file)
+
+    def history_months(self):
+        # Per-month summary from the segment manifest; None when the history is a single file.
+        return self.segments.months() if self.segments is not None else None
+
+    def history_bytes(self):
+        if self.segments is None:
+            return os.path.getsize(self.history_file) if os.path.exists(self.history_file) else 0
+        return sum(
+            os.path.getsize(os.path.join(self.segments.directory, name))
+            for name in os.listdir(self.segments.directory) if name.endswith(".csv")
+        )
+
+    def load_rollups(self):
+        return read_rollups(self.rollup_file)
+
+    def save_rollups(self, rollups):
+        write_rollups(rollups, self.rollup_file)
+
+    def append_history(self, row):
+        self.append_history_rows([row])
+
+    def append_history_rows(self, rows):
+        if not rows:
+            return
+        if self.segments is not None:
+            self.segments.append_rows(rows)
+            return
+        if self.append_only:
+            # Appends come from the writer thread only, so repairing the tail here cannot cut
+            # into a row that is still being written.
+            recover_csv_tail(self.history_file, HISTORY_COLUMNS)
+            append_csv_rows(rows, self.history_file)
+            return
+
+        history = self.load_history()
+        events = pd.DataFrame(rows, columns=HISTORY_COLUMNS)
+        self.save_history(pd.concat([history, events], ignore_index=True))
+
+
+# -----------------------------
+# SQLITE BACKEND
+# -----------------------------
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    player TEXT NOT NULL,
+    points INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_scores_player ON scores (player);
+
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    password TEXT NOT NULL DEFAULT '',
+    role TEXT NOT NULL DEFAULT 'player'
+);
+CREATE INDEX IF NOT EXISTS idx_users_username ON users (username);
+
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL DEFAULT '',
+    player TEXT NOT NULL DEFAULT '',
+    points_added INTEGER NOT NULL DEFAULT 0,
+    total_after INTEGER NOT NULL DEFAULT 0,
+    trend_note TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_history_player_timestamp ON history (player, timestamp);
+CREATE INDEX IF NOT EXISTS idx_history_timestamp ON history (timestamp);
+
+CREATE TABLE IF NOT EXISTS data_versions (
+    kind TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO data_versions (kind, version) VALUES ('scores', 0), ('users', 0), ('history', 0);
+"""
+
+_BUMP_VERSION_SQL = "UPDATE data_versions SET version = version + 1 WHERE kind = ?"
+_INSERT_HISTORY_SQL = (
+    "INSERT INTO history (timestamp, player, points_added, total_after, trend_note) VALUES (?, ?, ?, ?, ?)"
+)
+
+
+def _history_params(rows):
+    return [
+        (_to_text(row[0]), _to_text(row[1]).strip(), _to_int(row[2]), _to_int(row[3]), _to_text(row[4]))
+        for row in rows
+    ]
+
+
+def _score_params(df):
+    return [(_to_text(player).strip(), _to_int(points)) for player, points in zip(df["Player"], df["Points"])]
+
+
+def _update_points(connection, items):
+    for player_name, points in items:
+        cursor = connection.execute(
+            "UPDATE scores SET points = ? WHERE id = (SELECT MIN(id) FROM scores WHERE player = ?)",
+            (int(points), player_name),
+        )
+        if cursor.rowcount == 0:
+            connection.execute("INSERT INTO scores (player, points) VALUES (?, ?)", (player_name, int(points)))
+
+
+def _to_int(value):
+    number = pd.to_numeric(pd.Series([value]), errors="coerce").fillna(0).iloc[0]
+    return int(number)
+
+
+def _to_text(value):
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        # Integer columns with blanks read back as float; keep "1714557600000", not "...0.0".
+        return str(int(value))
+    return str(value)
+
+
+class SqliteStorage:
+    name = "sqlite"
+    indexed_history = True
+    ranged_history = True
+
+    def __init__(self, db_file, timeout=30.0):
+        self.db_file = db_file
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_file, timeout=self.timeout, check_same_thread=False)
+            # WAL lets viewers keep reading the last committed snapshot while an admin writes.
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _write(self, kind, statements):
+        try:
+            connection = self._connect()
+            with connection:
+                for sql, params in statements:
+                    if isinstance(params, list):
+                        connection.executemany(sql, params)
+                    else:
+                        connection.execute(sql, params or ())
+                connection.execute(_BUMP_VERSION_SQL, (kind,))
+        except sqlite3.Error as error:
+            raise StorageError(self.db_file, error) from error
+
+    def _read(self, sql, columns, params=()):
+        try:
+            rows = self._connect().execute(sql, params).fetchall()
+        except sqlite3.Error as error:
+            raise StorageError(self.db_file, error) from error
+        return pd.DataFrame(rows, columns=columns)
+
+    def initialize(self):
+        try:
+            self._connect().executescript(SQLITE_SCHEMA)
+        except sqlite3.Error as error:
+            raise StorageError(self.db_file, error) from error
+
+    def data_version(self, kind):
+        # Every write transaction bumps its table's counter, so a history append no longer
+        # invalidates cached scores or users, and writes from other processes are still seen.
+        try:
+            row = self._connect().execute("SELECT version FROM data_versions WHERE kind = ?", (kind,)).fetchone()
+        except sqlite3.Error as error:
+            raise StorageError(self.db_file, error) from error
+        return None if row is None else row[0]
+
+    def is_empty(self):
+        counts = [
+            self._read(f"SELECT COUNT(*) FROM {table}", ["count"]).iloc[0]["count"]
+            for table in ["scores", "users", "history"]
+        ]
+        return sum(int(count) for count in counts) == 0
+
+    def load_scores(self):
+        return self._read("SELECT player, points FROM scores ORDER BY id", SCORES_COLUMNS)
+
+    def save_scores(self, df):
+        self._write("scores", [
+            ("DELETE FROM scores", None),
+            ("INSERT INTO scores (player, points) VALUES (?, ?)", _score_params(df)),
+        ])
+
+    def set_player_points(self, player_name, points):
+        self.set_players_points([(player_name, points)])
+
+    def set_players_points(self, items):
+        # One transaction of single-row UPDATEs, inserting players that have no row yet.
+        try:
+            connection = self._connect()
+            with connection:
+                _update_points(connection, items)
+                connection.execute(_BUMP_VERSION_SQL, ("scores",))
+        except sqlite3.Error as error:
+            raise StorageError(self.db_file, error) from error
+
+    def commit_points(self, items, rows, scores=None):
+        # One commit window (see CsvStorage.commit_points) in a single transaction.
+        try:
+            connection = self._connect()
+            with connection:
+                if scores is not None:
+                    connection.execute("DELETE FROM scores")
+                    connection.executemany("INSERT INTO scores (player, points) VALUES (?, ?)", _score_params(scores))
+                else:
+                    _update_points(connection, items)
+                if scores is not None or items:
+                    connection.execute(_BUMP_VERSION_SQL, ("scores",))
+                if rows:
+                    connection.executemany(_INSERT_HISTORY_SQL, _history_params(rows))
+                    connection.execute(_BUMP_VERSION_SQL, ("history",))
+        except sqlite3.Error as error:
+            raise StorageError(self.db_file, error) from error
+
+    def load_users(self):
+        return self._read("SELECT username, password, role FROM users ORDER BY id", USERS_COLUMNS)
+
+    def save_users(self, df):
+        rows = [
+            (_to_text(username), _to_text(password), _to_text(role))
+            for username, password, role in zip(df["username"], df["password"], df["role"])
+        ]
+        self._write("users", [
+            ("DELETE FROM users", None),
+            ("INSERT INTO users (username, password, role) VALUES (?, ?, ?)", rows),
+        ])
+
+    def load_history(self, player=None, start=None, end=None):
+        sql = "SELECT timestamp, player, points_added, total_after, trend_note FROM history"
+        conditions = []
+        params = []
+        if player is not None:
+            conditions.append("player = ?")
+            params.append(player)
+        if start is not None or end is not None:
+            # Epoch-millisecond text has 13 digits for any date after 2001, so the indexed text
+            # comparison orders it numerically. Rows still in the legacy text format always come
+            # back; the caller drops what falls outside the window.
+            bounds = []
+            if start is not None:
+                bounds.append("timestamp >= ?")
+                params.append(str(to_history_timestamp(start)))
+            if end is not None:
+                bounds.append("timestamp < ?")
+                params.append(str(to_history_timestamp(end)))
+            conditions.append(f"(({' AND '.join(bounds)}) OR timestamp GLOB '*[^0-9]*')")
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        return self._read(f"{sql} ORDER BY id", HISTORY_COLUMNS, tuple(params))
+
+    def history_months(self):
+        # Legacy text timestamps go through SQLite's own date parser; both forms end up as
+        # seconds of the naive wall-clock time, like the epoch-millisecond rows.
+        rows = self._read(
+            """
+            WITH events AS (
+                SELECT
+                    CASE WHEN timestamp GLOB '*[^0-9]*' THEN CAST(strftime('%s', timestamp) AS INTEGER)
+                         ELSE CAST(timestamp AS INTEGER) / 1000 END AS seconds,
+                    CASE WHEN timestamp GLOB '*[^0-9]*' THEN CAST(strftime('%s', timestamp) AS INTEGER) * 1000
+                         ELSE CAST(timestamp AS INTEGER) END AS milliseconds,
+                    points_added
+                FROM history
+                WHERE timestamp <> ''
+            )
+            SELECT strftime('%Y-%m', seconds, 'unixepoch'), COUNT(*), SUM(points_added), SUM(seconds),
+                   MIN(milliseconds), MAX(milliseconds)
+            FROM events
+            WHERE seconds IS NOT NULL
+            GROUP BY 1
+            ORDER BY 1
+            """,
+            HISTORY_MONTH_COLUMNS,
+        )
+        return _month_frame(
+            rows["month"], rows["rows"], rows["points"], rows["seconds"], rows["first"], rows["last"]
+        )
+
+    def load_rollups(self):
+        # The history table is indexed; compaction is a CSV feature.
+        return None
+
+    def save_history(self, df):
+        self._write("history", [
+            ("DELETE FROM history", None),
+            (_INSERT_HISTORY_SQL, _history_params(df[HISTORY_COLUMNS].itertuples(index=False, name=None))),
+        ])
+
+    def append_history(self, row):
+        self.append_history_rows([row])
+
+    def append_history_rows(self, rows):
+        self._write("history", [(_INSERT_HISTORY_SQL, _history_params(rows))])
+
+
+# -----------------------------
+# HISTORY ROLLUPS (COMPACTION)
+# -----------------------------
+# One row per player per day for events compacted out of the hot history: the day's points,
+# the number of events behind them, and the time and running total of the day's last event.
+ROLLUP_COLUMNS = ["timestamp", "player", "points_added", "total_after", "events"]
+DEFAULT_COMPACTION_DAYS = 90
+# Past the longest built-in window (the 30-day activity tab; the projections count sessions over
+# 28 days), so every event those windows read, their first day included, stays raw. Longer custom
+# windows reaching into compacted days count each of those days whole and are approximate.
+MIN_COMPACTION_DAYS = 31
+# Newest events kept raw per player: the projections average the last 8, trend notes the last 6.
+COMPACTION_KEEP_EVENTS = 8
+
+
+def history_rollup_file(history_file):
+    # score_history.csv -> score_history_rollup.csv.gz
+    return f"{os.path.splitext(history_file)[0]}_rollup.csv.gz"
+
+
+def read_rollups(file_path):
+    if not os.path.exists(file_path):
+        return None
+    try:
+        rollups = pd.read_csv(file_path, compression="gzip")
+    except (OSError, ValueError) as error:
+        raise StorageError(file_path, error) from error
+    return rollups[ROLLUP_COLUMNS]
+
+
+def write_rollups(rollups, file_path):
+    temp_path = f"{file_path}.tmp"
+    try:
+        rollups[ROLLUP_COLUMNS].to_csv(temp_path, index=False, compression="gzip")
+        os.replace(temp_path, file_path)
+    except OSError as error:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise StorageError(file_path, error) from error
+
+
+def rollup_history_rows(rollups, player=None, start=None, end=None):
+    # Rollups as history rows (no trend note) with their event count in an extra "events"
+    # column, optionally limited to one player and to [start, end).
+    rows = rollups.assign(trend_note="")
+    if player is not None:
+        rows = rows[rows["player"].astype(str).str.strip() == player]
+    if start is not None or end is not None:
+        timestamps = parse_history_timestamps(rows["timestamp"])
+        selected = np.ones(len(rows), dtype=bool)
+        if start is not None:
+            selected &= (timestamps >= start).to_numpy()
+        if end is not None:
+            selected &= (timestamps < end).to_numpy()
+        rows = rows[selected]
+    return rows[HISTORY_COLUMNS + ["events"]]
+
+
+def combine_month_summaries(first, second):
+    if first is None or first.empty:
+        return second
+    if second is None or second.empty:
+        return first
+    combined = pd.concat([first, second], ignore_index=True).groupby("month", sort=True).agg(
+        rows=("rows", "sum"), points=("points", "sum"), seconds=("seconds", "sum"), first=("first", "min"), last=("last", "max"),
+    )
+    return combined.reset_index()[HISTORY_MONTH_COLUMNS]
+
+
+def _daily_rollups(timestamps, players, points, totals, events):
+    # Folds rows into one per (player, day); the rows must be in stored order.
+    frame = pd.DataFrame({
+        "timestamp": timestamps.to_numpy(dtype="datetime64[ns]"),
+        "player": players.to_numpy(),
+        "points_added": points,
+        "total_after": totals,
+        "events": events,
+        "position": np.arange(len(points)),
+    })
+    frame["day"] = frame["timestamp"].to_numpy().astype("datetime64[D]")
+    frame = frame.sort_values(["player", "day", "timestamp", "position"], kind="mergesort")
+    daily = frame.groupby(["player", "day"], sort=True).agg(
+        timestamp=("timestamp", "last"),
+        points_added=("points_added", "sum"),
+        total_after=("total_after", "last"),
+        events=("events", "sum"),
+    ).reset_index()
+    daily["timestamp"] = daily["timestamp"].to_numpy().astype("datetime64[ms]").astype(np.int64)
+    return daily[ROLLUP_COLUMNS]
+
+
+def plan_compaction(history, rollups, before, keep_events=COMPACTION_KEEP_EVENTS):
+    # Splits raw history rows into the ones that stay hot and daily rollups of the rest, merged
+    # with the existing rollups. A row is rolled up only if it is older than `before`, is not
+    # among its player's last `keep_events` events, is not in the month or the 7 days before
+    # the player's latest event, and every event of that player's day qualifies too. Old rows
+    # that clean_history drops anyway (no player, zero points) are removed.
+    timestamps = parse_history_timestamps(history["timestamp"])
+    players = history["player"].astype(str).str.strip()
+    points = pd.to_numeric(history["points_added"], errors="coerce").fillna(0).to_numpy(dtype=np.int64)
+    totals = pd.to_numeric(history["total_after"], errors="coerce").fillna(0).to_numpy(dtype=np.int64)
+    moments = timestamps.to_numpy(dtype="datetime64[ns]")
+    dated = ~np.isnat(moments)
+    live = dated & (players != "").to_numpy() & (points != 0)
+    old = dated & (moments < np.datetime64(pd.Timestamp(before), "ns"))
+
+    rows = np.flatnonzero(live)
+    rolled = np.zeros(len(history), dtype=bool)
+    if len(rows):
+        codes, _ = pd.factorize(players.to_numpy()[rows])
+        row_moments = moments[rows]
+        order = np.lexsort((rows, row_moments, codes))
+        sorted_codes = codes[order]
+        ends = np.cumsum(np.bincount(sorted_codes))
+        from_end = ends[sorted_codes] - np.arange(len(order)) - 1
+        latest = row_moments[order][ends - 1]
+        protected_from = np.minimum(
+            latest.astype("datetime64[M]").astype("datetime64[ns]"), latest - np.timedelta64(7, "D")
+        )
+        protected = np.empty(len(rows), dtype=bool)
+        protected[order] = (from_end < keep_events) | (row_moments[order] >= protected_from[sorted_codes])
+
+        days = row_moments.astype("datetime64[D]").astype(np.int64)
+        candidate = pd.Series(old[rows] & ~protected)
+        whole_days = candidate.groupby([codes, days], sort=False).transform("all").to_numpy()
+        rolled[rows[whole_days]] = True
+
+    removed = old & ~live
+    keep = ~(rolled | removed)
+    new_rollups = _daily_rollups(
+        timestamps[rolled], players[rolled], points[rolled], totals[rolled], np.ones(int(rolled.sum()), dtype=np.int64)
+    )
+    if rollups is not None and not rollups.empty:
+        merged = pd.concat([rollups[ROLLUP_COLUMNS], new_rollups], ignore_index=True)
+        new_rollups = _daily_rollups(
+            parse_history_timestamps(merged["timestamp"]),
+            merged["player"].astype(str).str.strip(),
+            merged["points_added"].to_numpy(dtype=np.int64),
+            merged["total_after"].to_numpy(dtype=np.int64),
+            merged["events"].to_numpy(dtype=np.int64),
+        )
+    return keep, new_rollups, {"rolled": int(rolled.sum()), "removed": int(removed.sum())}
+
+
+# -----------------------------
+# SHARED CACHE
+# -----------------------------
+class CachedStorage:
+    # Process-wide read-through cache over a backend. Entries are keyed on the backend's data
+    # version plus a local write counter, so unchanged data is served without re-parsing and
+    # any write (ours or another process's) invalidates it.
+    def __init__(self, backend):
+        self.backend = backend
+        self.name = backend.name
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._write_counters = {"scores": 0, "users": 0, "history": 0}
+        self.hits = 0
+        self.misses = 0
+
+    def initialize(self):
+        self.backend.initialize()
+
+    def data_version(self, kind):
+        with self._lock:
+            counter = self._write_counters[kind]
+        return (counter, self.backend.data_version(kind))
+
+    def derive(self, name, kind, build):
+        version = self.data_version(kind)
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = build()
+        with self._lock:
+            self._entries[name] = (version, value)
+        return value
+
+    def replace_derived(self, name, kind, version_before, value):
+        # Swaps in a value the caller updated alongside its own write, provided the cached entry
+        # was current just before that write; otherwise the next derive() rebuilds it.
+        version = self.data_version(kind)
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == version_before:
+                self._entries[name] = (version, value)
+
+    def invalidate(self, kind):
+        with self._lock:
+            self._write_counters[kind] += 1
+
+    def load_scores(self):
+        return self.derive("scores", "scores", self.backend.load_scores).copy()
+
+    def save_scores(self, df):
+        try:
+            self.backend.save_scores(df)
+        finally:
+            self.invalidate("scores")
+
+    def set_player_points(self, player_name, points):
+        self.set_players_points([(player_name, points)])
+
+    def set_players_points(self, items):
+        try:
+            self.backend.set_players_points(items)
+        finally:
+            self.invalidate("scores")
+
+    def commit_points(self, items, rows, scores=None):
+        try:
+            self.backend.commit_points(items, rows, scores)
+        finally:
+            if scores is not None or items:
+                self.invalidate("scores")
+            if rows:
+                self.invalidate("history")
+
+    def load_users(self):
+        return self.derive("users", "users", self.backend.load_users).copy()
+
+    def save_users(self, df):
+        try:
+            self.backend.save_users(df)
+        finally:
+            self.invalidate("users")
+
+    def load_rollups(self):
+        return self.derive("rollups", "history", self.backend.load_rollups)
+
+    def _with_rollups(self, history, player=None, start=None, end=None):
+        # Compacted days come back as history rows (no trend note) carrying their event count
+        # in an "events" column, ahead of the raw rows.
+        rollups = self.load_rollups()
+        if rollups is None or rollups.empty:
+            return history
+        rows = rollup_history_rows(rollups, player=player, start=start, end=end)
+        if rows.empty:
+            return history
+        return pd.concat([rows, history], ignore_index=True)
+
+    def load_history(self, player=None, start=None, end=None):
+        # With start/end, backends that partition or index history by time read only that part
+        # (whole segments, so callers still filter); the others return the cached full history.
+        if player is not None and self.backend.indexed_history:
+            return self._with_rollups(self.backend.load_history(player=player, start=start, end=end), player, start, end)
+        if (start is not None or end is not None) and self.backend.ranged_history:
+            history = self.backend.load_history(player=player, start=start, end=end)
+            return self._with_rollups(history, player, start, end)
+
+        history = self.derive("history", "history", lambda: self._with_rollups(self.backend.load_history()))
+        if player is not None:
+            return history[history["player"].astype(str).str.strip() == player].copy()
+        return history.copy()
+
+    def save_history(self, df):
+        try:
+            self.backend.save_history(df)
+        finally:
+            self.invalidate("history")
+
+    def history_months(self):
+        def build():
+            months = self.backend.history_months()
+            rollups = self.load_rollups()
+            if months is None or rollups is None or rollups.empty:
+                return months
+            return combine_month_summaries(
+                months, summarize_history_months(rollups.assign(timestamp=parse_history_timestamps(rollups["timestamp"])))
+            )
+
+        return self.derive("history_months", "history", build)
+
+    def append_history(self, row):
+        self.append_history_rows([row])
+
+    def append_history_rows(self, rows):
+        try:
+            self.backend.append_history_rows(rows)
+        finally:
+            self.invalidate("history")
+
+
+# -----------------------------
+# FACTORY / MIGRATION
+# -----------------------------
+_STORAGE_INSTANCES = {}
+_STORAGE_INSTANCES_LOCK = threading.Lock()
+
+
+def get_storage(backend, scores_file, users_file, history_file, db_file):
+    # Streamlit re-executes the app script on every rerun, so the shared instance (and its cache)
+    # lives here, keyed on the configuration.
+    if backend == "sqlite":
+        key = (backend, os.path.abspath(db_file))
+    elif backend == "csv":
+        key = (backend, os.path.abspath(scores_file), os.path.abspath(users_file), os.path.abspath(history_file))
+    else:
+        raise ValueError(f"Unknown storage backend: {backend}")
+
+    with _STORAGE_INSTANCES_LOCK:
+        storage = _STORAGE_INSTANCES.get(key)
+        if storage is None:
+            if backend == "sqlite":
+                storage = CachedStorage(SqliteStorage(db_file))
+            else:
+                storage = CachedStorage(CsvStorage(scores_file, users_file, history_file))
+            _STORAGE_INSTANCES[key] = storage
+    return storage
+
+
+def migrate_csv_to_sqlite(scores_file, users_file, history_file, db_file, force=False):
+    source = CsvStorage(scores_file, users_file, history_file)
+    source.initialize()
+    target = SqliteStorage(db_file)
+    target.initialize()
+
+    if not target.is_empty() and not force:
+        raise StorageError(db_file, "the database already has data; use --force to replace it")
+
+    scores = source.load_scores()
+    users = source.load_users()
+    history = source.load_history()
+
+    target.save_scores(scores)
+    target.save_users(users)
+    target.save_history(history)
+    return {"scores": len(scores), "users": len(users), "history": len(history)}
+
+
+def migrate_history_timestamps(storage, drop_invalid=False):
+    # Rewrites every history timestamp as epoch milliseconds. Rows whose timestamp cannot be
+    # parsed are kept as they are (the app already ignores them) unless drop_invalid is set.
+    history = storage.load_history()
+    raw = history["timestamp"]
+    parsed = parse_history_timestamps(raw)
+    valid = parsed.notna()
+    already_typed = valid & pd.to_numeric(raw, errors="coerce").notna()
+
+    migrated = history.astype({"timestamp": object})
+    migrated.loc[valid, "timestamp"] = parsed[valid].to_numpy(dtype="datetime64[ms]").astype(np.int64)
+    if drop_invalid:
+        migrated = migrated[valid]
+    storage.save_history(migrated)
+    return {
+        "history": len(history),
+        "converted": int((valid & ~already_typed).sum()),
+        "invalid": int((~valid).sum()),
+        "dropped": int((~valid).sum()) if drop_invalid else 0,
+    }
+
+
+def compact_history(storage, older_than_days=DEFAULT_COMPACTION_DAYS, now=None, dry_run=False):
+    # Rolls events older than the horizon into the daily rollup archive (see plan_compaction)
+    # and rewrites the hot history without them. Returns row and byte counts; with dry_run the
+    # sizes after compaction are measured on in-memory copies and nothing is written.
+    if older_than_days < MIN_COMPACTION_DAYS:
+        raise StorageError("compact-history", f"the horizon must be at least {MIN_COMPACTION_DAYS} days")
+    if not isinstance(storage, CsvStorage):
+        raise StorageError("compact-history", "compaction needs the CSV backend")
+
+    now = now if now is not None else pd.Timestamp.now()
+    history = storage.load_history()
+    rollups = storage.load_rollups()
+    keep, new_rollups, counts = plan_compaction(history, rollups, now - pd.Timedelta(days=older_than_days))
+    hot = history[keep]
+
+    report = {
+        "rows_before": len(history),
+        "rows_after": len(hot),
+        "rolled_up": counts["rolled"],
+        "removed": counts["removed"],
+        "rollup_rows_before": 0 if rollups is None else len(rollups),
+        "rollup_rows_after": len(new_rollups),
+        "bytes_before": storage.history_bytes(),
+        "rollup_bytes_before": os.path.getsize(storage.rollup_file) if os.path.exists(storage.rollup_file) else 0,
+    }
+    if dry_run:
+        report["bytes_after"] = len(hot.to_csv(index=False).encode("utf-8"))
+        report["rollup_bytes_after"] = len(gzip.compress(new_rollups.to_csv(index=False).encode("utf-8")))
+        return report
+
+    if counts["rolled"] or counts["removed"]:
+        storage.save_rollups(new_rollups)
+        storage.save_history(hot)
+    report["bytes_after"] = storage.history_bytes()
+    report["rollup_bytes_after"] = os.path.getsize(storage.rollup_file) if os.path.exists(storage.rollup_file) else 0
+    return report
+
+
+def segment_csv_history(history_file):
+    # Splits score_history.csv into month segments next to it and keeps the original file as
+    # .bak; from then on CsvStorage reads and writes the segments.
+    directory = history_segments_dir(history_file)
+    if HistorySegments.exists(directory):
+        raise StorageError(directory, "the history is already segmented")
+
+    history = CsvStorage(None, None, history_file).load_history() if os.path.exists(history_file) else (
+        pd.DataFrame(columns=HISTORY_COLUMNS)
+    )
+    segments = HistorySegments(directory)
+    segments.save(history)
+    backup_file = None
+    if os.path.exists(history_file):
+        backup_file = f"{history_file}.bak"
+        os.replace(history_file, backup_file)
+    return {"history": len(history), "segments": len(segments.manifest()), "directory": directory, "backup": backup_file}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scoreboard storage tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser("migrate", help="Import the CSV files into a SQLite database.")
+    migrate_parser.add_argument("--scores", default="scores.csv")
+    migrate_parser.add_argument("--users", default="users.csv")
+    migrate_parser.add_argument("--history", default="score_history.csv")
+    migrate_parser.add_argument("--db", default="scoreboard.db")
+    migrate_parser.add_argument("--force", action="store_true", help="Replace existing data in the database.")
+
+    timestamps_parser = subparsers.add_parser(
+        "migrate-timestamps", help="Rewrite history timestamps as epoch milliseconds."
+    )
+    timestamps_parser.add_argument("--backend", choices=["csv", "sqlite"], default="csv")
+    timestamps_parser.add_argument("--history", default="score_history.csv")
+    timestamps_parser.add_argument("--db", default="scoreboard.db")
+    timestamps_parser.add_argument(
+        "--drop-invalid", action="store_true", help="Remove events whose timestamp cannot be parsed."
+    )
+
+    segment_parser = subparsers.add_parser(
+        "segment-history", help="Split the CSV history into month segments with a manifest."
+    )
+    segment_parser.add_argument("--history", default="score_history.csv")
+
+    compact_parser = subparsers.add_parser(
+        "compact-history", help="Roll old history events into compressed per-player daily totals."
+    )
+    compact_parser.add_argument("--history", default="score_history.csv")
+    compact_parser.add_argument(
+        "--older-than-days", type=int, default=DEFAULT_COMPACTION_DAYS,
+        help=(
+            f"Compact events older than this many days (minimum {MIN_COMPACTION_DAYS}). Ranking, winners, "
+            "projections and the 7/15/30-day activity tabs stay exact; an activity window longer than "
+            "this horizon counts each compacted day whole and is approximate."
+        ),
+    )
+    compact_parser.add_argument("--dry-run", action="store_true", help="Only report the rows and bytes saved.")
+
+    args = parser.parse_args(argv)
+    if args.command == "migrate":
+        try:
+            counts = migrate_csv_to_sqlite(args.scores, args.users, args.history, args.db, force=args.force)
+        except StorageError as error:
+            parser.exit(1, f"Migration failed: {error}\n")
+        print(
+            f"Migrated {counts['scores']} scores, {counts['users']} users and "
+            f"{counts['history']} history events into {args.db}."
+        )
+    elif args.command == "migrate-timestamps":
+        if args.backend == "sqlite":
+            storage = SqliteStorage(args.db)
+            storage.initialize()
+            target = args.db
+        else:
+            if not os.path.exists(args.history):
+                parser.exit(1, f"Migration failed: {args.history} does not exist\n")
+            storage = CsvStorage(None, None, args.history)
+            target = args.history
+        try:
+            counts = migrate_history_timestamps(storage, drop_invalid=args.drop_invalid)
+        except StorageError as error:
+            parser.exit(1, f"Migration failed: {error}\n")
+        print(
+            f"Converted {counts['converted']} of {counts['history']} history timestamps in {target}; "
+            f"{counts['invalid']} could not be parsed ({counts['dropped']} removed)."
+        )
+    elif args.command == "segment-history":
+        try:
+            counts = segment_csv_history(args.history)
+        except StorageError as error:
+            parser.exit(1, f"Segmentation failed: {error}\n")
+        backup = f" The original file was kept as {counts['backup']}." if counts["backup"] else ""
+        print(f"Wrote {counts['history']} history events to {counts['segments']} segments in {counts['directory']}.{backup}")
+    elif args.command == "compact-history":
+        try:
+            report = compact_history(
+                CsvStorage(None, None, args.history), older_than_days=args.older_than_days, dry_run=args.dry_run
+            )
+        except StorageError as error:
+            parser.exit(1, f"Compaction failed: {error}\n")
+        saved_rows = report["rows_before"] - report["rows_after"]
+        saved_bytes = (report["bytes_before"] + report["rollup_bytes_before"]) - (
+            report["bytes_after"] + report["rollup_bytes_after"]
+        )
+        print(
+            f"{'Dry run: ' if args.dry_run else ''}hot history {report['rows_before']} -> {report['rows_after']} rows "
+            f"({report['rolled_up']} rolled up, {report['removed']} empty rows removed), "
+            f"{report['bytes_before']} -> {report['bytes_after']} bytes; "
+            f"rollup archive {report['rollup_rows_before']} -> {report['rollup_rows_after']} rows, "
+            f"{report['rollup_bytes_before']} -> {report['rollup_bytes_after']} bytes. "
+            f"Saved {saved_rows} rows and {saved_bytes} bytes."
+        )
+        print(
+            f"Activity windows longer than {args.older_than_days} days count each compacted day whole, "
+            "so their totals are approximate."
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
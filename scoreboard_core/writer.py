@@ -0,0 +1,278 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import pandas as pd
+
+from .accounts import normalize_identity, player_index
+from .aggregates import daily_buckets_for, player_history_for
+from .history import append_player_event, build_trend_note_from_history, load_player_history, trend_stats_for
+from .i18n import DEFAULT_LANGUAGE
+from .ranking import RankIndex, rank_index
+from .storage import parse_history_timestamps, to_history_timestamp
+
+
+class _Command:
+    __slots__ = ("kind", "player_name", "delta", "allow_create", "lang", "entries", "future")
+
+    def __init__(self, kind, player_name=None, delta=0, allow_create=True, lang=DEFAULT_LANGUAGE, entries=None):
+        self.kind = kind
+        self.player_name = player_name
+        self.delta = delta
+        self.allow_create = allow_create
+        self.lang = lang
+        self.entries = entries
+        self.future = Future()
+
+
+class GroupCommitWriter:
+    # Single writer thread for score changes. Commands queue up from any session; every commit
+    # window the thread applies the whole batch to the current scores in order and writes its
+    # scores and history with one storage commit_points call, so concurrent admins never
+    # overwrite each other and a failed write changes nothing.
+    def __init__(self, storage, commit_window=0.05, max_batch=512):
+        self.storage = storage
+        self.commit_window = commit_window
+        self.max_batch = max_batch
+        self.commits = 0
+        self.commands = 0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def submit_points(self, player_name, delta, allow_create=True, lang=DEFAULT_LANGUAGE):
+        # The future resolves to a result dict (see _apply_points) or raises StorageError.
+        return self._submit(_Command("points", str(player_name).strip(), int(delta), allow_create, lang))
+
+    def submit_reset(self):
+        return self._submit(_Command("reset"))
+
+    def submit_bulk(self, entries, allow_create=True, lang=DEFAULT_LANGUAGE):
+        # entries: (player_name, delta, timestamp or None) tuples, applied in the given order within
+        # one commit. The future resolves to one result dict per entry.
+        entries = [(str(player).strip(), int(delta), timestamp) for player, delta, timestamp in entries]
+        return self._submit(_Command("bulk", allow_create=allow_create, lang=lang, entries=entries))
+
+    def apply_points(self, player_name, delta, allow_create=True, lang=DEFAULT_LANGUAGE, timeout=30):
+        return self.submit_points(player_name, delta, allow_create, lang).result(timeout=timeout)
+
+    def reset_points(self, timeout=30):
+        return self.submit_reset().result(timeout=timeout)
+
+    def apply_bulk(self, entries, allow_create=True, lang=DEFAULT_LANGUAGE, timeout=120):
+        return self.submit_bulk(entries, allow_create, lang).result(timeout=timeout)
+
+    def _submit(self, command):
+        self._ensure_started()
+        self._queue.put(command)
+        return command.future
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="scoreboard-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.commit_window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._commit(batch)
+
+    def _commit(self, batch):
+        try:
+            results = self._apply(batch)
+        except Exception as error:
+            for command in batch:
+                if not command.future.done():
+                    command.future.set_exception(error)
+            return
+
+        self.commits += 1
+        self.commands += len(batch)
+        for command, result in zip(batch, results):
+            command.future.set_result(result)
+
+    def _apply(self, batch):
+        # Works on a private copy of the shared roster index and swaps it back in after the write,
+        # so neither the next commit nor account lookups rescan the scores. The shared indexes are
+        # only touched once the write has succeeded: if it fails every future gets the error and
+        # nothing was applied, so the admin can simply retry.
+        version_before = self.storage.data_version("scores")
+        index = player_index(self.storage).copy()
+        ranks = rank_index(self.storage)
+        names, points, row_by_key = index.names, index.points, index.row_by_key
+        stored_rows = len(names)
+
+        now = pd.Timestamp.now().floor("s")
+        changed_rows = set()
+        reset = False
+        events = []
+        results = []
+
+        for command in batch:
+            if command.kind == "reset":
+                points[:] = [0] * len(points)
+                changed_rows = set(range(len(points)))
+                reset = True
+                results.append({"status": "reset"})
+                continue
+            if command.kind == "bulk":
+                results.append([
+                    self._apply_points(
+                        player_name, delta, command.allow_create, command.lang,
+                        timestamp if timestamp is not None else now,
+                        names, points, row_by_key, changed_rows, events,
+                    )
+                    for player_name, delta, timestamp in command.entries
+                ])
+                continue
+            results.append(self._apply_points(
+                command.player_name, command.delta, command.allow_create, command.lang, now,
+                names, points, row_by_key, changed_rows, events,
+            ))
+
+        if not reset and not changed_rows:
+            return results
+
+        rows, player_stats = self._history_rows(events)
+        scores = None
+        if reset:
+            # Existing rows keep their stored names exactly; only the points change.
+            stored_names = self.storage.load_scores()["Player"].tolist()
+            scores = pd.DataFrame({"Player": stored_names + names[stored_rows:], "Points": points})
+        items = [] if reset else [(names[row], points[row]) for row in sorted(changed_rows)]
+        history_before = self.storage.data_version("history")
+        self.storage.commit_points(items, rows, scores=scores)
+        history_after = self.storage.data_version("history")
+
+        self.storage.replace_derived("player_index", "scores", version_before, index)
+        if reset:
+            ranks = RankIndex.from_player_index(index)
+        else:
+            # Only the moved players change position; the shared index is updated in place.
+            ranks.update([(row, names[row], points[row]) for row in sorted(changed_rows)])
+        self.storage.replace_derived("rank_index", "scores", version_before, ranks)
+        if rows:
+            self._record_events(events, rows, player_stats, history_before, history_after)
+        return results
+
+    def _apply_points(self, player_name, delta, allow_create, lang, timestamp,
+                      names, points, row_by_key, changed_rows, events):
+        if player_name == "" or delta == 0:
+            return {"status": "rejected", "player": player_name, "applied_delta": 0, "total_after": None}
+
+        row_index = row_by_key.get(normalize_identity(player_name))
+        created = False
+        if row_index is None:
+            if not allow_create or delta < 0:
+                return {"status": "rejected", "player": player_name, "applied_delta": 0, "total_after": None}
+            row_index = len(names)
+            names.append(player_name)
+            points.append(0)
+            row_by_key[normalize_identity(player_name)] = row_index
+            created = True
+
+        current_points = points[row_index]
+        total_after = max(0, current_points + delta)
+        applied_delta = total_after - current_points
+        if applied_delta == 0:
+            return {"status": "unchanged", "player": names[row_index], "applied_delta": 0, "total_after": total_after}
+
+        points[row_index] = total_after
+        changed_rows.add(row_index)
+        result = {
+            "status": "applied",
+            "player": names[row_index],
+            "applied_delta": applied_delta,
+            "total_after": total_after,
+            "created": created,
+            "trend_note": "",
+        }
+        events.append((result, lang, pd.Timestamp(timestamp).floor("s")))
+        return result
+
+    def _history_rows(self, events):
+        # History rows of the batch's events, with their trend notes. Notes come from copies of the
+        # players' running trend stats; a player only falls back to their history (plus this
+        # batch's earlier events) once a backdated row shows up.
+        trend_stats = trend_stats_for(self.storage)
+        player_stats = {}
+        player_histories = {}
+        batch_events = {}
+        rows = []
+        for result, lang, timestamp in events:
+            player_name = result["player"]
+            delta, total_after = result["applied_delta"], result["total_after"]
+            if player_name not in player_stats:
+                player_stats[player_name] = trend_stats.get(self.storage, player_name).copy()
+
+            stats = player_stats[player_name]
+            if stats is not None and stats.accepts(timestamp):
+                stats.add(timestamp, delta, total_after)
+                result["trend_note"] = stats.trend_note(lang)
+            else:
+                if stats is not None:
+                    history = load_player_history(self.storage, player_name)
+                    for event in batch_events.get(player_name, []):
+                        history = append_player_event(history, player_name, *event)
+                    player_histories[player_name] = history
+                    player_stats[player_name] = None
+                history = player_histories[player_name]
+                moments = parse_history_timestamps(history["timestamp"])
+                if (moments > timestamp).any():
+                    # A row dated before the player's latest event records the total at its own
+                    # timestamp: the last total at or before it plus the delta. The score and the
+                    # later rows keep their totals; the history is append-only.
+                    earlier = history[(moments <= timestamp).to_numpy()]
+                    earlier = earlier.iloc[moments[moments <= timestamp].argsort(kind="stable")]
+                    total_before = pd.to_numeric(earlier["total_after"], errors="coerce").dropna()
+                    total_after = max(0, (int(total_before.iloc[-1]) if len(total_before) else 0) + delta)
+                    result["total_after"] = total_after
+                history = append_player_event(history, player_name, timestamp, delta, total_after)
+                player_histories[player_name] = history
+                # Backdated bulk rows get the note as of their own timestamp, not the latest event's.
+                result["trend_note"] = build_trend_note_from_history(
+                    history[history["timestamp"] <= timestamp], player_name, lang
+                )
+            batch_events.setdefault(player_name, []).append((timestamp, delta, total_after))
+            rows.append([
+                to_history_timestamp(timestamp),
+                player_name,
+                delta,
+                total_after,
+                result["trend_note"],
+            ])
+        return rows, player_stats
+
+    def _record_events(self, events, rows, player_stats, version_before, version_after):
+        # Folds the written events into the shared daily buckets, per-player index and trend stats.
+        daily_buckets_for(self.storage).add_events(
+            [(result["player"], timestamp, result["applied_delta"]) for result, _, timestamp in events],
+            version_before,
+            version_after,
+        )
+        player_history_for(self.storage).add_events(rows, version_before, version_after)
+        trend_stats_for(self.storage).replace(player_stats, version_before, version_after)
+
+
+_WRITERS = {}
+_WRITERS_LOCK = threading.Lock()
+
+
+def writer_for(storage):
+    with _WRITERS_LOCK:
+        writer = _WRITERS.get(id(storage))
+        if writer is None:
+            writer = GroupCommitWriter(storage)
+            _WRITERS[id(storage)] = writer
+    return writer
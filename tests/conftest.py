@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scoreboard_core import get_storage  # noqa: E402
+
+
+@pytest.fixture
+def csv_storage(tmp_path):
+    storage = get_storage(
+        "csv",
+        str(tmp_path / "scores.csv"),
+        str(tmp_path / "users.csv"),
+        str(tmp_path / "score_history.csv"),
+        str(tmp_path / "scoreboard.db"),
+    )
+    storage.initialize()
+    storage.save_scores(pd.DataFrame({"Player": ["Ana", "Luis"], "Points": [10, 4]}))
+    return storage
@@ -0,0 +1,74 @@
+import pandas as pd
+
+from scoreboard_core import apply_bulk_points, parse_bulk_text, validate_bulk_rows
+
+NOW = pd.Timestamp("2024-06-01 12:00:00")
+
+
+def errors_of(text):
+    return validate_bulk_rows(parse_bulk_text(text), now=NOW)["error"].tolist()
+
+
+def test_valid_rows_have_no_errors():
+    checked = validate_bulk_rows(parse_bulk_text("Ana,5\nLuis,-2,2024-05-01 10:00"), now=NOW)
+    assert checked["error"].tolist() == ["", ""]
+    assert checked["delta_value"].tolist() == [5, -2]
+    assert checked["timestamp_value"].iloc[1] == pd.Timestamp("2024-05-01 10:00")
+
+
+def test_huge_and_non_finite_deltas_are_row_errors():
+    errors = errors_of("Ana,1e30\nAna,inf\nAna,-inf\nAna,nan\nAna,99999999999999999999")
+    assert all(error.startswith(("invalid delta", "delta out of range")) for error in errors)
+    assert errors[0].startswith("delta out of range")
+    assert errors[1].startswith("invalid delta")
+
+
+def test_huge_delta_does_not_change_scores(csv_storage):
+    report, _ = apply_bulk_points(csv_storage, parse_bulk_text("Ana,1e30"), now=NOW)
+    assert report["status"].tolist() == ["invalid"]
+    assert csv_storage.load_scores().set_index("Player")["Points"].to_dict() == {"Ana": 10, "Luis": 4}
+
+
+def test_aware_timestamps_become_naive_local_time():
+    checked = validate_bulk_rows(parse_bulk_text("Ana,5,2024-05-01T10:00:00Z"), now=NOW)
+    assert checked["error"].tolist() == [""]
+    expected = pd.Timestamp("2024-05-01T10:00:00Z").to_pydatetime().astimezone().replace(tzinfo=None)
+    assert checked["timestamp_value"].iloc[0] == pd.Timestamp(expected)
+
+
+def test_mixed_offsets_are_validated_per_row():
+    errors = errors_of(
+        "Ana,5,2024-05-01T10:00:00+02:00\nLuis,3,2024-05-01T10:00:00-05:00\nAna,1,2024-05-01 10:00\nLuis,2,nope"
+    )
+    assert errors[:3] == ["", "", ""]
+    assert errors[3] == "invalid timestamp: 'nope'"
+
+
+def test_future_aware_timestamp_is_rejected():
+    assert errors_of("Ana,5,2030-01-01T00:00:00Z") == ["timestamp is in the future"]
+
+
+def test_out_of_range_timestamp_is_a_row_error():
+    assert errors_of("Ana,5,2999-01-01") == ["invalid timestamp: '2999-01-01'"]
+
+
+def test_valid_rows_are_applied_in_one_write(csv_storage):
+    report, _ = apply_bulk_points(
+        csv_storage, parse_bulk_text("Ana,5,2024-05-01T10:00:00Z\nLuis,-2"), now=NOW
+    )
+    assert report["status"].tolist() == ["applied", "applied"]
+    assert csv_storage.load_scores().set_index("Player")["Points"].to_dict() == {"Ana": 15, "Luis": 2}
+    assert len(csv_storage.load_history()) == 2
+
+
+def test_backdated_rows_record_the_total_at_their_timestamp(csv_storage):
+    apply_bulk_points(csv_storage, parse_bulk_text("Ana,5,2024-05-01 10:00\nAna,20,2024-05-20 10:00"), now=NOW)
+    report, _ = apply_bulk_points(
+        csv_storage, parse_bulk_text("Ana,3,2024-05-10 10:00\nAna,-1,2024-04-01 10:00\nAna,2"), now=NOW
+    )
+    # The score takes every delta; each backdated row's total is the one at its own date.
+    assert csv_storage.load_scores().set_index("Player")["Points"].to_dict() == {"Ana": 39, "Luis": 4}
+    assert report["total_after"].tolist() == [18, 0, 39]
+
+    history = csv_storage.load_history().sort_values("timestamp", kind="stable")
+    assert history["total_after"].tolist() == [0, 15, 18, 35, 39]
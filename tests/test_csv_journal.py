@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+from scoreboard_core import HISTORY_COLUMNS, StorageError
+from scoreboard_core import storage as storage_module
+from scoreboard_core.storage import CsvStorage, append_csv_rows
+
+HEADER = ",".join(HISTORY_COLUMNS) + "\n"
+ROW = "1782856800000,Ana,5,15,+5 pts.\n"
+
+
+def journal(tmp_path, text):
+    history_file = tmp_path / "score_history.csv"
+    history_file.write_bytes(text.encode("utf-8"))
+    storage = CsvStorage(str(tmp_path / "scores.csv"), str(tmp_path / "users.csv"), str(history_file))
+    storage.initialize()
+    return storage, history_file
+
+
+def test_reader_skips_an_unterminated_line_without_touching_the_file(tmp_path):
+    # What a reader sees while another writer is halfway through its append.
+    text = HEADER + ROW + "1782856900000,Luis,3"
+    storage, history_file = journal(tmp_path, text)
+
+    history = storage.load_history()
+    assert history["player"].tolist() == ["Ana"]
+    assert history_file.read_text(encoding="utf-8") == text
+
+
+def test_writer_drops_a_torn_row_before_appending(tmp_path):
+    storage, history_file = journal(tmp_path, HEADER + ROW + "1782856900000,Luis,3")
+    storage.append_history_rows([[1782857000000, "Luis", 2, 6, ""]])
+    assert storage.load_history()["player"].tolist() == ["Ana", "Luis"]
+    assert storage.load_history()["points_added"].tolist() == [5, 2]
+
+
+def test_writer_keeps_a_complete_last_row_without_newline(tmp_path):
+    # A hand-edited file saved without its final newline.
+    storage, history_file = journal(tmp_path, HEADER + ROW.rstrip("\n"))
+    storage.append_history_rows([[1782857000000, "Luis", 2, 6, ""]])
+    assert storage.load_history()["player"].tolist() == ["Ana", "Luis"]
+
+
+def test_short_writes_are_completed(tmp_path, monkeypatch):
+    path = str(tmp_path / "journal.csv")
+    real_write = os.write
+    monkeypatch.setattr(storage_module.os, "write", lambda fd, data: real_write(fd, bytes(data[:7])))
+
+    append_csv_rows([["a" * 20, "b" * 20], ["c", "d"]], path)
+    with open(path, encoding="utf-8") as file:
+        assert file.read() == "a" * 20 + "," + "b" * 20 + "\nc,d\n"
+
+
+def test_a_failed_append_takes_back_its_partial_line(tmp_path, monkeypatch):
+    path = tmp_path / "journal.csv"
+    path.write_text(HEADER + ROW, encoding="utf-8")
+    real_write = os.write
+    calls = []
+
+    def failing_write(fd, data):
+        calls.append(len(data))
+        if len(calls) > 1:
+            raise OSError(28, "No space left on device")
+        return real_write(fd, bytes(data[:5]))
+
+    monkeypatch.setattr(storage_module.os, "write", failing_write)
+    with pytest.raises(StorageError):
+        append_csv_rows([[1782857000000, "Luis", 2, 6, ""]], str(path))
+    assert path.read_text(encoding="utf-8") == HEADER + ROW
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+from scoreboard_core import (
+    DailyPointBuckets,
+    RankIndex,
+    Ranking,
+    get_period_activity_ranking,
+    get_ranking,
+    to_columnar_history,
+    to_day_number,
+)
+
+LATEST = pd.Timestamp("2026-06-30 22:00:00")
+
+
+def sample_history(players, events, days, seed):
+    # Cleaned history rows over the `days` days before LATEST, oldest first.
+    rng = np.random.default_rng(seed)
+    offsets = np.sort(rng.integers(0, days * 86_400, size=events))[::-1]
+    history = pd.DataFrame({
+        "timestamp": LATEST - pd.to_timedelta(offsets, unit="s"),
+        "player": [f"Player {index:02d}" for index in rng.integers(1, players + 1, size=events)],
+        "points_added": rng.integers(-5, 26, size=events),
+    })
+    history["total_after"] = history.groupby("player")["points_added"].cumsum()
+    history["trend_note"] = ""
+    return history
+
+
+def brute_window_totals(history, start_day):
+    days = (pd.to_datetime(history["timestamp"]).dt.normalize() - pd.Timestamp("1970-01-01")).dt.days
+    return history[days >= start_day].groupby("player")["points_added"].sum()
+
+
+def test_daily_buckets_match_a_scan_after_incremental_events():
+    history = sample_history(50, 3_000, days=60, seed=5)
+    buckets = DailyPointBuckets(compact_after=16)
+    buckets.rebuild(to_columnar_history(history), version=1)
+
+    rng = np.random.default_rng(1)
+    added = []
+    for version in range(1, 60):
+        event = (f"Player {int(rng.integers(1, 60)):02d}", LATEST - pd.Timedelta(hours=int(rng.integers(0, 400))),
+                 int(rng.integers(-5, 20)))
+        assert buckets.add_event(*event, version, version + 1)
+        added.append(event)
+    # A stale version is refused instead of double counting.
+    assert not buckets.add_event(*added[0], 1, 2)
+
+    everything = pd.concat([
+        history[["timestamp", "player", "points_added"]],
+        pd.DataFrame(added, columns=["player", "timestamp", "points_added"]),
+    ], ignore_index=True)
+    for days in (1, 7, 30, 90):
+        start_day = to_day_number(LATEST - pd.Timedelta(days=days))
+        expected = brute_window_totals(everything, start_day)
+        totals = buckets.window_totals(start_day)
+        totals = totals[totals.index.isin(expected.index) | (totals != 0)]
+        pd.testing.assert_series_equal(
+            totals.sort_index(), expected.sort_index(), check_names=False, check_index_type=False
+        )
+
+
+def test_activity_ranking_uses_the_exact_cutoff():
+    history = sample_history(80, 6_000, days=45, seed=9)
+    scores = history.groupby("player", as_index=False).last()[["player", "total_after"]]
+    scores.columns = ["Player", "Points"]
+    buckets = DailyPointBuckets()
+    buckets.rebuild(to_columnar_history(history), version=0)
+    timestamps = history["timestamp"]
+
+    def load_window(start, end):
+        return history[(timestamps >= start) & (timestamps < end)]
+
+    for now in (LATEST, LATEST - pd.Timedelta(hours=13, minutes=7)):
+        for days in (7, 15, 30):
+            period = history[timestamps >= now - pd.Timedelta(days=days)]
+            expected = (
+                period.groupby("player")["points_added"].sum()
+                .reindex(get_ranking(scores)["Player"], fill_value=0)
+            )
+            expected = expected.rename("Points").rename_axis("Player").reset_index()
+            expected = expected.sort_values("Points", ascending=False, kind="mergesort").reset_index(drop=True)
+
+            ranking = get_period_activity_ranking(scores, days, buckets, now=now, load_window=load_window)
+            pd.testing.assert_frame_equal(ranking, expected, check_dtype=False)
+
+
+def test_rank_index_follows_the_ranking_through_updates():
+    rng = np.random.default_rng(3)
+    scores = pd.DataFrame({
+        "Player": [f"Player {index}" for index in range(1_500)],
+        "Points": rng.integers(0, 300, 1_500),
+    })
+    ranks = RankIndex.from_scores(scores)
+    for _ in range(20):
+        rows = rng.choice(len(scores), size=25, replace=False)
+        scores.loc[rows, "Points"] = rng.integers(0, 300, len(rows))
+        ranks.update([(int(row), scores.at[row, "Player"], int(scores.at[row, "Points"])) for row in rows])
+
+        ranking = Ranking.from_scores(scores)
+        for player in scores["Player"].sample(40, random_state=int(rng.integers(1_000))):
+            assert ranks.position_of(player) == ranking.position_of(player)
+            assert ranks.rank_of(player) == ranking.rank_of(player)
+            assert ranks.points_of(player.upper()) == int(scores.loc[scores["Player"] == player, "Points"].iloc[0])
+        points = ranking.table["Points"].to_numpy()
+        for position in (1, 500, len(points)):
+            assert ranks.points_at(position) == points[position - 1]
+        for total in (0, 150, 301):
+            assert ranks.position_for_points(total) == int((points > total).sum()) + 1
+
+
+def test_rank_index_positions_survive_bucket_splits_and_removals(monkeypatch):
+    # Tiny buckets so the updates split and empty them many times over.
+    monkeypatch.setattr(RankIndex, "BUCKET_SIZE", 4)
+    rng = np.random.default_rng(8)
+    scores = pd.DataFrame({"Player": [f"Player {index}" for index in range(200)], "Points": rng.integers(0, 40, 200)})
+    ranks = RankIndex.from_scores(scores.iloc[:20])
+    ranks.update([(row, scores.at[row, "Player"], int(scores.at[row, "Points"])) for row in range(20, 200)])
+    for _ in range(30):
+        rows = rng.choice(len(scores), size=15, replace=False)
+        scores.loc[rows, "Points"] = rng.integers(0, 40, len(rows))
+        ranks.update([(int(row), scores.at[row, "Player"], int(scores.at[row, "Points"])) for row in rows])
+
+        ranking = Ranking.from_scores(scores)
+        points = ranking.table["Points"].to_numpy()
+        assert [ranks.points_at(position) for position in range(1, len(points) + 1)] == points.tolist()
+        assert all(ranks.position_of(player) == ranking.position_of(player) for player in scores["Player"])
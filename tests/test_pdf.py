@@ -0,0 +1,91 @@
+import io
+import re
+import zlib
+
+import pandas as pd
+import pytest
+
+from scoreboard_core import (
+    NATIVE_PDF_MIN_PLAYERS,
+    ScoreboardPdfCache,
+    build_native_scoreboard_pdf,
+    cached_scoreboard_pdf,
+    get_ranking,
+    merge_pdf_documents,
+    resolve_pdf_engine,
+    scoreboard_pdf_key,
+)
+
+
+def page_count(document):
+    return len(re.findall(rb"/Type\s*/Page\b", document))
+
+
+def test_native_pdf_is_one_complete_document():
+    scores = pd.DataFrame({"Player": [f"Player {index}" for index in range(120)], "Points": range(120)})
+    document, error = build_native_scoreboard_pdf(scores)
+    assert error is None
+    assert document.startswith(b"%PDF")
+    # 28 rows per page.
+    assert page_count(document) == 5
+    assert re.search(rb"/Count 5\b", document)
+    assert document.rstrip().endswith(b"%%EOF")
+
+
+def test_merged_pdf_keeps_every_page_in_order():
+    small = pd.DataFrame({"Player": ["Ana", "Luis"], "Points": [10, 4]})
+    large = pd.DataFrame({"Player": [f"Player {index}" for index in range(120)], "Points": range(120)})
+    first, error = build_native_scoreboard_pdf(small)
+    assert error is None
+    second, error = build_native_scoreboard_pdf(large)
+    assert error is None
+
+    output = io.BytesIO()
+    merge_pdf_documents([first, second], output)
+    merged = output.getvalue()
+
+    assert merged.startswith(b"%PDF")
+    assert page_count(merged) == page_count(first) + page_count(second)
+    assert re.search(rb"/Count %d\b" % page_count(merged), merged)
+    assert merged.rstrip().endswith(b"%%EOF")
+
+
+def test_empty_scoreboard_has_no_pdf():
+    document, error = build_native_scoreboard_pdf(pd.DataFrame(columns=["Player", "Points"]))
+    assert document is None
+    assert error
+
+
+def test_unknown_engine_falls_back_to_auto():
+    with pytest.warns(RuntimeWarning, match="nativ"):
+        assert resolve_pdf_engine("nativ", NATIVE_PDF_MIN_PLAYERS) == "native"
+    with pytest.warns(RuntimeWarning):
+        assert resolve_pdf_engine("", 10) == "matplotlib"
+
+
+def test_unknown_engine_still_builds_the_pdf():
+    scores = pd.DataFrame({"Player": [f"Player {index}" for index in range(NATIVE_PDF_MIN_PLAYERS)], "Points": 1})
+    with pytest.warns(RuntimeWarning):
+        document, error = cached_scoreboard_pdf(scores, engine="NATIVE ", cache=None)
+    assert error is None
+    assert document.startswith(b"%PDF")
+
+
+def page_text(document):
+    # Decompressed content of every Flate stream, read by its /Length.
+    text = b""
+    for match in re.finditer(rb"/FlateDecode /Length (\d+) >>\nstream\n", document):
+        text += zlib.decompress(document[match.end():match.end() + int(match.group(1))])
+    return text
+
+
+def test_cached_pdf_is_stamped_with_the_standings_not_the_render_time():
+    scores = pd.DataFrame({"Player": [f"Player {index}" for index in range(40)], "Points": range(40)})
+    document, error = cached_scoreboard_pdf(scores, engine="native", cache=ScoreboardPdfCache())
+    assert error is None
+    text = page_text(document)
+    assert b"Generated:" not in text
+    key = scoreboard_pdf_key(get_ranking(scores), None, "native")
+    assert f"Standings: {key[:12]}".encode("latin-1") in text
+    # Rendering the same standings again later gives the same document.
+    assert cached_scoreboard_pdf(scores, engine="native", cache=ScoreboardPdfCache())[0] == document
@@ -0,0 +1,16 @@
+from scoreboard_core import SqliteStorage, to_history_timestamp
+
+
+def test_appended_and_saved_history_rows_store_the_same_player_name(tmp_path):
+    storage = SqliteStorage(str(tmp_path / "scoreboard.db"))
+    storage.initialize()
+    row = [to_history_timestamp("2024-05-01 10:00:00"), "  Ana ", 5, 5, ""]
+
+    storage.append_history_rows([row])
+    appended = storage.load_history()
+    storage.save_history(appended)
+    saved = storage.load_history()
+
+    assert appended["player"].tolist() == ["Ana"]
+    assert saved["player"].tolist() == ["Ana"]
+    assert len(storage.load_history(player="Ana")) == 1
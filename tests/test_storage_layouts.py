@@ -0,0 +1,184 @@
+import os
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import REFERENCE_NOW, generate_tournament
+from scoreboard_core import (
+    USERS_COLUMNS,
+    HistorySnapshot,
+    WinnersArchive,
+    compact_history,
+    compute_player_week_projection,
+    compute_week_projections,
+    current_daily_buckets,
+    current_player_history,
+    get_latest_trend_by_player,
+    get_period_activity_ranking,
+    get_ranking,
+    get_storage,
+    migrate_csv_to_sqlite,
+    migrate_history_timestamps,
+    rank_index,
+    segment_csv_history,
+    trend_stats_for,
+    writer_for,
+)
+from scoreboard_core.storage import MIN_COMPACTION_DAYS, CsvStorage
+
+# Every way the same events can be stored; each must give the plain CSV file's results.
+LAYOUTS = ["epoch", "segmented", "compacted", "segmented_compacted", "min_compacted", "sqlite"]
+# Horizon each compacted layout was compacted with.
+COMPACTION_DAYS = {"compacted": 90, "segmented_compacted": 90, "min_compacted": MIN_COMPACTION_DAYS}
+# The app's activity tabs, exact in every layout, plus a custom window past the horizons.
+ACTIVITY_TABS = [7, 15, 30]
+ACTIVITY_DAYS = ACTIVITY_TABS + [120]
+NOW = REFERENCE_NOW
+
+
+def tournament():
+    scores, history = generate_tournament(200, 20_000, days=300, seed=11, with_notes=True)
+    history["trend_note"] = history["trend_note"] + " #" + history.index.astype(str)
+    history.loc[3, "points_added"] = 0
+    return scores, history
+
+
+def build_storage(root, layout, scores, history):
+    os.makedirs(root)
+    scores_file = os.path.join(root, "scores.csv")
+    users_file = os.path.join(root, "users.csv")
+    history_file = os.path.join(root, "score_history.csv")
+    db_file = os.path.join(root, "scoreboard.db")
+    scores.to_csv(scores_file, index=False)
+    pd.DataFrame(columns=USERS_COLUMNS).to_csv(users_file, index=False)
+    history.to_csv(history_file, index=False)
+
+    if layout != "plain":
+        migrate_history_timestamps(CsvStorage(scores_file, users_file, history_file))
+    if layout.startswith("segmented"):
+        segment_csv_history(history_file)
+    if layout in COMPACTION_DAYS:
+        report = compact_history(
+            CsvStorage(scores_file, users_file, history_file), older_than_days=COMPACTION_DAYS[layout], now=NOW
+        )
+        assert report["rolled_up"] > 0
+    if layout == "sqlite":
+        migrate_csv_to_sqlite(scores_file, users_file, history_file, db_file)
+
+    storage = get_storage("sqlite" if layout == "sqlite" else "csv", scores_file, users_file, history_file, db_file)
+    storage.initialize()
+    return storage
+
+
+def results(storage, archive_file):
+    snapshot = HistorySnapshot(storage)
+    scores = storage.load_scores()
+    ranking = get_ranking(scores)
+    players = ranking["Player"].tolist()
+    out = {}
+
+    for days in ACTIVITY_DAYS:
+        buckets = current_daily_buckets(storage, snapshot, days=days, now=NOW)
+        out[f"activity_{days}"] = get_period_activity_ranking(
+            scores, days, buckets, now=NOW, load_window=snapshot.window
+        )
+
+    archive = WinnersArchive(archive_file)
+    out["winners"] = archive.winners_from(snapshot.months(), snapshot.window, now=NOW)
+    # A second visit answers the closed months from the archive.
+    out["winners_archived"] = archive.winners_from(snapshot.months(), snapshot.window, now=NOW)
+    assert archive.builds == 1
+
+    out["projections"] = compute_week_projections(ranking, snapshot.get(), now=NOW)
+    ranks = rank_index(storage)
+    out["player_projections"] = pd.DataFrame([
+        compute_player_week_projection(player, ranks, current_player_history(storage, snapshot, player), now=NOW)
+        for player in players[:25]
+    ])
+    out["trend_notes"] = pd.Series({
+        player: trend_stats_for(storage).get(storage, player).trend_note() for player in players
+    })
+    latest = get_latest_trend_by_player(snapshot.get(), limit=20, notes=snapshot.notes())
+    out["latest_trends"] = latest[["timestamp", "player", "points_added", "total_after", "trend_note"]].astype(
+        {"player": object}
+    )
+    return out
+
+
+def assert_same_results(expected, actual, layout):
+    assert expected.keys() == actual.keys()
+    for name, value in expected.items():
+        days = int(name.split("_")[1]) if name.startswith("activity_") else None
+        if days not in (None, *ACTIVITY_TABS) and days > COMPACTION_DAYS.get(layout, float("inf")):
+            # Custom windows longer than the horizon start inside the compacted days, where a day
+            # is one row timestamped at its last event, so their first day counts whole (see README).
+            continue
+        if isinstance(value, pd.Series):
+            pd.testing.assert_series_equal(value, actual[name], obj=f"{layout}: {name}")
+        else:
+            pd.testing.assert_frame_equal(
+                value.reset_index(drop=True),
+                actual[name].reset_index(drop=True),
+                check_dtype=False,
+                obj=f"{layout}: {name}",
+            )
+
+
+@pytest.fixture(scope="module")
+def layouts(tmp_path_factory):
+    scores, history = tournament()
+    root = tmp_path_factory.mktemp("layouts")
+    return {
+        layout: build_storage(str(root / layout), layout, scores, history)
+        for layout in ["plain"] + LAYOUTS
+    }
+
+
+@pytest.fixture(scope="module")
+def baseline(layouts, tmp_path_factory):
+    return results(layouts["plain"], str(tmp_path_factory.mktemp("archive") / "winners.json"))
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_layout_matches_plain_csv(layouts, baseline, layout, tmp_path):
+    assert_same_results(baseline, results(layouts[layout], str(tmp_path / "winners.json")), layout)
+
+
+def test_layouts_match_after_the_same_writes(tmp_path):
+    scores, history = tournament()
+    players = get_ranking(scores)["Player"].tolist()
+    entries = [
+        (players[0], 7, NOW - pd.Timedelta(hours=3)),
+        (players[1], -4, NOW - pd.Timedelta(days=2)),
+        # Backdated into a compacted day and into a closed month.
+        (players[2], 5, NOW - pd.Timedelta(days=200)),
+        (players[3], 9, NOW - pd.Timedelta(days=40)),
+        ("Nuevo Jugador", 6, NOW - pd.Timedelta(hours=1)),
+        (players[0], 2, NOW - pd.Timedelta(hours=1)),
+    ]
+
+    outputs = {}
+    for layout in ["plain"] + LAYOUTS:
+        storage = build_storage(str(tmp_path / layout), layout, scores, history)
+        # Warm the incremental indexes first, so the writes advance them instead of rebuilding.
+        results(storage, str(tmp_path / f"{layout}_warm.json"))
+        reports = writer_for(storage).apply_bulk(entries)
+        assert [report["status"] for report in reports] == ["applied"] * len(entries)
+        outputs[layout] = (reports, results(storage, str(tmp_path / f"{layout}.json")))
+
+    expected_reports, expected = outputs["plain"]
+    for layout in LAYOUTS:
+        reports, actual = outputs[layout]
+        if layout in COMPACTION_DAYS:
+            # The note and total of an event backdated into a compacted day come from that
+            # period's daily totals; the raw events the plain file computes them from are gone.
+            horizon = NOW - pd.Timedelta(days=COMPACTION_DAYS[layout])
+            for index, (_, _, timestamp) in enumerate(entries):
+                if timestamp < horizon:
+                    reports[index] = dict(
+                        reports[index],
+                        total_after=expected_reports[index]["total_after"],
+                        trend_note=expected_reports[index]["trend_note"],
+                    )
+        assert reports == expected_reports, layout
+        assert_same_results(expected, actual, layout)
@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+from scoreboard_core import (
+    HISTORY_COLUMNS,
+    CsvStorage,
+    SqliteStorage,
+    clean_history,
+    migrate_csv_to_sqlite,
+    migrate_history_timestamps,
+    parse_history_timestamps,
+)
+
+
+def write_legacy_history(tmp_path, invalid_timestamps):
+    pd.DataFrame({"Player": ["Ana", "Luis"], "Points": [12, 3]}).to_csv(tmp_path / "scores.csv", index=False)
+    pd.DataFrame(columns=["username", "password", "role", "player_name"]).to_csv(tmp_path / "users.csv", index=False)
+    pd.DataFrame([
+        ["2024-05-01 10:00:00", "Ana", 5, 5, "first"],
+        ["2024-05-02 11:30:00", "Luis", 3, 3, ""],
+        *[[timestamp, "Ana", 1, 6, ""] for timestamp in invalid_timestamps],
+        ["2024-06-03 09:15:00", "Ana", 4, 12, "june"],
+    ], columns=HISTORY_COLUMNS).to_csv(tmp_path / "score_history.csv", index=False)
+
+
+def test_epoch_text_with_a_float_suffix_parses():
+    parsed = parse_history_timestamps(pd.Series(["1714557600000.0", "1714557600000", "2024-05-01 10:00:00", ""]))
+    assert parsed.tolist()[:3] == [pd.Timestamp("2024-05-01 10:00:00")] * 3
+    assert pd.isna(parsed.iloc[3])
+
+
+# Only blanks left: pandas reads the migrated epoch column back as float.
+@pytest.mark.parametrize("invalid_timestamps", [[""], ["", "not a date"]])
+def test_migrated_csv_history_survives_the_move_to_sqlite(tmp_path, invalid_timestamps):
+    write_legacy_history(tmp_path, invalid_timestamps)
+    history_file = str(tmp_path / "score_history.csv")
+    csv_storage = CsvStorage(str(tmp_path / "scores.csv"), str(tmp_path / "users.csv"), history_file)
+    expected = clean_history(csv_storage.load_history())
+
+    report = migrate_history_timestamps(csv_storage)
+    assert report["converted"] == 3
+    assert report["invalid"] == len(invalid_timestamps)
+    assert len(csv_storage.load_history()) == 3 + len(invalid_timestamps)
+
+    db_file = str(tmp_path / "scoreboard.db")
+    migrate_csv_to_sqlite(str(tmp_path / "scores.csv"), str(tmp_path / "users.csv"), history_file, db_file)
+    sqlite_storage = SqliteStorage(db_file)
+
+    stored = sqlite_storage.load_history()["timestamp"].tolist()
+    assert "1714557600000" in stored
+    assert not any(value.endswith(".0") for value in stored)
+
+    migrated = clean_history(sqlite_storage.load_history())
+    columns = ["timestamp", "player", "points_added", "total_after"]
+    pd.testing.assert_frame_equal(
+        migrated[columns].reset_index(drop=True), expected[columns].reset_index(drop=True), check_dtype=False
+    )
+    months = sqlite_storage.history_months()
+    assert months["month"].tolist() == ["2024-05", "2024-06"]
+    assert months["rows"].tolist() == [2, 1]
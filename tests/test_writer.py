@@ -0,0 +1,128 @@
+import sqlite3
+import threading
+
+import pandas as pd
+import pytest
+
+from scoreboard_core import (
+    HISTORY_COLUMNS,
+    GroupCommitWriter,
+    StorageError,
+    clean_history,
+    get_storage,
+    migrate_csv_to_sqlite,
+    rank_index,
+    segment_csv_history,
+    to_history_timestamp,
+)
+from scoreboard_core import storage as storage_module
+
+
+def test_concurrent_submissions_are_committed_in_batches(csv_storage):
+    writer = GroupCommitWriter(csv_storage, commit_window=0.05)
+    futures = []
+    lock = threading.Lock()
+
+    def submit(player, count):
+        for _ in range(count):
+            future = writer.submit_points(player, 1)
+            with lock:
+                futures.append(future)
+
+    threads = [threading.Thread(target=submit, args=(player, 40)) for player in ["Ana", "Luis", "Nuevo"]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results = [future.result(timeout=30) for future in futures]
+
+    assert [result["status"] for result in results] == ["applied"] * 120
+    assert writer.commits < writer.commands
+    points = csv_storage.load_scores().set_index("Player")["Points"].to_dict()
+    assert points == {"Ana": 50, "Luis": 44, "Nuevo": 40}
+
+    history = clean_history(csv_storage.load_history())
+    assert len(history) == 120
+    # Each player's running totals were written in commit order.
+    for player, total in points.items():
+        totals = history[history["player"] == player]["total_after"]
+        assert totals.is_monotonic_increasing
+        assert totals.iloc[-1] == total
+
+
+def test_negative_deltas_stop_at_zero_and_unknown_players_need_points(csv_storage):
+    writer = GroupCommitWriter(csv_storage)
+    assert writer.apply_points("luis", -10)["applied_delta"] == -4
+    assert writer.apply_points("Luis", -1)["status"] == "unchanged"
+    assert writer.apply_points("Nadie", -3)["status"] == "rejected"
+    assert csv_storage.load_scores().set_index("Player")["Points"].to_dict() == {"Ana": 10, "Luis": 0}
+    assert len(pd.read_csv(csv_storage.backend.history_file)) == 1
+
+
+def layout_storage(tmp_path, layout):
+    scores_file = str(tmp_path / "scores.csv")
+    history_file = str(tmp_path / "score_history.csv")
+    pd.DataFrame({"Player": ["Ana", "Luis"], "Points": [10, 4]}).to_csv(scores_file, index=False)
+    pd.DataFrame(
+        [[to_history_timestamp(pd.Timestamp.now() - pd.Timedelta(days=90)), "Ana", 10, 10, ""]],
+        columns=HISTORY_COLUMNS,
+    ).to_csv(history_file, index=False)
+    if layout == "segmented":
+        segment_csv_history(history_file)
+    db_file = str(tmp_path / "scoreboard.db")
+    if layout == "sqlite":
+        migrate_csv_to_sqlite(scores_file, str(tmp_path / "users.csv"), history_file, db_file)
+    storage = get_storage("sqlite" if layout == "sqlite" else "csv", scores_file, str(tmp_path / "users.csv"),
+                          history_file, db_file)
+    storage.initialize()
+    return storage
+
+
+def fail_history_appends(storage, layout, monkeypatch):
+    if layout == "sqlite":
+        connection = sqlite3.connect(storage.backend.db_file)
+        connection.execute(
+            "CREATE TRIGGER fail_history BEFORE INSERT ON history BEGIN SELECT RAISE(ABORT, 'disk full'); END"
+        )
+        connection.commit()
+        connection.close()
+        return lambda: storage.backend._connect().execute("DROP TRIGGER fail_history")
+
+    # Segmented storage appends one segment per month; let the first one through so the rollback
+    # of an already-written segment is exercised too.
+    real_append = storage_module.append_csv_rows
+    calls = []
+
+    def append_csv_rows(rows, file_path, *args, **kwargs):
+        calls.append(file_path)
+        if layout == "csv" or len(calls) > 1:
+            raise StorageError(file_path, OSError(28, "No space left on device"))
+        return real_append(rows, file_path, *args, **kwargs)
+
+    monkeypatch.setattr(storage_module, "append_csv_rows", append_csv_rows)
+    return monkeypatch.undo
+
+
+@pytest.mark.parametrize("layout", ["csv", "segmented", "sqlite"])
+def test_a_failed_history_append_applies_nothing(tmp_path, monkeypatch, layout):
+    storage = layout_storage(tmp_path, layout)
+    writer = GroupCommitWriter(storage)
+    assert rank_index(storage).points_of("Ana") == 10
+    entries = [("Ana", 5, None), ("Luis", 2, pd.Timestamp.now().floor("s") - pd.Timedelta(days=40))]
+
+    restore = fail_history_appends(storage, layout, monkeypatch)
+    with pytest.raises(StorageError):
+        writer.apply_bulk(entries)
+
+    # Neither the scores, the shared rank index nor the history moved.
+    assert storage.load_scores().set_index("Player")["Points"].to_dict() == {"Ana": 10, "Luis": 4}
+    assert rank_index(storage).points_of("Ana") == 10
+    assert len(clean_history(storage.load_history())) == 1
+
+    # So retrying once the storage recovers applies the points exactly once.
+    restore()
+    assert [report["status"] for report in writer.apply_bulk(entries)] == ["applied", "applied"]
+    assert storage.load_scores().set_index("Player")["Points"].to_dict() == {"Ana": 15, "Luis": 6}
+    assert rank_index(storage).points_of("Ana") == 15
+    history = clean_history(storage.load_history())
+    assert sorted(history["points_added"].tolist()) == [2, 5, 10]